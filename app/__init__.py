@@ -0,0 +1,4 @@
+import time
+
+# Момент начала импорта приложения, для отчета о времени старта
+IMPORT_STARTED = time.perf_counter()
@@ -8,11 +8,14 @@ from sqlalchemy.future import select
 
 from app.db.session import get_db
 from app.db.models import User
+from app.db.dialects import dialect_insert
 from app.schemas.auth import Token
 from app.schemas.user import UserResponse, UserCreate
 from app.core.security import create_access_token
 from app.core.config import ACCESS_TOKEN_EXPIRE_MINUTES
-from app.core.security import get_password_hash, verify_password
+from app.core.security import (
+    get_password_hash_async, verify_password_async
+)
 from typing import Annotated
 
 
@@ -46,14 +49,17 @@ async def login_for_access_token(
     )
     user = result.scalars().first()
 
-    if not user or not verify_password(user_in.password, user.password):
+    if not user or not await verify_password_async(
+        user_in.password, user.password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Неверное имя пользователя или пароль"
         )
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data={"sub": user.username, "uid": user.id, "role": user.role},
+        expires_delta=access_token_expires
     )
     return Token(access_token=access_token, token_type="bearer")
 
@@ -87,26 +93,28 @@ async def register(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Нельзя создать администратора через регистрацию"
         )
-    result = await db.execute(
-        select(User).filter(User.username == user_in.username)
+    hashed_password = await get_password_hash_async(user_in.password)
+
+    # Проверка уникальности и вставка выполняются одним запросом
+    # INSERT ... ON CONFLICT DO NOTHING RETURNING, без гонки между ними
+    result = await db.scalars(
+        dialect_insert(db, User)
+        .values(
+            username=user_in.username,
+            password=hashed_password,
+            role=user_in.role
+        )
+        .on_conflict_do_nothing(index_elements=[User.username])
+        .returning(User)
     )
-    existing_user = result.scalars().first()
-    if existing_user:
+    new_user = result.first()
+    if new_user is None:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Пользователь с таким именем уже существует"
         )
-
-    hashed_password = get_password_hash(user_in.password)
-
-    new_user = User(
-        username=user_in.username,
-        password=hashed_password,
-        role=user_in.role
-    )
-    db.add(new_user)
     await db.commit()
-    await db.refresh(new_user)
 
     return UserResponse(
         id=new_user.id,
@@ -0,0 +1,91 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
+
+from app.core import events
+from app.core.config import EVENTS_KEEPALIVE
+from app.core.events import EventHub, Subscription
+from app.core.security import require_role
+from app.db.models import User
+from app.db.session import get_db
+
+from typing import AsyncIterator
+
+
+router = APIRouter()
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+async def _event_stream(
+    hub: EventHub, subscription: Subscription, keepalive: float
+) -> AsyncIterator[bytes]:
+    """
+    Формирует поток Server-Sent Events из очереди подписки.
+
+    Каждое событие — `event: notes` с JSON в `data`. При отсутствии
+    событий раз в `keepalive` секунд отправляется комментарий, чтобы
+    прокси не закрывали соединение. Отключенный за медленное чтение
+    подписчик получает `event: evicted`, после чего поток завершается.
+    """
+    try:
+        while True:
+            try:
+                message = await subscription.get(keepalive)
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            if message is None:
+                yield b"event: evicted\ndata: {}\n\n"
+                return
+            yield b"event: notes\ndata: " + message + b"\n\n"
+    finally:
+        hub.unsubscribe(subscription)
+
+
+# Поток событий об изменениях заметок
+@router.get("/events")
+async def note_events(
+    user: User = Depends(require_role("user")),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Server-Sent Events об изменениях заметок текущего пользователя.
+
+    Событие `notes` содержит тип изменения (`created`, `updated`,
+    `deleted`, `restored`), ID заметок и номер изменения `seq`; сами
+    изменения клиент запрашивает через /notes/changes со своим курсором.
+    После подключения и после `evicted` (клиент не успевал читать поток)
+    клиент должен синхронизироваться по курсору: события, случившиеся
+    без подключения, не повторяются.
+
+    Аргументы:
+        user (User): Текущий авторизованный пользователь.
+        db (AsyncSession): Сессия, использованная при авторизации.
+
+    Возвращает:
+        StreamingResponse: Бесконечный поток `text/event-stream`.
+
+    Исключения:
+        HTTPException: Ошибка 503, если события отключены (EVENTS_BROKER).
+    """
+    hub = events.event_hub
+    if hub is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Events are disabled"
+        )
+    # Сессия закрывается до начала потока: иначе соединение, взятое при
+    # проверке отзыва токенов, оставалось бы занятым до отключения клиента
+    await db.close()
+    subscription = await hub.subscribe(user.id)
+    return StreamingResponse(
+        _event_stream(hub, subscription, EVENTS_KEEPALIVE),
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Выполняется и при отключении клиента до начала потока
+        background=BackgroundTask(hub.unsubscribe, subscription)
+    )
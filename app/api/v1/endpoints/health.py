@@ -0,0 +1,50 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import LOG_FILE
+from app.core.logger import get_logger
+from app.db.session import get_db
+
+
+logger = get_logger("app.health", log_file=LOG_FILE)
+
+router = APIRouter()
+
+# Максимальное время проверки БД в readiness-пробе, секунды
+READINESS_TIMEOUT = 2.0
+
+
+@router.get("/health/live")
+async def liveness() -> dict:
+    """
+    Liveness-проба: процесс запущен и обрабатывает запросы.
+
+    Не обращается к БД, чтобы недоступность базы не приводила
+    к перезапуску экземпляров приложения.
+    """
+    return {"status": "ok"}
+
+
+@router.get("/health/ready")
+async def readiness(db: AsyncSession = Depends(get_db)) -> dict:
+    """
+    Readiness-проба: приложение может получить соединение и выполнить
+    запрос к БД.
+
+    Исключения:
+        HTTPException: 503, если БД недоступна или пул соединений исчерпан.
+    """
+    try:
+        await asyncio.wait_for(
+            db.execute(text("SELECT 1")), timeout=READINESS_TIMEOUT
+        )
+    except Exception as e:
+        logger.warning("Readiness check failed: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database unavailable"
+        )
+    return {"status": "ok"}
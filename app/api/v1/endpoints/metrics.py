@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.core import admission
+from app.core.metrics import REGISTRY
+from app.core.security import require_role
+from app.db.pool import pool_stats
+
+
+router = APIRouter()
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_role("admin"))]
+)
+async def metrics() -> PlainTextResponse:
+    """
+    Метрики приложения в текстовом формате Prometheus (для администратора).
+
+    Возвращает:
+        PlainTextResponse: Счетчики, гистограммы задержек по маршрутам
+        и прочие метрики приложения.
+    """
+    return PlainTextResponse(
+        REGISTRY.render(), media_type=PROMETHEUS_MEDIA_TYPE
+    )
+
+
+@router.get(
+    "/admin/db/pool", dependencies=[Depends(require_role("admin"))]
+)
+async def db_pool() -> list[dict]:
+    """
+    Состояние пулов соединений с БД (для администратора).
+
+    Возвращает:
+        list[dict]: Для каждого пула размер, число выданных и свободных
+        соединений, переполнение, количество получений, суммарное время
+        ожидания и число таймаутов.
+    """
+    return pool_stats()
+
+
+@router.get(
+    "/admin/admission", dependencies=[Depends(require_role("admin"))]
+)
+async def admission_state() -> dict:
+    """
+    Состояние контроля допуска запросов (для администратора).
+
+    Возвращает:
+        dict: Лимит одновременных запросов и занятые места, длина
+        очереди, число отслеживаемых пользователей и IP, счетчики
+        отказов по причинам; {"enabled": False}, если контроль отключен.
+    """
+    controller = admission.admission_controller
+    if controller is None:
+        return {"enabled": False}
+    return {"enabled": True, **controller.stats()}
@@ -1,13 +1,34 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas.note import NoteCreate, NoteUpdate, NoteResponse
-from app.db.session import get_db
+from app.schemas.note import (
+    BatchResponse,
+    NoteBatchCreate,
+    NoteBatchIds,
+    NoteBatchUpdate,
+    NoteChanges,
+    NoteCreate,
+    NoteResponse,
+    NoteRevisionInfo,
+    NoteRevisionResponse,
+    NoteSearchResult,
+    NoteUpdate,
+)
+from app.db.session import get_db, get_read_db
 from app.core.security import require_role, get_current_user
+from app.core.pagination import PageParams, SyncParams, set_next_cursor
+from app.core.projection import NoteListView
+from app.core.streaming import stream_response, wants_stream
+from app.core.serialization import FastJSONResponse, rows_response
+from app.core.etag import if_none_match, list_etag, not_modified, note_etag
 from app.db.models import User
+from app.core import events
+from app.core.config import NOTE_RETENTION_DAYS
+from app.services.archive import NoteArchiveService
 from app.services.note import NoteService
+from app.services.note_cache import note_cache
 
-from typing import List
+from typing import List, Literal
 
 
 router = APIRouter()
@@ -15,7 +36,8 @@ router = APIRouter()
 
 def get_note_service(db: AsyncSession = Depends(get_db)) -> NoteService:
     """
-    Создает и возвращает экземпляр NoteService.
+    Создает и возвращает экземпляр NoteService с кешем чтения заметок
+    и публикацией событий об изменениях.
 
     Аргументы:
         db (AsyncSession): Сессия базы данных.
@@ -23,7 +45,26 @@ def get_note_service(db: AsyncSession = Depends(get_db)) -> NoteService:
     Возвращает:
         NoteService: Экземпляр сервиса для работы с заметками.
     """
-    return NoteService(db)
+    return NoteService(db, note_cache, events.event_hub)
+
+
+def get_read_note_service(
+    _: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+) -> NoteService:
+    """
+    Создает NoteService для чтения на реплике или основной БД.
+
+    Пользователь разрешается до сессии чтения: по нему get_read_db
+    направляет чтения недавно писавшего пользователя в основную БД.
+
+    Аргументы:
+        db (AsyncSession): Сессия для чтения.
+
+    Возвращает:
+        NoteService: Экземпляр сервиса для чтения заметок.
+    """
+    return NoteService(db, note_cache)
 
 
 # Создание заметки
@@ -34,6 +75,7 @@ def get_note_service(db: AsyncSession = Depends(get_db)) -> NoteService:
 )
 async def create_note(
     note_data: NoteCreate,
+    response: Response,
     user: User = Depends(get_current_user),
     note_service: NoteService = Depends(get_note_service)
 ):
@@ -52,39 +94,196 @@ async def create_note(
         NoteResponse: Ответ с данными созданной заметки.
     """
     note = await note_service.create_note(note_data, user)
+    response.headers["ETag"] = note_etag(note.id, note.version)
     return note
 
 
+# Пакетное создание заметок
+@router.post("/notes/batch", response_model=BatchResponse)
+async def create_notes_batch(
+    batch: NoteBatchCreate,
+    user: User = Depends(require_role("user")),
+    note_service: NoteService = Depends(get_note_service)
+):
+    """
+    Создание нескольких заметок в одной транзакции.
+
+    Аргументы:
+        batch (NoteBatchCreate): Данные создаваемых заметок.
+        user (User): Текущий авторизованный пользователь.
+        note_service (NoteService): Сервис для работы с заметками.
+
+    Возвращает:
+        BatchResponse: Результат для каждой заметки в порядке запроса.
+    """
+    results = await note_service.create_notes(batch.items, user)
+    return BatchResponse(results=results)
+
+
+# Пакетное обновление заметок
+@router.patch("/notes/batch", response_model=BatchResponse)
+async def update_notes_batch(
+    batch: NoteBatchUpdate,
+    user: User = Depends(require_role("user")),
+    note_service: NoteService = Depends(get_note_service)
+):
+    """
+    Обновление нескольких заметок в одной транзакции.
+
+    Аргументы:
+        batch (NoteBatchUpdate): ID заметок и новые данные.
+        user (User): Текущий авторизованный пользователь.
+        note_service (NoteService): Сервис для работы с заметками.
+
+    Возвращает:
+        BatchResponse: Результат для каждой заметки в порядке запроса.
+    """
+    results = await note_service.update_notes(batch.items, user)
+    return BatchResponse(results=results)
+
+
+# Пакетное удаление заметок (мягкое удаление)
+@router.delete("/notes/batch", response_model=BatchResponse)
+async def delete_notes_batch(
+    batch: NoteBatchIds,
+    user: User = Depends(require_role("user")),
+    note_service: NoteService = Depends(get_note_service)
+):
+    """
+    Удаление (мягкое) нескольких заметок в одной транзакции.
+
+    Аргументы:
+        batch (NoteBatchIds): ID заметок для удаления.
+        user (User): Текущий авторизованный пользователь.
+        note_service (NoteService): Сервис для работы с заметками.
+
+    Возвращает:
+        BatchResponse: Результат для каждой заметки в порядке запроса.
+    """
+    results = await note_service.delete_notes(batch.ids, user)
+    return BatchResponse(results=results)
+
+
 # Получение списка заметок (только своих)
 @router.get("/notes/", response_model=List[NoteResponse])
 async def get_user_notes(
+    request: Request,
+    page: PageParams = Depends(),
+    view: NoteListView = Depends(),
+    stream: bool = Query(False),
     user: User = Depends(require_role("user")),
-    note_service: NoteService = Depends(get_note_service)
+    note_service: NoteService = Depends(get_read_note_service)
 ):
     """
-    Получение списка заметок текущего пользователя.
+    Получение страницы заметок текущего пользователя.
+
+    Курсор следующей страницы возвращается в заголовке `X-Next-Cursor`.
+    Ответ содержит ETag, зависящий от версии списка заметок пользователя:
+    при совпадении с `If-None-Match` возвращается 304 без чтения заметок.
+    При `?stream=true` или `Accept: application/x-ndjson` все заметки
+    после курсора отдаются потоком без ограничения `limit`.
+    Строки списка сериализуются напрямую, без повторной валидации через
+    NoteResponse; схема указана в `response_model` для документации.
+    `?fields=id,title,updated_at` возвращает только указанные поля,
+    `?preview=N` — тело, обрезанное до N символов на стороне БД.
 
     Аргументы:
+        page (PageParams): Размер страницы и курсор.
+        view (NoteListView): Набор полей и длина превью тела.
+        stream (bool): Включить потоковую выдачу.
         user (User): Текущий авторизованный пользователь.
         note_service (NoteService): Сервис для работы с заметками.
 
     Возвращает:
         List[NoteResponse]: Список заметок текущего пользователя.
     """
-    notes = await note_service.get_user_notes(user)
-    return notes
+    if wants_stream(request, stream):
+        return stream_response(
+            request,
+            note_service.stream_user_notes(user, page.after_id, view)
+        )
+    version = await note_service.get_notes_version(user.id)
+    etag = list_etag(user.id, version, page.limit, page.after_id, view.key)
+    if if_none_match(request, etag):
+        return not_modified(etag)
+    notes = await note_service.get_user_notes(
+        user, page.limit, page.after_id, notes_version=version, view=view
+    )
+    response = rows_response(notes)
+    set_next_cursor(response, notes, page.limit)
+    response.headers["ETag"] = etag
+    return response
+
+
+# Полнотекстовый поиск по заметкам
+@router.get("/notes/search", response_model=List[NoteSearchResult])
+async def search_notes(
+    q: str = Query(..., min_length=1, max_length=256),
+    limit: int = Query(20, ge=1, le=100),
+    user: User = Depends(require_role("user")),
+    note_service: NoteService = Depends(get_read_note_service)
+):
+    """
+    Поиск по заголовкам и текстам заметок текущего пользователя.
+
+    Аргументы:
+        q (str): Поисковый запрос.
+        limit (int): Максимальное количество результатов.
+        user (User): Текущий авторизованный пользователь.
+        note_service (NoteService): Сервис для работы с заметками.
+
+    Возвращает:
+        List[NoteSearchResult]: Найденные заметки с рангом и фрагментом
+        текста, в котором совпадения выделены тегом <mark>.
+    """
+    return await note_service.search_notes(user, q, limit)
+
+
+# Инкрементальная синхронизация заметок
+@router.get("/notes/changes", response_model=NoteChanges)
+async def get_note_changes(
+    sync: SyncParams = Depends(),
+    user: User = Depends(require_role("user")),
+    note_service: NoteService = Depends(get_read_note_service)
+):
+    """
+    Изменения заметок текущего пользователя после курсора `since`.
+
+    Без `since` возвращаются все заметки. Ответ содержит измененные и
+    созданные заметки, ID удаленных и курсор для следующего запроса;
+    при `has_more` остаток изменений запрашивается сразу с новым
+    курсором. Курсор упорядочен по моменту изменения, поэтому заметки,
+    измененные во время постраничной выдачи, не теряются, а попадают в
+    одну из следующих страниц.
+
+    Аргументы:
+        sync (SyncParams): Курсор синхронизации и размер ответа.
+        user (User): Текущий авторизованный пользователь.
+        note_service (NoteService): Сервис для работы с заметками.
+
+    Возвращает:
+        NoteChanges: Изменения заметок и курсор.
+    """
+    changes = await note_service.get_changes(user, sync.since, sync.limit)
+    changes["notes"] = [row._asdict() for row in changes["notes"]]
+    return FastJSONResponse(changes)
 
 
 # Получение конкретной заметки
 @router.get("/notes/{note_id}", response_model=NoteResponse)
 async def get_note_by_id(
     note_id: int,
+    request: Request,
+    response: Response,
     user: User = Depends(require_role("user")),
-    note_service: NoteService = Depends(get_note_service)
+    note_service: NoteService = Depends(get_read_note_service)
 ):
     """
     Получение конкретной заметки по ID.
 
+    Если ETag из `If-None-Match` совпадает с текущей версией заметки,
+    возвращается 304; при этом читается только версия, без тела заметки.
+
     Аргументы:
         note_id (int): ID заметки.
         user (User): Текущий авторизованный пользователь.
@@ -93,7 +292,14 @@ async def get_note_by_id(
     Возвращает:
         NoteResponse: Ответ с данными конкретной заметки.
     """
+    if request.headers.get("if-none-match"):
+        version = await note_service.get_note_version(note_id, user)
+        if version is not None:
+            etag = note_etag(note_id, version)
+            if if_none_match(request, etag):
+                return not_modified(etag)
     note = await note_service.get_note_by_id(note_id, user)
+    response.headers["ETag"] = note_etag(note.id, note.version)
     return note
 
 
@@ -102,6 +308,7 @@ async def get_note_by_id(
 async def update_note(
     note_id: int,
     note_data: NoteUpdate,
+    response: Response,
     user: User = Depends(require_role("user")),
     note_service: NoteService = Depends(get_note_service)
 ):
@@ -118,6 +325,90 @@ async def update_note(
         NoteResponse: Ответ с обновленными данными заметки.
     """
     note = await note_service.update_note(note_id, note_data, user)
+    response.headers["ETag"] = note_etag(note.id, note.version)
+    return note
+
+
+# История ревизий заметки
+@router.get(
+    "/notes/{note_id}/revisions", response_model=List[NoteRevisionInfo]
+)
+async def list_note_revisions(
+    note_id: int,
+    response: Response,
+    page: PageParams = Depends(),
+    user: User = Depends(require_role("user")),
+    note_service: NoteService = Depends(get_read_note_service)
+):
+    """
+    Получение страницы ревизий заметки, от старых к новым.
+
+    Аргументы:
+        note_id (int): ID заметки.
+        page (PageParams): Размер страницы и курсор.
+        user (User): Текущий авторизованный пользователь.
+        note_service (NoteService): Сервис для работы с заметками.
+
+    Возвращает:
+        List[NoteRevisionInfo]: Версии ревизий и время изменения.
+    """
+    revisions = await note_service.revisions.list_revisions(
+        note_id, user, page.limit, page.after_id
+    )
+    set_next_cursor(response, revisions, page.limit)
+    return revisions
+
+
+@router.get(
+    "/notes/{note_id}/revisions/{version}",
+    response_model=NoteRevisionResponse
+)
+async def get_note_revision(
+    note_id: int,
+    version: int,
+    user: User = Depends(require_role("user")),
+    note_service: NoteService = Depends(get_read_note_service)
+):
+    """
+    Получение заметки в состоянии указанной ревизии.
+
+    Аргументы:
+        note_id (int): ID заметки.
+        version (int): Версия заметки.
+        user (User): Текущий авторизованный пользователь.
+        note_service (NoteService): Сервис для работы с заметками.
+
+    Возвращает:
+        NoteRevisionResponse: Заголовок и текст ревизии.
+    """
+    return await note_service.revisions.get_revision(note_id, version, user)
+
+
+@router.post(
+    "/notes/{note_id}/revisions/{version}/revert",
+    response_model=NoteResponse
+)
+async def revert_note(
+    note_id: int,
+    version: int,
+    response: Response,
+    user: User = Depends(require_role("user")),
+    note_service: NoteService = Depends(get_note_service)
+):
+    """
+    Возврат заметки к состоянию ревизии (создает новую ревизию).
+
+    Аргументы:
+        note_id (int): ID заметки.
+        version (int): Версия, к которой нужно вернуться.
+        user (User): Текущий авторизованный пользователь.
+        note_service (NoteService): Сервис для работы с заметками.
+
+    Возвращает:
+        NoteResponse: Заметка после возврата.
+    """
+    note = await note_service.revert_note(note_id, version, user)
+    response.headers["ETag"] = note_etag(note.id, note.version)
     return note
 
 
@@ -150,39 +441,120 @@ async def delete_note(
     dependencies=[Depends(require_role("admin"))]
 )
 async def get_all_notes(
-    note_service: NoteService = Depends(get_note_service)
+    request: Request,
+    page: PageParams = Depends(),
+    view: NoteListView = Depends(),
+    stream: bool = Query(False),
+    note_service: NoteService = Depends(get_read_note_service)
 ):
     """
-    Получение всех заметок (для администраторов).
+    Получение страницы всех заметок (для администраторов).
+
+    Потоковый режим позволяет выгрузить все заметки с постоянным
+    расходом памяти.
 
     Аргументы:
+        page (PageParams): Размер страницы и курсор.
+        view (NoteListView): Набор полей и длина превью тела.
+        stream (bool): Включить потоковую выдачу.
         note_service (NoteService): Сервис для работы с заметками.
 
     Возвращает:
         List[NoteResponse]: Список всех заметок.
     """
-    notes = await note_service.get_all_notes()
-    return notes
+    if wants_stream(request, stream):
+        return stream_response(
+            request,
+            note_service.stream_all_notes(page.after_id, view)
+        )
+    notes = await note_service.get_all_notes(
+        page.limit, page.after_id, view
+    )
+    response = rows_response(notes)
+    set_next_cursor(response, notes, page.limit)
+    return response
 
 
 @router.get("/admin/users/{user_id}/notes/", response_model=List[NoteResponse])
 async def get_user_notes_admin(
     user_id: int,
+    request: Request,
+    page: PageParams = Depends(),
+    view: NoteListView = Depends(),
+    stream: bool = Query(False),
     _: User = Depends(require_role("admin")),
-    note_service: NoteService = Depends(get_note_service)
+    note_service: NoteService = Depends(get_read_note_service)
 ):
     """
-    Получение заметок пользователя (для администратора).
+    Получение страницы заметок пользователя (для администратора).
 
     Аргументы:
         user_id (int): ID пользователя, чьи заметки нужно получить.
+        page (PageParams): Размер страницы и курсор.
+        view (NoteListView): Набор полей и длина превью тела.
+        stream (bool): Включить потоковую выдачу.
         note_service (NoteService): Сервис для работы с заметками.
 
     Возвращает:
         List[NoteResponse]: Список заметок указанного пользователя.
     """
-    notes = await note_service.get_user_notes_admin(user_id)
-    return notes
+    if wants_stream(request, stream):
+        return stream_response(
+            request,
+            note_service.stream_user_notes_admin(
+                user_id, page.after_id, view
+            )
+        )
+    notes = await note_service.get_user_notes_admin(
+        user_id, page.limit, page.after_id, view
+    )
+    response = rows_response(notes)
+    set_next_cursor(response, notes, page.limit)
+    return response
+
+
+@router.post("/admin/notes/batch/restore", response_model=BatchResponse)
+async def restore_notes_batch(
+    batch: NoteBatchIds,
+    _: User = Depends(require_role("admin")),
+    note_service: NoteService = Depends(get_note_service)
+):
+    """
+    Восстановление нескольких удаленных заметок в одной транзакции.
+
+    Аргументы:
+        batch (NoteBatchIds): ID заметок для восстановления.
+        note_service (NoteService): Сервис для работы с заметками.
+
+    Возвращает:
+        BatchResponse: Результат для каждой заметки в порядке запроса.
+    """
+    results = await note_service.restore_notes(batch.ids)
+    return BatchResponse(results=results)
+
+
+@router.post("/admin/notes/archive", response_model=dict)
+async def archive_deleted_notes(
+    retention_days: float = Query(NOTE_RETENTION_DAYS, ge=0),
+    mode: Literal["archive", "purge"] = Query("archive"),
+    _: User = Depends(require_role("admin")),
+    db: AsyncSession = Depends(get_db)
+) -> dict:
+    """
+    Немедленный запуск архивации удаленных заметок (для администратора).
+
+    Аргументы:
+        retention_days (float): Архивировать заметки, удаленные раньше
+        этого числа дней назад.
+        mode (str): "archive" — перенос в архив, "purge" — удаление.
+
+    Возвращает:
+        dict: Количество обработанных заметок и режим.
+    """
+    processed = await NoteArchiveService(db).run(
+        retention_days=retention_days, mode=mode, pause=0
+    )
+    return {"processed": processed, "mode": mode}
 
 
 @router.post("/admin/notes/{note_id}/restore", response_model=dict)
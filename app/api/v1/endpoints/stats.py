@@ -0,0 +1,104 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import STATS_DEFAULT_DAYS
+from app.core.pagination import NEXT_CURSOR_HEADER, PageParams, encode_cursor
+from app.core.security import require_role
+from app.db.models import User
+from app.db.session import get_db, get_read_db
+from app.schemas.stats import (
+    NoteStatsSummary, StatsReconcileResult, UserNoteStats,
+    UserNoteStatsDetail
+)
+from app.services.stats import NoteStatsService
+
+from typing import List
+
+
+router = APIRouter()
+
+
+# Итоги по заметкам всех пользователей
+@router.get("/admin/stats", response_model=NoteStatsSummary)
+async def get_stats_summary(
+    days: int = Query(STATS_DEFAULT_DAYS, ge=1, le=366),
+    _: User = Depends(require_role("admin")),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Число заметок (неудаленных и удаленных), объем текстов и созданные
+    и измененные заметки по дням за последние `days` дней.
+
+    Данные читаются из сводки, поэтому время ответа зависит от числа
+    пользователей и дней, а не от числа заметок.
+
+    Аргументы:
+        days (int): Число дней в статистике по дням.
+
+    Возвращает:
+        NoteStatsSummary: Итоги и статистика по дням.
+    """
+    return await NoteStatsService(db).summary(days)
+
+
+# Сводка по пользователям
+@router.get("/admin/stats/users", response_model=List[UserNoteStats])
+async def get_users_stats(
+    response: Response,
+    page: PageParams = Depends(),
+    _: User = Depends(require_role("admin")),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Страница сводки по пользователям, у которых есть заметки, в порядке
+    ID пользователя. Курсор следующей страницы — в `X-Next-Cursor`.
+
+    Аргументы:
+        page (PageParams): Размер страницы и курсор.
+
+    Возвращает:
+        List[UserNoteStats]: Сводка пользователей страницы.
+    """
+    rows = await NoteStatsService(db).list_users(page.limit, page.after_id)
+    if rows and len(rows) == page.limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].user_id)
+    return rows
+
+
+# Сводка одного пользователя
+@router.get(
+    "/admin/stats/users/{user_id}", response_model=UserNoteStatsDetail
+)
+async def get_user_stats(
+    user_id: int,
+    days: int = Query(STATS_DEFAULT_DAYS, ge=1, le=366),
+    _: User = Depends(require_role("admin")),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Сводка пользователя и его созданные и измененные заметки по дням.
+
+    Аргументы:
+        user_id (int): ID пользователя.
+        days (int): Число дней в статистике по дням.
+
+    Возвращает:
+        UserNoteStatsDetail: Сводка пользователя.
+    """
+    return await NoteStatsService(db).user_stats(user_id, days)
+
+
+# Немедленная сверка сводки с заметками
+@router.post("/admin/stats/reconcile", response_model=StatsReconcileResult)
+async def reconcile_stats(
+    _: User = Depends(require_role("admin")),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Пересчитывает сводку всех пользователей по заметкам.
+
+    Возвращает:
+        StatsReconcileResult: Число обработанных пользователей и
+        пользователей с расхождениями.
+    """
+    return await NoteStatsService(db).reconcile(pause=0)
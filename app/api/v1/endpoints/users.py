@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.models import User
-from app.schemas.user import UserCreate, UserResponse
+from app.schemas.user import UserCreate, UserResponse, UserRoleUpdate
 from app.services.user import UserService
 from app.core.security import require_role
-from app.db.session import get_db
+from app.core.pagination import PageParams, set_next_cursor
+from app.db.session import get_db, get_read_db
 
 
 router = APIRouter()
@@ -13,11 +14,14 @@ router = APIRouter()
 # Получение списка всех пользователей (только для администратора)
 @router.get("/users/", response_model=list[UserResponse])
 async def get_all_users(
+    response: Response,
+    page: PageParams = Depends(),
     current_user: User = Depends(require_role("admin")),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     user_service = UserService(db)
-    users = await user_service.get_all_users()
+    users = await user_service.get_all_users(page.limit, page.after_id)
+    set_next_cursor(response, users, page.limit)
     return users
 
 
@@ -38,3 +42,26 @@ async def create_user(
     user_service = UserService(db)
     new_user = await user_service.create_user(user_data)
     return new_user
+
+
+# Изменение роли пользователя (только для администратора)
+@router.patch("/users/{user_id}/role", response_model=UserResponse)
+async def change_user_role(
+    user_id: int,
+    role_data: UserRoleUpdate,
+    current_user: User = Depends(require_role("admin")),
+    db: AsyncSession = Depends(get_db)
+):
+    user_service = UserService(db)
+    return await user_service.change_role(user_id, role_data.role.value)
+
+
+# Отзыв всех токенов пользователя (только для администратора)
+@router.post("/users/{user_id}/revoke", response_model=UserResponse)
+async def revoke_user_tokens(
+    user_id: int,
+    current_user: User = Depends(require_role("admin")),
+    db: AsyncSession = Depends(get_db)
+):
+    user_service = UserService(db)
+    return await user_service.revoke_tokens(user_id)
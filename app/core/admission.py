@@ -0,0 +1,351 @@
+import asyncio
+import contextlib
+import math
+import time
+
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Optional, Tuple
+
+import jwt
+from jwt.exceptions import InvalidTokenError
+from starlette.types import Scope
+
+from app.core.config import (
+    ADMISSION_CONTROL, ADMISSION_EXEMPT_PATHS, ADMISSION_MAX_CONCURRENCY,
+    ADMISSION_PRIORITY_PREFIXES, ADMISSION_PRIORITY_RESERVED,
+    ADMISSION_QUEUE_SIZE, ADMISSION_QUEUE_TIMEOUT, ADMISSION_RETRY_AFTER,
+    ADMISSION_STREAM_PATHS,
+    ALGORITHM, RATE_LIMIT_IP_BURST, RATE_LIMIT_IP_RATE, RATE_LIMIT_MAX_KEYS,
+    RATE_LIMIT_USER_BURST, RATE_LIMIT_USER_RATE, SECRET_KEY
+)
+from app.core.metrics import counter, gauge, histogram
+
+
+ADMISSION_ADMITTED = counter(
+    "admission_admitted_total",
+    "Запросы, допущенные к обработке",
+    ("priority",)
+)
+ADMISSION_REJECTED = counter(
+    "admission_rejected_total",
+    "Запросы, отклоненные контролем допуска",
+    ("reason",)
+)
+ADMISSION_QUEUE_WAIT = histogram(
+    "admission_queue_wait_seconds",
+    "Время ожидания места для обработки запроса",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+)
+ADMISSION_IN_FLIGHT = gauge(
+    "admission_in_flight",
+    "Запросы, занимающие место в лимите одновременных запросов",
+    function=lambda: _controller_stat("in_flight")
+)
+ADMISSION_QUEUED = gauge(
+    "admission_queued",
+    "Запросы, ожидающие места в лимите одновременных запросов",
+    function=lambda: _controller_stat("queued")
+)
+
+
+def _prefixes(value: str) -> Tuple[str, ...]:
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+class TokenBuckets:
+    """
+    Набор token bucket по ключам (пользователь или IP).
+
+    Каждый ключ получает `burst` токенов, которые восполняются со
+    скоростью `rate` в секунду; запрос расходует один токен. Число ключей
+    ограничено: при переполнении вытесняются давно неактивные, их
+    корзины к этому моменту обычно уже полны.
+    """
+    def __init__(self, rate: float, burst: int, max_keys: int = 100000):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, list] = OrderedDict()
+
+    def take(self, key: str, now: float | None = None) -> float:
+        """
+        Расходует токен ключа.
+
+        Аргументы:
+            key (str): Ключ корзины.
+            now (float | None): Текущее время (time.monotonic()).
+
+        Возвращает:
+            float: 0, если токен получен, иначе время в секундах до
+            появления следующего токена.
+        """
+        now = time.monotonic() if now is None else now
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [float(self.burst), now]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(
+                self.burst, bucket[0] + (now - bucket[1]) * self.rate
+            )
+            bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / self.rate
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class ConcurrencyLimiter:
+    """
+    Ограничение числа одновременно обрабатываемых запросов.
+
+    Приоритетным запросам доступен весь лимит, остальным — лимит без
+    `reserved` мест. Не получившие место сразу ждут в ограниченной
+    очереди не дольше `queue_timeout`; освободившееся место сначала
+    получает приоритетная очередь. Короткая очередь и таймаут ограничивают
+    задержку при перегрузке: лишние запросы отклоняются сразу, а не
+    накапливаются в ожидании соединений из пула.
+    """
+    def __init__(
+        self,
+        limit: int,
+        reserved: int = 0,
+        queue_size: int = 0,
+        queue_timeout: float = 0.0
+    ):
+        self.limit = max(limit, 1)
+        self.reserved = max(0, min(reserved, self.limit - 1))
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        # Число запросов, не дождавшихся места в очереди
+        self.timeouts = 0
+        self._waiters: Dict[bool, Deque[asyncio.Future]] = {
+            True: deque(), False: deque()
+        }
+
+    def _capacity(self, priority: bool) -> int:
+        return self.limit if priority else self.limit - self.reserved
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters[True]) + len(self._waiters[False])
+
+    async def acquire(self, priority: bool = False) -> bool:
+        """
+        Занимает место для обработки запроса.
+
+        Аргументы:
+            priority (bool): Приоритетный (административный) запрос.
+
+        Возвращает:
+            bool: True, если место получено (его нужно освободить через
+            release()), False — если очередь заполнена или время
+            ожидания истекло.
+        """
+        ahead = self._waiters[True] if priority else self.queued
+        if not ahead and self.in_flight < self._capacity(priority):
+            self.in_flight += 1
+            return True
+        if self.queued >= self.queue_size or self.queue_timeout <= 0:
+            return False
+        waiter = asyncio.get_running_loop().create_future()
+        queue = self._waiters[priority]
+        queue.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            with contextlib.suppress(ValueError):
+                queue.remove(waiter)
+        return True
+
+    def release(self) -> None:
+        """Освобождает место и передает его следующему в очереди."""
+        self.in_flight -= 1
+        for priority in (True, False):
+            queue = self._waiters[priority]
+            while queue and self.in_flight < self._capacity(priority):
+                waiter = queue.popleft()
+                if not waiter.done():
+                    waiter.set_result(True)
+                    self.in_flight += 1
+
+
+class AdmissionController:
+    """
+    Контроль допуска запросов: частота по пользователю/IP и общий лимит
+    одновременных запросов.
+
+    Пользователь определяется по подписи и полю `sub` Bearer-токена без
+    обращения к БД; запросы без действительного токена (регистрация,
+    вход) ограничиваются по IP клиента. Ограничения действуют в пределах
+    процесса: при нескольких воркерах у каждого свои лимиты, как и свой
+    пул соединений.
+    """
+    def __init__(
+        self,
+        max_concurrency: int = ADMISSION_MAX_CONCURRENCY,
+        priority_reserved: int = ADMISSION_PRIORITY_RESERVED,
+        queue_size: int = ADMISSION_QUEUE_SIZE,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT,
+        user_rate: float = RATE_LIMIT_USER_RATE,
+        user_burst: int = RATE_LIMIT_USER_BURST,
+        ip_rate: float = RATE_LIMIT_IP_RATE,
+        ip_burst: int = RATE_LIMIT_IP_BURST,
+        max_keys: int = RATE_LIMIT_MAX_KEYS,
+        priority_prefixes: str = ADMISSION_PRIORITY_PREFIXES,
+        exempt_paths: str = ADMISSION_EXEMPT_PATHS,
+        stream_paths: str = ADMISSION_STREAM_PATHS,
+        retry_after: int = ADMISSION_RETRY_AFTER
+    ):
+        self.limiter = ConcurrencyLimiter(
+            max_concurrency, priority_reserved, queue_size, queue_timeout
+        )
+        self.user_buckets = (
+            TokenBuckets(user_rate, user_burst, max_keys)
+            if user_rate > 0 else None
+        )
+        self.ip_buckets = (
+            TokenBuckets(ip_rate, ip_burst, max_keys)
+            if ip_rate > 0 else None
+        )
+        self.priority_prefixes = _prefixes(priority_prefixes)
+        self.exempt_paths = _prefixes(exempt_paths)
+        self.stream_paths = _prefixes(stream_paths)
+        self.retry_after = retry_after
+
+    def exempt(self, path: str) -> bool:
+        return path.startswith(self.exempt_paths)
+
+    def is_priority(self, path: str) -> bool:
+        return path.startswith(self.priority_prefixes)
+
+    def is_stream(self, path: str) -> bool:
+        # Поток событий открыт часами и не держит соединение с БД:
+        # в лимите одновременных запросов он занял бы место навсегда
+        return path.startswith(self.stream_paths)
+
+    @staticmethod
+    def identify(scope: Scope) -> Tuple[str, str]:
+        """
+        Определяет ключ ограничения частоты для запроса.
+
+        Аргументы:
+            scope (Scope): ASGI scope запроса.
+
+        Возвращает:
+            Tuple[str, str]: ("user", имя пользователя) для запроса с
+            действительным токеном, иначе ("ip", адрес клиента).
+        """
+        for name, value in scope.get("headers", ()):
+            if name != b"authorization":
+                continue
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                break
+            try:
+                payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            except InvalidTokenError:
+                break
+            if payload.get("sub"):
+                return "user", str(payload["sub"])
+            break
+        client = scope.get("client")
+        return "ip", client[0] if client else ""
+
+    def check_rate(self, scope: Scope) -> Optional[Tuple[str, int]]:
+        """
+        Расходует токен пользователя или IP.
+
+        Аргументы:
+            scope (Scope): ASGI scope запроса.
+
+        Возвращает:
+            Optional[Tuple[str, int]]: None, если запрос укладывается в
+            лимит, иначе причина отказа и Retry-After в секундах.
+        """
+        kind, key = self.identify(scope)
+        buckets = self.user_buckets if kind == "user" else self.ip_buckets
+        if buckets is None:
+            return None
+        wait = buckets.take(key)
+        if not wait:
+            return None
+        reason = f"{kind}_rate"
+        ADMISSION_REJECTED.inc(reason=reason)
+        return reason, max(1, math.ceil(wait))
+
+    async def acquire(self, priority: bool) -> bool:
+        """
+        Занимает место в лимите одновременных запросов с учетом метрик.
+
+        Аргументы:
+            priority (bool): Приоритетный (административный) запрос.
+
+        Возвращает:
+            bool: True, если запрос допущен.
+        """
+        started = time.perf_counter()
+        timeouts = self.limiter.timeouts
+        admitted = await self.limiter.acquire(priority)
+        if admitted:
+            ADMISSION_ADMITTED.inc(
+                priority="admin" if priority else "regular"
+            )
+            ADMISSION_QUEUE_WAIT.observe(time.perf_counter() - started)
+        elif self.limiter.timeouts != timeouts:
+            ADMISSION_REJECTED.inc(reason="queue_timeout")
+        else:
+            ADMISSION_REJECTED.inc(reason="overload")
+        return admitted
+
+    def release(self) -> None:
+        self.limiter.release()
+
+    def stats(self) -> dict:
+        """
+        Текущее состояние лимитов.
+
+        Возвращает:
+            dict: Лимит и занятые места, длина очереди, число
+            отслеживаемых ключей и счетчики отказов по причинам.
+        """
+        limiter = self.limiter
+        return {
+            "max_concurrency": limiter.limit,
+            "priority_reserved": limiter.reserved,
+            "in_flight": limiter.in_flight,
+            "queued": limiter.queued,
+            "queue_size": limiter.queue_size,
+            "queue_timeout": limiter.queue_timeout,
+            "user_keys": len(self.user_buckets or ()),
+            "ip_keys": len(self.ip_buckets or ()),
+            "rejected": {
+                reason: ADMISSION_REJECTED.value(reason=reason)
+                for reason in (
+                    "user_rate", "ip_rate", "overload", "queue_timeout"
+                )
+            },
+        }
+
+
+def _controller_stat(name: str) -> float:
+    if admission_controller is None:
+        return 0
+    return getattr(admission_controller.limiter, name)
+
+
+admission_controller = AdmissionController() if ADMISSION_CONTROL else None
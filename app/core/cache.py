@@ -0,0 +1,135 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from app.core.config import CACHE_MAX_BYTES, CACHE_REDIS_URL
+from app.core.metrics import counter, gauge
+
+from typing import Any, Tuple
+
+
+CACHE_HITS = counter(
+    "cache_hits_total", "Попадания в кеш", ("backend",)
+)
+CACHE_MISSES = counter(
+    "cache_misses_total", "Промахи кеша", ("backend",)
+)
+CACHE_EVICTIONS = counter(
+    "cache_evictions_total",
+    "Записи, вытесненные из кеша по размеру или сроку жизни",
+    ("backend",)
+)
+CACHE_BYTES = gauge(
+    "cache_bytes", "Объем данных в кеше в памяти процесса"
+)
+
+
+class CacheBackend(ABC):
+    """
+    Интерфейс хранилища кеша.
+
+    Значения — байтовые строки, ключи — строки.
+    """
+    name = "cache"
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        ...
+
+    async def close(self) -> None:
+        return None
+
+
+class MemoryCache(CacheBackend):
+    """
+    LRU-кеш в памяти процесса с TTL и ограничением по объему.
+
+    При превышении `max_bytes` вытесняются давно не использованные
+    записи.
+    """
+    name = "memory"
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[str, Tuple[float, bytes]] = OrderedDict()
+
+    def _drop(self, key: str) -> None:
+        _, value = self._entries.pop(key)
+        self.size -= len(value)
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._drop(key)
+            CACHE_EVICTIONS.inc(backend=self.name)
+            CACHE_BYTES.set(self.size)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        if len(value) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self.size += len(value)
+        while self.size > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            CACHE_EVICTIONS.inc(backend=self.name)
+        CACHE_BYTES.set(self.size)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            if key in self._entries:
+                self._drop(key)
+        CACHE_BYTES.set(self.size)
+
+
+class RedisCache(CacheBackend):
+    """
+    Кеш в Redis (или совместимом хранилище).
+
+    Принимает асинхронный клиент с методами `get`, `set(..., ex=)` и
+    `delete`, например `redis.asyncio.Redis`. Объем и вытеснение
+    регулируются настройками maxmemory самого Redis.
+    """
+    name = "redis"
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url: str = CACHE_REDIS_URL) -> "RedisCache":
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError(
+                "CACHE_BACKEND=redis requires the 'redis' package"
+            ) from e
+        return cls(redis_asyncio.from_url(url))
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.client.set(key, value, ex=max(1, int(ttl)))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*keys)
+
+    async def close(self) -> None:
+        await self.client.aclose()
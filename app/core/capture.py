@@ -0,0 +1,112 @@
+import hashlib
+import hmac
+import json
+import logging
+import random
+import time
+from urllib.parse import parse_qsl
+
+from app.core.config import (
+    REQUEST_CAPTURE, REQUEST_CAPTURE_FILE, REQUEST_CAPTURE_SAMPLE, SECRET_KEY
+)
+from app.core.logger import get_logger
+
+from typing import Any, Dict
+
+
+# Значения параметров запроса, сохраняемые как есть; остальные
+# (поисковые строки, курсоры) заменяются на null
+_SAFE_QUERY_VALUES = frozenset({"true", "false", "ndjson", "json"})
+
+
+class JsonLineFormatter(logging.Formatter):
+    """Форматирует запись, переданную словарем, как строку JSON."""
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(record.msg, separators=(",", ":"))
+
+
+def user_hash(user_id: int | None) -> str | None:
+    """
+    Псевдоним пользователя для записи трафика.
+
+    HMAC от id на SECRET_KEY: одинаков для одного пользователя в рамках
+    развертывания, но не раскрывает id.
+    """
+    if user_id is None:
+        return None
+    digest = hmac.new(
+        SECRET_KEY.encode(), str(user_id).encode(), hashlib.sha256
+    )
+    return digest.hexdigest()[:16]
+
+
+def sanitize_query(query_string: bytes) -> Dict[str, Any]:
+    """
+    Оставляет из строки запроса имена параметров и безопасные значения.
+
+    Числа и флаги сохраняются (они определяют форму нагрузки: размер
+    страницы, потоковую выдачу), произвольные строки заменяются на None.
+    """
+    query: Dict[str, Any] = {}
+    for key, value in parse_qsl(query_string.decode("latin-1")):
+        if value.isdigit() or value.lower() in _SAFE_QUERY_VALUES:
+            query[key] = value
+        else:
+            query[key] = None
+    return query
+
+
+class RequestCapture:
+    """
+    Запись обезличенных сведений о запросах в JSONL.
+
+    Сохраняются метод, шаблон маршрута, параметры запроса без
+    произвольных строк, размеры тела запроса и ответа, статус, время
+    обработки и псевдоним пользователя. Тела запросов и токены не
+    сохраняются. Запись выполняется фоновым потоком логирования.
+    """
+    def __init__(self, path: str, sample: float = 1.0):
+        """
+        Аргументы:
+            path (str): Путь к файлу JSONL.
+            sample (float): Доля записываемых запросов от 0 до 1.
+        """
+        self.path = path
+        self.sample = sample
+        self.logger = get_logger(
+            "app.capture", log_file=path, formatter=JsonLineFormatter()
+        )
+        self.logger.propagate = False
+
+    def sampled(self) -> bool:
+        return self.sample >= 1.0 or random.random() < self.sample
+
+    def record(
+        self,
+        *,
+        method: str,
+        route: str,
+        query_string: bytes,
+        status: int,
+        duration: float,
+        request_bytes: int,
+        response_bytes: int,
+        user_id: int | None,
+    ) -> None:
+        self.logger.info({
+            "ts": round(time.time(), 6),
+            "method": method,
+            "route": route,
+            "query": sanitize_query(query_string),
+            "status": status,
+            "duration_ms": round(duration * 1000, 3),
+            "request_bytes": request_bytes,
+            "response_bytes": response_bytes,
+            "user": user_hash(user_id),
+        })
+
+
+request_capture = (
+    RequestCapture(REQUEST_CAPTURE_FILE, REQUEST_CAPTURE_SAMPLE)
+    if REQUEST_CAPTURE else None
+)
@@ -14,3 +14,182 @@ SECRET_KEY: str = settings["secret_key"]
 ALGORITHM: str = settings["algorithm"]
 ACCESS_TOKEN_EXPIRE_MINUTES: int = int(settings["access_token_expire_minutes"])
 LOG_FILE: str = settings["log_file"]
+
+# Пагинация списков
+DEFAULT_PAGE_SIZE: int = int(settings.get("default_page_size", 100))
+MAX_PAGE_SIZE: int = int(settings.get("max_page_size", 1000))
+
+# Потоковая выдача списков
+STREAM_CHUNK_SIZE: int = int(settings.get("stream_chunk_size", 500))
+
+# Полнотекстовый поиск (конфигурация text search для PostgreSQL)
+SEARCH_CONFIG: str = settings.get("search_config", "simple")
+
+# Пул для хеширования паролей (bcrypt)
+HASH_EXECUTOR: str = settings.get("hash_executor", "thread")
+HASH_WORKERS: int = int(settings.get("hash_workers", 4))
+HASH_QUEUE_SIZE: int = int(settings.get("hash_queue_size", 32))
+
+# Логирование
+LOG_FORMAT: str = settings.get("log_format", "text")
+LOG_BATCH_SIZE: int = int(settings.get("log_batch_size", 256))
+LOG_QUEUE_SIZE: int = int(settings.get("log_queue_size", 10000))
+# Доля сохраняемых INFO-записей по логгерам, например:
+# LOG_SAMPLING="app.middleware=0.1,app.service.note=0.5"
+LOG_SAMPLING: str = settings.get("log_sampling", "")
+
+# Пакетные операции над заметками
+BATCH_MAX_ITEMS: int = int(settings.get("batch_max_items", 1000))
+
+# Кеш чтения заметок: "memory", "redis" или "none"
+CACHE_BACKEND: str = settings.get("cache_backend", "memory")
+CACHE_TTL: int = int(settings.get("cache_ttl", 60))
+CACHE_MAX_BYTES: int = int(settings.get("cache_max_bytes", 64 * 1024 * 1024))
+CACHE_REDIS_URL: str = settings.get(
+    "cache_redis_url", "redis://localhost:6379/0"
+)
+
+# Пул соединений с БД
+DB_POOL_SIZE: int = int(settings.get("db_pool_size", 5))
+DB_MAX_OVERFLOW: int = int(settings.get("db_max_overflow", 10))
+DB_POOL_TIMEOUT: float = float(settings.get("db_pool_timeout", 30))
+DB_POOL_RECYCLE: int = int(settings.get("db_pool_recycle", 1800))
+DB_POOL_PRE_PING: bool = str(
+    settings.get("db_pool_pre_ping", "true")
+).lower() in ("1", "true", "yes")
+# Размер кеша подготовленных выражений asyncpg на соединение
+DB_STATEMENT_CACHE_SIZE: int = int(
+    settings.get("db_statement_cache_size", 100)
+)
+
+# Запись трафика в JSONL для последующего воспроизведения
+REQUEST_CAPTURE: bool = str(
+    settings.get("request_capture", "false")
+).lower() in ("1", "true", "yes")
+REQUEST_CAPTURE_FILE: str = settings.get(
+    "request_capture_file", "requests.jsonl"
+)
+REQUEST_CAPTURE_SAMPLE: float = float(
+    settings.get("request_capture_sample", 1.0)
+)
+
+# Максимальная длина превью тела заметки в списках (?preview=N)
+MAX_PREVIEW_LENGTH: int = int(settings.get("max_preview_length", 10000))
+
+# Количество соединений пула, открываемых до приема запросов
+DB_POOL_WARM: int = int(settings.get("db_pool_warm", min(DB_POOL_SIZE, 2)))
+
+# Архивация удаленных заметок: "archive" (перенос в note_archive),
+# "purge" (безвозвратное удаление) или "off"
+ARCHIVE_MODE: str = settings.get("archive_mode", "archive")
+# Срок хранения удаленных заметок в основной таблице, дни
+NOTE_RETENTION_DAYS: float = float(settings.get("note_retention_days", 30))
+ARCHIVE_BATCH_SIZE: int = int(settings.get("archive_batch_size", 500))
+# Пауза между пачками, секунды (ограничивает нагрузку на БД)
+ARCHIVE_BATCH_PAUSE: float = float(settings.get("archive_batch_pause", 0.5))
+# Интервал между запусками архивации, секунды
+ARCHIVE_INTERVAL: float = float(settings.get("archive_interval", 3600))
+
+# Контроль допуска запросов (на процесс): ограничение одновременных
+# запросов и частоты запросов пользователя/IP
+ADMISSION_CONTROL: bool = str(
+    settings.get("admission_control", "true")
+).lower() in ("1", "true", "yes")
+# По умолчанию равно числу соединений пула: запрос держит не более одного
+ADMISSION_MAX_CONCURRENCY: int = int(
+    settings.get("admission_max_concurrency", DB_POOL_SIZE + DB_MAX_OVERFLOW)
+)
+# Места, доступные только административным маршрутам
+ADMISSION_PRIORITY_RESERVED: int = int(
+    settings.get("admission_priority_reserved", 2)
+)
+ADMISSION_PRIORITY_PREFIXES: str = settings.get(
+    "admission_priority_prefixes", "/admin,/api/v1/admin"
+)
+# Маршруты без ограничений (мониторинг должен работать под нагрузкой)
+ADMISSION_EXEMPT_PATHS: str = settings.get(
+    "admission_exempt_paths", "/health,/metrics"
+)
+# Долгие потоковые маршруты (события): ограничивается частота
+# подключений, но не лимит одновременных запросов
+ADMISSION_STREAM_PATHS: str = settings.get(
+    "admission_stream_paths", "/api/v1/events"
+)
+# Очередь ожидания свободного места и максимальное время ожидания, секунды
+ADMISSION_QUEUE_SIZE: int = int(
+    settings.get("admission_queue_size", ADMISSION_MAX_CONCURRENCY * 4)
+)
+ADMISSION_QUEUE_TIMEOUT: float = float(
+    settings.get("admission_queue_timeout", 0.5)
+)
+# Retry-After для ответов 503, секунды
+ADMISSION_RETRY_AFTER: int = int(settings.get("admission_retry_after", 1))
+# Частота (запросов в секунду) и запас токенов; 0 отключает ограничение
+RATE_LIMIT_USER_RATE: float = float(settings.get("rate_limit_user_rate", 20))
+RATE_LIMIT_USER_BURST: int = int(settings.get("rate_limit_user_burst", 40))
+RATE_LIMIT_IP_RATE: float = float(settings.get("rate_limit_ip_rate", 5))
+RATE_LIMIT_IP_BURST: int = int(settings.get("rate_limit_ip_burst", 20))
+# Максимальное число отслеживаемых ключей (вытесняются давно неактивные)
+RATE_LIMIT_MAX_KEYS: int = int(settings.get("rate_limit_max_keys", 100000))
+
+# Реплики для чтения: URL через запятую; пусто — все запросы к основной БД
+DB_REPLICA_URLS: str = settings.get("db_replica_urls", "")
+# Выбор реплики: "round_robin" или "least_loaded" (меньше всего
+# выданных соединений пула)
+DB_REPLICA_STRATEGY: str = settings.get("db_replica_strategy", "round_robin")
+# Сколько секунд после записи чтения пользователя идут в основную БД
+# (реплика могла еще не получить изменения)
+DB_READ_STICKY_SECONDS: float = float(
+    settings.get("db_read_sticky_seconds", 5)
+)
+
+# Период обновления списка отозванных токенов (смена роли, отзыв), секунды
+AUTH_REVOCATION_REFRESH: float = float(
+    settings.get("auth_revocation_refresh", 5)
+)
+
+# История ревизий заметок: максимальная длина цепочки дельт до полной
+# копии (ограничивает стоимость восстановления ревизии) и предельная доля
+# размера дельты относительно текста, при которой сохраняется полная копия
+REVISION_SNAPSHOT_INTERVAL: int = int(
+    settings.get("revision_snapshot_interval", 10)
+)
+REVISION_MAX_DELTA_RATIO: float = float(
+    settings.get("revision_max_delta_ratio", 0.5)
+)
+
+# Уведомления об изменениях заметок (SSE): брокер для обмена событиями
+# между воркерами — "memory" (в пределах процесса), "redis" или "none"
+EVENTS_BROKER: str = settings.get("events_broker", "memory")
+EVENTS_REDIS_URL: str = settings.get("events_redis_url", CACHE_REDIS_URL)
+# Очередь событий подписчика: при переполнении медленный подписчик
+# отключается и должен синхронизироваться заново
+EVENTS_QUEUE_SIZE: int = int(settings.get("events_queue_size", 100))
+# Интервал комментариев keep-alive в потоке событий, секунды
+EVENTS_KEEPALIVE: float = float(settings.get("events_keepalive", 15))
+
+# Профилирование SQL по HTTP-запросам: число запросов к БД и время в
+# заголовке Server-Timing, поиск повторяющихся запросов (N+1)
+SQL_PROFILING: bool = str(
+    settings.get("sql_profiling", "false")
+).lower() in ("1", "true", "yes")
+# Одинаковый запрос, выполненный за HTTP-запрос не меньше этого числа
+# раз, считается признаком N+1
+SQL_REPEAT_THRESHOLD: int = int(settings.get("sql_repeat_threshold", 5))
+# Запросы дольше порога (мс) пишутся в журнал медленных запросов
+# с типами параметров вместо значений; 0 отключает журнал
+SQL_SLOW_QUERY_MS: float = float(settings.get("sql_slow_query_ms", 100))
+SQL_SLOW_QUERY_LOG: str = settings.get("sql_slow_query_log", LOG_FILE)
+
+# Сверка сводной статистики заметок (note_stats) с таблицами заметок:
+# интервал между запусками, секунды (0 — только вручную), число
+# пользователей в одной транзакции и пауза между пачками, секунды
+STATS_RECONCILE_INTERVAL: float = float(
+    settings.get("stats_reconcile_interval", 86400)
+)
+STATS_RECONCILE_BATCH: int = int(settings.get("stats_reconcile_batch", 200))
+STATS_RECONCILE_PAUSE: float = float(
+    settings.get("stats_reconcile_pause", 0.5)
+)
+# Число дней в статистике созданий и изменений по умолчанию
+STATS_DEFAULT_DAYS: int = int(settings.get("stats_default_days", 30))
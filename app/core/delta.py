@@ -0,0 +1,127 @@
+import json
+from difflib import SequenceMatcher
+
+from typing import List, Tuple
+
+
+# Заменяемые фрагменты не длиннее этого размера (в сумме, символов)
+# сравниваются посимвольно, более длинные сохраняются целиком
+CHAR_DIFF_LIMIT = 2000
+
+
+def _copy(ops: list, start: int, end: int) -> None:
+    if start == end:
+        return
+    last = ops[-1] if ops else None
+    if isinstance(last, list) and last[0] + last[1] == start:
+        last[1] += end - start
+    else:
+        ops.append([start, end - start])
+
+
+def _insert(ops: list, text: str) -> None:
+    if not text:
+        return
+    if ops and isinstance(ops[-1], str):
+        ops[-1] += text
+    else:
+        ops.append(text)
+
+
+def _offsets(lines: List[str]) -> List[int]:
+    offsets = [0]
+    for line in lines:
+        offsets.append(offsets[-1] + len(line))
+    return offsets
+
+
+def make_delta(old: str, new: str) -> str:
+    """
+    Строит дельту, преобразующую `old` в `new`.
+
+    Тексты сравниваются по строкам (difflib.SequenceMatcher); небольшие
+    замененные фрагменты дополнительно сравниваются посимвольно, чтобы
+    правка слова в длинной строке не сохраняла строку целиком. Дельта —
+    JSON-список операций: `[начало, длина]` копирует фрагмент `old`,
+    строка вставляется как есть.
+
+    Аргументы:
+        old (str): Исходный текст.
+        new (str): Новый текст.
+
+    Возвращает:
+        str: Дельта в компактном JSON.
+    """
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    old_offsets, new_offsets = _offsets(old_lines), _offsets(new_lines)
+    ops: list = []
+    matcher = SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        start, end = old_offsets[i1], old_offsets[i2]
+        inserted = new[new_offsets[j1]:new_offsets[j2]]
+        if tag == "equal":
+            _copy(ops, start, end)
+        elif tag == "insert":
+            _insert(ops, inserted)
+        elif tag == "replace" and (
+            end - start + len(inserted) <= CHAR_DIFF_LIMIT
+        ):
+            chars = SequenceMatcher(
+                None, old[start:end], inserted, autojunk=False
+            )
+            for op, a1, a2, b1, b2 in chars.get_opcodes():
+                if op == "equal":
+                    _copy(ops, start + a1, start + a2)
+                else:
+                    _insert(ops, inserted[b1:b2])
+        elif tag == "replace":
+            _insert(ops, inserted)
+    return json.dumps(ops, ensure_ascii=False, separators=(",", ":"))
+
+
+def apply_delta(old: str, delta: str) -> str:
+    """
+    Применяет дельту из make_delta к исходному тексту.
+
+    Аргументы:
+        old (str): Текст, для которого строилась дельта.
+        delta (str): Дельта.
+
+    Возвращает:
+        str: Новый текст.
+    """
+    return "".join(
+        old[op[0]:op[0] + op[1]] if isinstance(op, list) else op
+        for op in json.loads(delta)
+    )
+
+
+def encode_revision(
+    old: str, new: str, depth: int, interval: int, max_ratio: float
+) -> Tuple[bool, str, int]:
+    """
+    Выбирает способ хранения новой ревизии текста.
+
+    Полная копия сохраняется, если от последней полной копии накопилось
+    `interval - 1` дельт (восстановление любой ревизии применяет не
+    больше `interval - 1` дельт) или если дельта не меньше `max_ratio`
+    от размера текста.
+
+    Аргументы:
+        old (str): Текст предыдущей ревизии.
+        new (str): Текст новой ревизии.
+        depth (int): Число дельт после последней полной копии
+        в предыдущей ревизии.
+        interval (int): Максимальная длина цепочки ревизий.
+        max_ratio (float): Предельная доля размера дельты.
+
+    Возвращает:
+        Tuple[bool, str, int]: Признак полной копии, данные ревизии и
+        ее глубина (0 для полной копии).
+    """
+    if depth + 1 < interval:
+        delta = make_delta(old, new)
+        if len(delta) < len(new) * max_ratio:
+            return False, delta, depth + 1
+    return True, new, 0
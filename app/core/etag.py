@@ -0,0 +1,50 @@
+import hashlib
+
+from fastapi import Request, Response, status
+
+
+def note_etag(note_id: int, version: int) -> str:
+    """
+    Строгий ETag заметки по ее ID и версии.
+    """
+    return f'"n{note_id}.{version}"'
+
+
+def list_etag(user_id: int, notes_version: int, *params: object) -> str:
+    """
+    Строгий ETag страницы списка заметок.
+
+    Зависит от версии списка заметок пользователя, которая меняется при
+    любом создании, изменении, удалении или восстановлении заметки,
+    и от параметров запроса, определяющих содержимое страницы.
+    """
+    digest = hashlib.blake2s(
+        repr(params).encode(), digest_size=6
+    ).hexdigest()
+    return f'"l{user_id}.{notes_version}.{digest}"'
+
+
+def if_none_match(request: Request, etag: str) -> bool:
+    """
+    Проверяет, совпадает ли ETag с заголовком `If-None-Match` запроса.
+
+    Для GET используется слабое сравнение: префикс `W/` игнорируется.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {
+        tag.strip().removeprefix("W/") for tag in header.split(",")
+    }
+    return etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    """
+    Ответ 304 Not Modified без тела.
+    """
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+    )
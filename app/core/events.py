@@ -0,0 +1,299 @@
+import asyncio
+import contextlib
+from abc import ABC, abstractmethod
+
+from app.core.config import (
+    EVENTS_BROKER, EVENTS_QUEUE_SIZE, EVENTS_REDIS_URL, LOG_FILE
+)
+from app.core.logger import get_logger
+from app.core.metrics import counter, gauge
+from app.core.serialization import dumps
+
+from typing import Any, Awaitable, Callable, Dict, List, Set
+
+
+logger = get_logger("app.core.events", log_file=LOG_FILE)
+
+EVENTS_PUBLISHED = counter(
+    "events_published_total", "События, отправленные в брокер", ("broker",)
+)
+EVENTS_DELIVERED = counter(
+    "events_delivered_total", "События, поставленные в очереди подписчиков"
+)
+EVENTS_EVICTED = counter(
+    "events_subscribers_evicted_total",
+    "Подписчики, отключенные из-за переполнения очереди"
+)
+EVENTS_SUBSCRIBERS = gauge(
+    "events_subscribers",
+    "Подключенные подписчики событий в процессе",
+    function=lambda: len(event_hub) if event_hub is not None else 0
+)
+
+Deliver = Callable[[bytes], Awaitable[None]]
+
+
+class EventBroker(ABC):
+    """
+    Интерфейс обмена событиями между воркерами.
+
+    Каждый EventHub при запуске подписывается на брокер и получает все
+    опубликованные сообщения (в том числе свои), после чего раздает их
+    локальным подписчикам. Сообщения — байтовые строки.
+    """
+    name = "broker"
+
+    @abstractmethod
+    async def start(self, deliver: Deliver) -> None:
+        """Подписывает обработчик на все сообщения брокера."""
+
+    @abstractmethod
+    async def publish(self, message: bytes) -> None:
+        ...
+
+    async def close(self) -> None:
+        return None
+
+
+class LocalBroker(EventBroker):
+    """
+    Брокер в памяти процесса.
+
+    Раздает сообщение всем подписанным обработчикам. Несколько EventHub
+    с общим LocalBroker ведут себя как воркеры с общим внешним брокером,
+    поэтому он же используется как его замена в тестах.
+    """
+    name = "memory"
+
+    def __init__(self):
+        self._handlers: List[Deliver] = []
+
+    async def start(self, deliver: Deliver) -> None:
+        self._handlers.append(deliver)
+
+    async def publish(self, message: bytes) -> None:
+        for deliver in list(self._handlers):
+            await deliver(message)
+
+    async def close(self) -> None:
+        self._handlers.clear()
+
+
+class RedisBroker(EventBroker):
+    """
+    Брокер на Redis Pub/Sub: события доходят до подписчиков всех
+    воркеров и экземпляров приложения.
+
+    Доставка не гарантируется (сообщения, отправленные во время
+    переподключения, теряются): события — только подсказка клиенту
+    запросить изменения, а сами изменения он получает по курсору
+    синхронизации.
+    """
+    name = "redis"
+
+    def __init__(self, client: Any, channel: str = "notes:events"):
+        self.client = client
+        self.channel = channel
+        self._pubsub = None
+        self._reader: asyncio.Task | None = None
+
+    @classmethod
+    def from_url(cls, url: str = EVENTS_REDIS_URL) -> "RedisBroker":
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError(
+                "EVENTS_BROKER=redis requires the 'redis' package"
+            ) from e
+        return cls(redis_asyncio.from_url(url))
+
+    async def start(self, deliver: Deliver) -> None:
+        self._pubsub = self.client.pubsub()
+        await self._pubsub.subscribe(self.channel)
+        self._reader = asyncio.create_task(self._read(deliver))
+
+    async def _read(self, deliver: Deliver) -> None:
+        async for message in self._pubsub.listen():
+            if message["type"] != "message":
+                continue
+            try:
+                await deliver(message["data"])
+            except Exception as e:
+                logger.error("Event delivery failed", exc_info=e)
+
+    async def publish(self, message: bytes) -> None:
+        await self.client.publish(self.channel, message)
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reader
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+        await self.client.aclose()
+
+
+class Subscription:
+    """
+    Подписка на события пользователя с ограниченной очередью.
+
+    Если подписчик не успевает забирать события и очередь заполнена,
+    он отключается (`evicted`): get() сразу возвращает None, а клиент
+    должен переподключиться и запросить изменения по курсору.
+    """
+    def __init__(self, user_id: int, queue_size: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue[bytes | None] = asyncio.Queue(
+            max(queue_size, 1)
+        )
+        self.evicted = False
+
+    def put(self, message: bytes) -> bool:
+        """
+        Ставит событие в очередь без ожидания.
+
+        Возвращает:
+            bool: False, если очередь заполнена.
+        """
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    def evict(self) -> None:
+        """Отключает подписчика: недоставленные события отбрасываются."""
+        self.evicted = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        # Будит ожидающий get()
+        self.queue.put_nowait(None)
+
+    async def get(self, timeout: float | None = None) -> bytes | None:
+        """
+        Следующее событие.
+
+        Аргументы:
+            timeout (float | None): Максимальное время ожидания, секунды.
+
+        Возвращает:
+            bytes | None: Событие (JSON) или None, если подписчик отключен.
+
+        Исключения:
+            asyncio.TimeoutError: За `timeout` не пришло ни одного события.
+        """
+        if self.evicted:
+            return None
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class EventHub:
+    """
+    Раздача событий подписчикам процесса.
+
+    Публикация отправляет событие в брокер, брокер возвращает его всем
+    воркерам, и каждый воркер кладет его в очереди подписчиков этого
+    пользователя. Ошибки брокера не прерывают запись заметок:
+    публикация в этом случае только пишется в лог.
+    """
+    def __init__(
+        self, broker: EventBroker, queue_size: int = EVENTS_QUEUE_SIZE
+    ):
+        """
+        Аргументы:
+            broker (EventBroker): Брокер для обмена событиями.
+            queue_size (int): Размер очереди каждого подписчика.
+        """
+        self.broker = broker
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        self._started = False
+
+    def __len__(self) -> int:
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    async def _start(self) -> None:
+        # Флаг ставится до await: параллельный вызов не подпишется дважды
+        if not self._started:
+            self._started = True
+            await self.broker.start(self._deliver)
+
+    async def subscribe(self, user_id: int) -> Subscription:
+        """
+        Подписывает на события заметок пользователя.
+
+        Подписку нужно закрыть через unsubscribe() при отключении клиента.
+        """
+        await self._start()
+        subscription = Subscription(user_id, self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subs = self._subscribers.get(subscription.user_id)
+        if subs is None:
+            return
+        subs.discard(subscription)
+        if not subs:
+            del self._subscribers[subscription.user_id]
+
+    async def publish(self, user_id: int, event: Dict[str, Any]) -> None:
+        """
+        Публикует событие для подписчиков пользователя во всех воркерах.
+
+        Аргументы:
+            user_id (int): Владелец измененных заметок.
+            event (Dict[str, Any]): Данные события (сериализуются в JSON).
+        """
+        message = str(user_id).encode() + b"\n" + dumps(event)
+        try:
+            await self._start()
+            await self.broker.publish(message)
+        except Exception as e:
+            logger.warning(
+                "Event publish failed for user %s", user_id, exc_info=e
+            )
+            return
+        EVENTS_PUBLISHED.inc(broker=self.broker.name)
+
+    async def _deliver(self, message: bytes) -> None:
+        user_id, _, payload = message.partition(b"\n")
+        for subscription in list(self._subscribers.get(int(user_id), ())):
+            if subscription.put(payload):
+                EVENTS_DELIVERED.inc()
+                continue
+            logger.info(
+                "Evicting slow event subscriber of user %s",
+                subscription.user_id
+            )
+            EVENTS_EVICTED.inc()
+            subscription.evict()
+            self.unsubscribe(subscription)
+
+    async def close(self) -> None:
+        for subs in list(self._subscribers.values()):
+            for subscription in list(subs):
+                subscription.evict()
+        self._subscribers.clear()
+        self._started = False
+        await self.broker.close()
+
+
+def build_event_hub(broker: str = EVENTS_BROKER) -> EventHub | None:
+    """
+    Создает раздачу событий по настройке EVENTS_BROKER.
+
+    Возвращает:
+        EventHub | None: Раздача событий или None, если события отключены.
+    """
+    if broker == "none":
+        return None
+    if broker == "memory":
+        return EventHub(LocalBroker())
+    if broker == "redis":
+        return EventHub(RedisBroker.from_url())
+    raise ValueError(f"Unknown events broker: {broker}")
+
+
+event_hub = build_event_hub()
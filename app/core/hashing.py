@@ -0,0 +1,141 @@
+import asyncio
+import time
+from concurrent.futures import (
+    Executor, ProcessPoolExecutor, ThreadPoolExecutor
+)
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.core.config import HASH_EXECUTOR, HASH_QUEUE_SIZE, HASH_WORKERS
+from app.core.metrics import counter, gauge, histogram
+
+from typing import Any, Callable
+
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+HASH_IN_FLIGHT = gauge(
+    "password_hash_in_flight",
+    "Операции хеширования, выполняемые или ожидающие в пуле"
+)
+HASH_QUEUE_DEPTH = gauge(
+    "password_hash_queue_depth",
+    "Операции хеширования, ожидающие свободного воркера"
+)
+HASH_LATENCY = histogram(
+    "password_hash_duration_seconds",
+    "Время операции хеширования, включая ожидание в очереди",
+    ("operation",)
+)
+HASH_REJECTED = counter(
+    "password_hash_rejected_total",
+    "Операции хеширования, отклоненные из-за переполнения очереди",
+    ("operation",)
+)
+
+
+def hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def check_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Выполняет bcrypt в пуле потоков или процессов вне event loop.
+
+    Число одновременно принятых операций ограничено `workers + queue_size`.
+    При переполнении запрос сразу получает 503, а не накапливается
+    в очереди, увеличивая задержку для всех остальных.
+    """
+    def __init__(
+        self,
+        workers: int = HASH_WORKERS,
+        queue_size: int = HASH_QUEUE_SIZE,
+        executor: str = HASH_EXECUTOR,
+    ):
+        """
+        Аргументы:
+            workers (int): Количество воркеров пула.
+            queue_size (int): Максимальное число ожидающих операций.
+            executor (str): Тип пула: "thread" или "process".
+        """
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown hash executor: {executor}")
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.executor_kind = executor
+        self._executor: Executor | None = None
+        self._in_flight = 0
+
+    def _get_executor(self) -> Executor:
+        # Пул создается лениво, чтобы не плодить потоки и процессы
+        # при импорте и до форка воркеров сервера.
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    self.workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    def _update_gauges(self) -> None:
+        HASH_IN_FLIGHT.set(self._in_flight)
+        HASH_QUEUE_DEPTH.set(max(0, self._in_flight - self.workers))
+
+    async def _run(
+        self, operation: str, func: Callable[..., Any], *args: Any
+    ) -> Any:
+        if self._in_flight >= self.capacity:
+            HASH_REJECTED.inc(operation=operation)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Service is overloaded, try again later",
+                headers={"Retry-After": "1"},
+            )
+        self._in_flight += 1
+        self._update_gauges()
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(), func, *args
+            )
+        finally:
+            self._in_flight -= 1
+            self._update_gauges()
+            HASH_LATENCY.observe(
+                time.perf_counter() - start, operation=operation
+            )
+
+    async def hash(self, password: str) -> str:
+        """
+        Хеширует пароль в пуле.
+
+        Исключения:
+            HTTPException: Ошибка 503, если пул перегружен.
+        """
+        return await self._run("hash", hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Проверяет пароль в пуле.
+
+        Исключения:
+            HTTPException: Ошибка 503, если пул перегружен.
+        """
+        return await self._run(
+            "verify", check_password, plain_password, hashed_password
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
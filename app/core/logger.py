@@ -1,17 +1,267 @@
+import atexit
+import json
 import logging
+import os
+import queue
+import random
+import threading
+from logging.handlers import QueueHandler
+
+from app.core.config import (
+    LOG_BATCH_SIZE, LOG_FORMAT, LOG_QUEUE_SIZE, LOG_SAMPLING
+)
+from app.core.metrics import counter
+
+from typing import Dict, List
+
+
+LOG_DROPPED = counter(
+    "log_records_dropped_total",
+    "Записи лога, отброшенные из-за переполнения очереди"
+)
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Стандартные атрибуты LogRecord, которые не попадают в JSON как extra
+_RESERVED_ATTRS = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__
+) | {"message", "asctime"}
+
+_STOP = object()
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Форматирует запись лога в одну строку JSON.
+
+    Поля, переданные через `extra=`, добавляются в объект как есть.
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def parse_sampling(spec: str) -> Dict[str, float]:
+    """
+    Разбирает настройку семплирования вида "logger=rate,logger=rate".
+    """
+    rates = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, rate = item.partition("=")
+        rates[name.strip()] = float(rate)
+    return rates
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Пропускает только долю INFO- и DEBUG-записей указанных логгеров.
+
+    Доля берется по самому длинному совпадающему префиксу имени логгера.
+    Записи уровня WARNING и выше пропускаются всегда.
+    """
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def _rate(self, name: str) -> float:
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return 1.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class _LazyQueueHandler(QueueHandler):
+    """
+    QueueHandler без форматирования в вызывающем потоке.
+
+    Стандартный QueueHandler форматирует сообщение перед постановкой
+    в очередь; здесь запись передается как есть, и подстановка аргументов
+    выполняется уже в фоновом потоке записи.
+    """
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_DROPPED.inc()
+
+
+class _BatchWriter(threading.Thread):
+    """
+    Фоновый поток, записывающий лог в файл пачками.
+
+    Забирает из очереди все накопившиеся записи (не более LOG_BATCH_SIZE),
+    форматирует их и записывает одним вызовом write с одним flush.
+    """
+    def __init__(
+        self,
+        path: str,
+        formatter: logging.Formatter,
+        records: queue.Queue | None = None,
+    ):
+        super().__init__(name=f"log-writer:{path}", daemon=True)
+        self.path = path
+        self.formatter = formatter
+        self.queue: queue.Queue = (
+            records if records is not None else queue.Queue(LOG_QUEUE_SIZE)
+        )
+
+    def run(self) -> None:
+        with open(self.path, "a", encoding="utf-8") as stream:
+            while True:
+                batch = [self.queue.get()]
+                while len(batch) < LOG_BATCH_SIZE:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if self._write(stream, batch):
+                    return
+
+    def _write(self, stream, batch: List[object]) -> bool:
+        lines = []
+        events = []
+        stop = False
+        for item in batch:
+            if item is _STOP:
+                stop = True
+            elif isinstance(item, threading.Event):
+                events.append(item)
+            else:
+                try:
+                    lines.append(self.formatter.format(item))  # type: ignore
+                except Exception:
+                    lines.append(f"Failed to format log record: {item!r}")
+        if lines:
+            stream.write("\n".join(lines) + "\n")
+            stream.flush()
+        for event in events:
+            event.set()
+        return stop
+
+
+_writers: Dict[str, _BatchWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def _make_formatter() -> logging.Formatter:
+    if LOG_FORMAT == "json":
+        return JsonFormatter()
+    return logging.Formatter(TEXT_FORMAT)
+
+
+def _get_writer(
+    log_file: str, formatter: logging.Formatter | None = None
+) -> _BatchWriter:
+    with _writers_lock:
+        writer = _writers.get(log_file)
+        if writer is None or not writer.is_alive():
+            # Перезапущенный поток продолжает читать ту же очередь,
+            # к которой уже подключены обработчики логгеров.
+            if writer is not None:
+                formatter = writer.formatter
+            writer = _BatchWriter(
+                log_file,
+                formatter or _make_formatter(),
+                writer.queue if writer is not None else None
+            )
+            writer.start()
+            _writers[log_file] = writer
+        return writer
+
+
+def flush_logs(timeout: float = 5.0) -> None:
+    """
+    Дожидается записи всех поставленных в очередь записей лога.
+    """
+    events = []
+    for log_file in list(_writers):
+        writer = _get_writer(log_file)
+        event = threading.Event()
+        writer.queue.put(event)
+        events.append(event)
+    for event in events:
+        event.wait(timeout)
+
+
+def shutdown_logging(timeout: float = 5.0) -> None:
+    """
+    Записывает оставшиеся записи и останавливает фоновые потоки записи.
+
+    Записи, поступившие после остановки, остаются в очереди и будут
+    записаны, если поток понадобится снова (см. `flush_logs`).
+    """
+    with _writers_lock:
+        writers = [w for w in _writers.values() if w.is_alive()]
+    for writer in writers:
+        writer.queue.put(_STOP)
+    for writer in writers:
+        writer.join(timeout)
+
+
+def _restart_writers_after_fork() -> None:
+    """
+    Перезапускает потоки записи в процессе, порожденном fork.
+
+    Потоки родителя в дочернем процессе не существуют, а блокировки
+    очередей могли быть захвачены в момент fork. Очереди
+    переинициализируются на месте (обработчики логгеров ссылаются на
+    те же объекты), унаследованные записи отбрасываются — их пишет
+    родитель, — и для каждого файла запускается новый поток.
+    """
+    global _writers_lock
+    _writers_lock = threading.Lock()
+    for log_file, writer in list(_writers.items()):
+        writer.queue.__init__(writer.queue.maxsize)  # type: ignore[misc]
+        restarted = _BatchWriter(log_file, writer.formatter, writer.queue)
+        restarted.start()
+        _writers[log_file] = restarted
+
+
+atexit.register(shutdown_logging)
+os.register_at_fork(after_in_child=_restart_writers_after_fork)
 
 
 def get_logger(
-    name: str = "app", log_file: str = "app.log", level: int = logging.INFO
+    name: str = "app",
+    log_file: str = "app.log",
+    level: int = logging.INFO,
+    formatter: logging.Formatter | None = None,
 ) -> logging.Logger:
     """
     Создает и возвращает настроенный логгер.
 
+    Записи передаются через очередь в фоновый поток, который форматирует
+    их и пишет в файл пачками, поэтому вызов логгера не блокирует
+    event loop на дисковом вводе-выводе. Формат (текст или JSON) задается
+    LOG_FORMAT, семплирование INFO-записей — LOG_SAMPLING.
+
     Аргументы:
         name (str): Имя логгера. По умолчанию 'app'.
         log_file (str): Путь к файлу для записи логов. По умолчанию 'app.log'.
         level (int): Уровень логирования (например, logging.INFO).
         По умолчанию INFO.
+        formatter (logging.Formatter | None): Форматтер файла вместо
+        заданного LOG_FORMAT; учитывается при первом обращении к файлу.
 
     Возвращает:
         logging.Logger: Настроенный экземпляр логгера.
@@ -21,16 +271,16 @@ def get_logger(
 
     # Проверка на наличие обработчиков, чтобы избежать дублирования
     if not logger.handlers:
-        # Обработчик для записи логов в файл
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(level)
-
-        # Формат логов
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        # Обработчик, передающий записи в фоновый поток записи в файл
+        queue_handler = _LazyQueueHandler(
+            _get_writer(log_file, formatter).queue
         )
-        file_handler.setFormatter(formatter)
+        queue_handler.setLevel(level)
+
+        rates = parse_sampling(LOG_SAMPLING)
+        if rates:
+            queue_handler.addFilter(SamplingFilter(rates))
 
-        logger.addHandler(file_handler)
+        logger.addHandler(queue_handler)
 
     return logger
@@ -0,0 +1,159 @@
+import base64
+import binascii
+import json
+
+from fastapi import HTTPException, Query, Response, status
+
+from app.core.config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+from typing import Any, Sequence, Tuple
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode(payload: dict) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode(cursor: str, *keys: str) -> dict:
+    """
+    Декодирует курсор и проверяет, что поля `keys` — целые числа.
+
+    Исключения:
+        HTTPException: Ошибка 400, если курсор поврежден.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        for key in keys:
+            if not isinstance(payload[key], int):
+                raise ValueError(payload[key])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return payload
+
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Кодирует позицию последней выданной записи в непрозрачный курсор.
+
+    Аргументы:
+        last_id (int): ID последней записи на странице.
+
+    Возвращает:
+        str: Курсор в формате base64url.
+    """
+    return _encode({"id": last_id})
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Декодирует курсор, полученный от клиента.
+
+    Аргументы:
+        cursor (str): Курсор из параметра запроса.
+
+    Возвращает:
+        int: ID записи, после которой начинается следующая страница.
+
+    Исключения:
+        HTTPException: Ошибка 400, если курсор поврежден.
+    """
+    return _decode(cursor, "id")["id"]
+
+
+def encode_sync_cursor(seq: int, last_id: int | None = None) -> str:
+    """
+    Кодирует позицию синхронизации заметок.
+
+    Аргументы:
+        seq (int): Номер изменения (`change_seq`).
+        last_id (int | None): ID последней выданной заметки с этим
+        номером, если страница закончилась посреди изменения; None —
+        изменение `seq` выдано полностью.
+
+    Возвращает:
+        str: Курсор в формате base64url.
+    """
+    payload = {"seq": seq}
+    if last_id is not None:
+        payload["id"] = last_id
+    return _encode(payload)
+
+
+def decode_sync_cursor(cursor: str) -> Tuple[int, int | None]:
+    """
+    Декодирует курсор синхронизации.
+
+    Возвращает:
+        Tuple[int, int | None]: Номер изменения и ID последней выданной
+        заметки с этим номером (None, если изменение выдано полностью).
+
+    Исключения:
+        HTTPException: Ошибка 400, если курсор поврежден.
+    """
+    payload = _decode(cursor, "seq")
+    last_id = payload.get("id")
+    if last_id is not None and not isinstance(last_id, int):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return payload["seq"], last_id
+
+
+class PageParams:
+    """
+    Зависимость с параметрами keyset-пагинации.
+
+    Страница определяется размером (`limit`) и курсором (`cursor`),
+    указывающим на последнюю запись предыдущей страницы. В отличие от
+    OFFSET, поиск по курсору использует индекс, поэтому время получения
+    страницы не зависит от ее номера.
+    """
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: str | None = Query(None),
+    ):
+        self.limit = limit
+        self.after_id = decode_cursor(cursor) if cursor else None
+
+
+def set_next_cursor(
+    response: Response, items: Sequence[Any], limit: int
+) -> None:
+    """
+    Добавляет в ответ заголовок с курсором следующей страницы.
+
+    Курсор выдается только для полной страницы: если записей меньше,
+    чем `limit`, значит, список исчерпан.
+
+    Аргументы:
+        response (Response): Ответ, в который добавляется заголовок.
+        items (Sequence): Записи текущей страницы.
+        limit (int): Запрошенный размер страницы.
+    """
+    if items and len(items) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(items[-1].id)
+
+
+class SyncParams:
+    """
+    Зависимость с параметрами инкрементальной синхронизации заметок.
+
+    Без `since` выдаются все заметки пользователя; с курсором `since`,
+    полученным в предыдущем ответе, — только изменения после него.
+    """
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        since: str | None = Query(None),
+    ):
+        self.limit = limit
+        self.since = decode_sync_cursor(since) if since else None
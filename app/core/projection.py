@@ -0,0 +1,64 @@
+from fastapi import HTTPException, Query, status
+
+from app.core.config import MAX_PREVIEW_LENGTH
+from app.schemas.note import NOTE_LIST_FIELDS, NoteRow
+
+from typing import Tuple
+
+
+def parse_fields(value: str | None) -> Tuple[str, ...]:
+    """
+    Разбирает список полей из параметра `?fields=`.
+
+    Поле `id` включается всегда: по нему строится курсор следующей
+    страницы. Порядок полей — как в NOTE_LIST_FIELDS.
+
+    Аргументы:
+        value (str | None): Имена полей через запятую.
+
+    Возвращает:
+        Tuple[str, ...]: Выбранные поля; поля NoteRow, если параметр
+        не задан.
+
+    Исключения:
+        HTTPException: Ошибка 400 для неизвестного поля.
+    """
+    if not value:
+        return NoteRow._fields
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = requested.difference(NOTE_LIST_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    requested.add("id")
+    return tuple(name for name in NOTE_LIST_FIELDS if name in requested)
+
+
+class NoteListView:
+    """
+    Зависимость с представлением списка заметок.
+
+    `?fields=` ограничивает набор возвращаемых полей, `?preview=N`
+    обрезает тело заметки до N символов. Оба параметра выполняются
+    в SQL: невыбранные колонки не читаются, а тело обрезается функцией
+    substr на стороне БД.
+    """
+    def __init__(
+        self,
+        fields: str | None = Query(
+            None, description="Поля через запятую, например id,title"
+        ),
+        preview: int | None = Query(
+            None, ge=1, le=MAX_PREVIEW_LENGTH,
+            description="Длина превью тела заметки в символах"
+        ),
+    ):
+        self.fields = parse_fields(fields)
+        self.preview = preview if "body" in self.fields else None
+
+    @property
+    def key(self) -> str:
+        """Строка, однозначно описывающая представление (для кеша)."""
+        return f"{','.join(self.fields)}:{self.preview or ''}"
@@ -0,0 +1,115 @@
+import asyncio
+import math
+import time
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import (
+    ACCESS_TOKEN_EXPIRE_MINUTES, AUTH_REVOCATION_REFRESH, LOG_FILE
+)
+from app.core.logger import get_logger
+from app.db.models import User
+
+from typing import Dict
+
+
+logger = get_logger("app.auth", log_file=LOG_FILE)
+
+
+def utcnow() -> datetime:
+    """Текущее время UTC без часового пояса (как хранится в БД)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def ms_timestamp(value: datetime) -> float:
+    """
+    Время в секундах с точностью до миллисекунды (округление вниз).
+
+    Так же округляются `iat` токена и время изменения: токен, выданный
+    после изменения, не может оказаться раньше него из-за округления.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return math.floor(value.timestamp() * 1000) / 1000
+
+
+class RevocationList:
+    """
+    Список пользователей, чьи токены выданы до смены роли или отзыва.
+
+    Авторизация по токену не обращается к БД; вместо этого список
+    `User.auth_changed_at` за время жизни токена загружается не чаще
+    раза в `refresh_interval` секунд. Токен пользователя из списка,
+    выданный (`iat`) раньше изменения, отклоняется, поэтому понижение
+    роли и отзыв вступают в силу в пределах интервала обновления.
+    Изменения в текущем процессе учитываются сразу (mark()).
+    """
+    def __init__(self, refresh_interval: float = AUTH_REVOCATION_REFRESH):
+        self.refresh_interval = refresh_interval
+        self._changed: Dict[int, float] = {}
+        self._refreshed_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    def stale(self) -> bool:
+        return self._refreshed_at is None or (
+            time.monotonic() - self._refreshed_at >= self.refresh_interval
+        )
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """
+        Загружает изменения, после которых еще могут действовать токены.
+
+        Аргументы:
+            db (AsyncSession): Сессия основной БД.
+        """
+        cutoff = utcnow() - timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        rows = await db.execute(
+            select(User.id, User.auth_changed_at)
+            .where(User.auth_changed_at > cutoff)
+        )
+        self._changed = {
+            user_id: ms_timestamp(changed_at) for user_id, changed_at in rows
+        }
+        self._refreshed_at = time.monotonic()
+        logger.debug("Revocation list refreshed: %s users", len(self._changed))
+
+    async def ensure_fresh(self, db: AsyncSession) -> None:
+        """
+        Обновляет список, если истек интервал обновления.
+
+        Обновление выполняет один запрос. Пока список не загружен ни
+        разу, остальные запросы ждут загрузки: пустой список пропустил
+        бы отозванные токены. После первой загрузки одновременные
+        запросы используют предыдущий список, не дожидаясь обновления.
+        """
+        if not self.stale():
+            return
+        if self._refreshed_at is not None and self._lock.locked():
+            return
+        async with self._lock:
+            if self.stale():
+                await self.refresh(db)
+
+    def mark(self, user_id: int, changed_at: datetime) -> None:
+        """Учитывает изменение, выполненное в текущем процессе."""
+        self._changed[user_id] = ms_timestamp(changed_at)
+
+    def is_revoked(self, user_id: int, issued_at: float) -> bool:
+        """
+        Проверяет, выдан ли токен пользователя до изменения.
+
+        Аргументы:
+            user_id (int): ID пользователя из токена.
+            issued_at (float): Время выдачи токена (iat).
+
+        Возвращает:
+            bool: True, если токен недействителен.
+        """
+        changed = self._changed.get(user_id)
+        return changed is not None and issued_at < changed
+
+
+revocations = RevocationList()
@@ -1,38 +1,63 @@
 import jwt
 from jwt.exceptions import InvalidTokenError
 
-from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from datetime import datetime, timedelta, timezone
 from app.core.config import ACCESS_TOKEN_EXPIRE_MINUTES, ALGORITHM, SECRET_KEY
+from app.core.hashing import check_password, hash_password, password_hasher
+from app.core.metrics import counter
+from app.core.revocation import ms_timestamp, revocations
+from app.db.routing import current_user_id
 from app.db.session import get_db
 from app.db.models import User
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/token")
 
+AUTH_CHECKS = counter(
+    "auth_token_checks_total",
+    "Проверки токенов доступа по способу: поля токена, БД, отозван",
+    ("source",)
+)
+
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return hash_password(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return check_password(plain_password, hashed_password)
+
+
+# Асинхронные версии выполняют bcrypt в пуле и не блокируют event loop
+async def get_password_hash_async(password: str) -> str:
+    return await password_hasher.hash(password)
+
+
+async def verify_password_async(
+    plain_password: str, hashed_password: str
+) -> bool:
+    return await password_hasher.verify(plain_password, hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
+    """
+    Создает подписанный JWT.
+
+    Помимо переданных полей (`sub`, а также `uid` и `role` для
+    авторизации без обращения к БД) токен содержит время выдачи `iat`
+    с долями секунды: по нему отклоняются токены, выданные до смены
+    роли или отзыва.
+    """
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + (
-            expires_delta or timedelta(
-                minutes=ACCESS_TOKEN_EXPIRE_MINUTES
-            )
-        )
-    to_encode.update({"exp": expire})
+    now = datetime.now(timezone.utc)
+    expire = now + (
+        expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    to_encode.update({"exp": expire, "iat": ms_timestamp(now)})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
@@ -45,8 +70,22 @@ def decode_access_token(token: str):
 
 
 async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
 ):
+    """
+    Текущий пользователь по токену доступа.
+
+    Для токенов с `uid` и `role` пользователь собирается из проверенных
+    полей токена без запроса к БД (объект User не связан с сессией);
+    токен отклоняется, если выдан до смены роли или отзыва (см.
+    RevocationList). Для токенов старого формата (только `sub`)
+    пользователь загружается из БД.
+
+    Исключения:
+        HTTPException: Ошибка 401, если токен недействителен или отозван.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -60,10 +99,25 @@ async def get_current_user(
     except InvalidTokenError:
         raise credentials_exception
 
-    result = await db.execute(select(User).where(User.username == username))
-    user = result.scalars().first()
-    if user is None:
-        raise credentials_exception
+    user_id, role = payload.get("uid"), payload.get("role")
+    if user_id is not None and role is not None:
+        await revocations.ensure_fresh(db)
+        if revocations.is_revoked(user_id, payload.get("iat", 0)):
+            AUTH_CHECKS.inc(source="revoked")
+            raise credentials_exception
+        AUTH_CHECKS.inc(source="claims")
+        user = User(id=user_id, username=username, role=role)
+    else:
+        AUTH_CHECKS.inc(source="database")
+        result = await db.execute(
+            select(User).where(User.username == username)
+        )
+        user = result.scalars().first()
+        if user is None:
+            raise credentials_exception
+    # id пользователя для middleware (запись трафика) и выбора БД чтения
+    request.state.user_id = user.id
+    current_user_id.set(user.id)
     return user
 
 
@@ -0,0 +1,61 @@
+import json
+from datetime import date, datetime
+
+from fastapi.responses import JSONResponse
+
+from typing import Any, Iterable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson не установлен
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Сериализует данные в JSON (байты).
+
+    Использует orjson, если он установлен, иначе стандартный json
+    с тем же компактным выводом. Даты записываются в формате ISO 8601.
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, ensure_ascii=False, separators=(",", ":"), default=_default
+    ).encode()
+
+
+def loads(data: bytes | str) -> Any:
+    """Разбирает JSON, используя orjson при наличии."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse с сериализацией через `dumps`."""
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def rows_response(rows: Iterable[Any]) -> FastJSONResponse:
+    """
+    Ответ со списком строк без повторной валидации Pydantic.
+
+    Строки — результат выборки отдельных колонок (Row) или NamedTuple
+    с теми же полями, что и схема ответа: они сериализуются напрямую,
+    минуя создание ORM-объектов и моделей ответа.
+
+    Аргументы:
+        rows (Iterable): Строки с методом `_asdict()`.
+
+    Возвращает:
+        FastJSONResponse: Ответ со списком объектов JSON.
+    """
+    return FastJSONResponse([row._asdict() for row in rows])
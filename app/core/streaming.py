@@ -0,0 +1,94 @@
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from app.core.config import STREAM_CHUNK_SIZE
+from app.core.serialization import dumps
+
+from typing import Any, AsyncIterator
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+JSON_MEDIA_TYPE = "application/json"
+
+
+def wants_stream(request: Request, stream: bool) -> bool:
+    """
+    Определяет, запросил ли клиент потоковую выдачу списка.
+
+    Аргументы:
+        request (Request): Входящий HTTP-запрос.
+        stream (bool): Значение параметра `?stream=`.
+
+    Возвращает:
+        bool: True, если нужен потоковый ответ.
+    """
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def _encode(row: Any) -> bytes:
+    # Строки выборки колонок (Row, NamedTuple) уже имеют поля схемы
+    # ответа и сериализуются без валидации
+    return dumps(row._asdict())
+
+
+def _is_ndjson(request: Request) -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def _encode_ndjson(
+    rows: AsyncIterator[Any]
+) -> AsyncIterator[bytes]:
+    chunk: list[bytes] = []
+    async for row in rows:
+        chunk.append(_encode(row))
+        chunk.append(b"\n")
+        if len(chunk) >= 2 * STREAM_CHUNK_SIZE:
+            yield b"".join(chunk)
+            chunk.clear()
+    if chunk:
+        yield b"".join(chunk)
+
+
+async def _encode_json_array(
+    rows: AsyncIterator[Any]
+) -> AsyncIterator[bytes]:
+    chunk: list[bytes] = [b"["]
+    first = True
+    async for row in rows:
+        if not first:
+            chunk.append(b",")
+        first = False
+        chunk.append(_encode(row))
+        if len(chunk) >= 2 * STREAM_CHUNK_SIZE:
+            yield b"".join(chunk)
+            chunk.clear()
+    chunk.append(b"]")
+    yield b"".join(chunk)
+
+
+def stream_response(
+    request: Request, rows: AsyncIterator[Any]
+) -> StreamingResponse:
+    """
+    Формирует потоковый ответ из асинхронного итератора строк.
+
+    Строки сериализуются по мере получения из базы данных и отправляются
+    пачками по `STREAM_CHUNK_SIZE` записей, поэтому объем памяти на запрос
+    не зависит от размера выборки. Формат выбирается по заголовку `Accept`:
+    NDJSON (`application/x-ndjson`) или обычный JSON-массив.
+
+    Аргументы:
+        request (Request): Входящий HTTP-запрос.
+        rows (AsyncIterator): Строки выборки колонок (Row) с полями
+        схемы ответа.
+
+    Возвращает:
+        StreamingResponse: Потоковый HTTP-ответ.
+    """
+    if _is_ndjson(request):
+        return StreamingResponse(
+            _encode_ndjson(rows), media_type=NDJSON_MEDIA_TYPE
+        )
+    return StreamingResponse(
+        _encode_json_array(rows), media_type=JSON_MEDIA_TYPE
+    )
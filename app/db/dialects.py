@@ -0,0 +1,41 @@
+from sqlalchemy import LargeBinary, cast, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from typing import Any
+
+
+def dialect_insert(db: AsyncSession, entity: Any):
+    """
+    Возвращает INSERT для диалекта текущей БД.
+
+    Диалектные конструкции поддерживают `ON CONFLICT`, которого нет
+    в общем `sqlalchemy.insert`. Модуль диалекта импортируется при первом
+    вызове, чтобы не загружать неиспользуемые диалекты при старте.
+
+    Аргументы:
+        db (AsyncSession): Сессия, по движку которой определяется диалект.
+        entity: Модель или таблица для вставки.
+
+    Исключения:
+        NotImplementedError: Если диалект не поддерживается.
+    """
+    name = db.bind.dialect.name
+    if name == "postgresql":
+        from sqlalchemy.dialects import postgresql
+        return postgresql.insert(entity)
+    if name == "sqlite":
+        from sqlalchemy.dialects import sqlite
+        return sqlite.insert(entity)
+    raise NotImplementedError(f"ON CONFLICT is not supported for {name}")
+
+
+def octet_length(db: AsyncSession, column: Any):
+    """
+    Длина текста в байтах UTF-8 для диалекта текущей БД.
+
+    В SQLite length() текста считает символы, поэтому текст приводится
+    к BLOB.
+    """
+    if db.bind.dialect.name == "sqlite":
+        return func.length(cast(column, LargeBinary))
+    return func.octet_length(column)
@@ -0,0 +1,145 @@
+from sqlalchemy import DDL, Connection, Table, inspect, text
+from sqlalchemy.schema import CreateColumn, CreateIndex
+
+from app.core.config import LOG_FILE
+from app.core.logger import get_logger
+from app.db.models import Base
+
+from typing import List
+
+
+logger = get_logger("app.db.migrations", log_file=LOG_FILE)
+
+# Ключ advisory-блокировки PostgreSQL: миграцию выполняет один воркер,
+# остальные ждут ее завершения
+_MIGRATION_LOCK_ID = 7263514
+
+# Внешняя FTS5-таблица полнотекстового поиска (SQLite)
+_FTS_TABLE = "note_fts"
+
+
+def _run_after_create(conn: Connection, table: Table) -> None:
+    """Выполняет DDL-обработчики after_create для существующей таблицы."""
+    for listener in table.dispatch.after_create:
+        if isinstance(listener, DDL):
+            listener(table, conn)
+
+
+def migrate_schema(conn: Connection) -> List[str]:
+    """
+    Приводит схему БД к моделям.
+
+    create_all создает только отсутствующие таблицы, поэтому в
+    существующие таблицы добавляются новые колонки
+    (`ALTER TABLE ... ADD COLUMN`) и индексы, а их DDL-обработчики
+    after_create (поисковые колонки, индексы и триггеры) выполняются
+    повторно. Шаги идемпотентны: выполняется только то, чего нет в БД.
+    Колонки NOT NULL без значения по умолчанию не добавляются — их нужно
+    перенести вручную. Параметры таблицы (например, AUTOINCREMENT в
+    SQLite) не меняются.
+
+    Аргументы:
+        conn (Connection): Соединение в открытой транзакции.
+
+    Возвращает:
+        List[str]: Описание выполненных шагов.
+    """
+    if conn.dialect.name == "postgresql":
+        conn.execute(
+            text("SELECT pg_advisory_xact_lock(:key)"),
+            {"key": _MIGRATION_LOCK_ID}
+        )
+    existing = set(inspect(conn).get_table_names())
+    Base.metadata.create_all(conn)
+
+    applied = [
+        f"create table {table.name}"
+        for table in Base.metadata.sorted_tables
+        if table.name not in existing
+    ]
+    inspector = inspect(conn)
+    preparer = conn.dialect.identifier_preparer
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing:
+            continue
+        columns = {
+            column["name"] for column in inspector.get_columns(table.name)
+        }
+        for column in table.columns:
+            if column.name in columns or (
+                not column.nullable and column.server_default is None
+            ):
+                continue
+            conn.exec_driver_sql(
+                f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN "
+                f"{CreateColumn(column).compile(dialect=conn.dialect)}"
+            )
+            applied.append(f"add column {table.name}.{column.name}")
+
+        indexes = {index["name"] for index in inspector.get_indexes(
+            table.name
+        )}
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            if index.name in indexes:
+                continue
+            conn.execute(CreateIndex(index))
+            applied.append(f"create index {index.name}")
+        _run_after_create(conn, table)
+
+    if conn.dialect.name == "sqlite" and "note" in existing and (
+        _FTS_TABLE not in existing
+    ):
+        # Новый индекс FTS5 (content='note') пуст: заполняется
+        # сохраненными заметками
+        conn.execute(text(
+            f"INSERT INTO {_FTS_TABLE}({_FTS_TABLE}) VALUES ('rebuild')"
+        ))
+        applied.append(f"rebuild {_FTS_TABLE}")
+
+    for step in applied:
+        logger.info("Schema migration: %s", step)
+    return applied
+
+
+def schema_problems(conn: Connection) -> List[str]:
+    """
+    Расхождения схемы БД с моделями, которые не устранила миграция.
+
+    Проверяются наличие таблиц, колонок, индексов и объектов
+    полнотекстового поиска; типы колонок не сравниваются.
+
+    Аргументы:
+        conn (Connection): Соединение с БД.
+
+    Возвращает:
+        List[str]: Описание расхождений; пустой список, если их нет.
+    """
+    inspector = inspect(conn)
+    tables = set(inspector.get_table_names())
+    problems = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in tables:
+            problems.append(f"missing table {table.name}")
+            continue
+        columns = {
+            column["name"] for column in inspector.get_columns(table.name)
+        }
+        problems.extend(
+            f"missing column {table.name}.{column.name}"
+            for column in table.columns if column.name not in columns
+        )
+        indexes = {index["name"] for index in inspector.get_indexes(
+            table.name
+        )}
+        problems.extend(
+            f"missing index {index.name}"
+            for index in table.indexes if index.name not in indexes
+        )
+        if table.name == "note" and conn.dialect.name == "postgresql" and (
+            "search_vector" not in columns
+        ):
+            problems.append("missing column note.search_vector")
+
+    if conn.dialect.name == "sqlite" and _FTS_TABLE not in tables:
+        problems.append(f"missing table {_FTS_TABLE}")
+    return problems
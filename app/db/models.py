@@ -1,11 +1,15 @@
-from sqlalchemy import String, ForeignKey, Text
+from sqlalchemy import (
+    String, ForeignKey, Text, Index, DDL, UniqueConstraint, event
+)
 from sqlalchemy.orm import (
     DeclarativeBase, Mapped, mapped_column, declared_attr
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
-from datetime import datetime
+from app.core.config import SEARCH_CONFIG
+
+from datetime import date, datetime
 from typing import List
 
 
@@ -35,14 +39,198 @@ class User(TimestampMixin, Base):
     )
     password: Mapped[str] = mapped_column(String, nullable=False)
     role: Mapped[str] = mapped_column(String(20), default="user")
+    # Версия списка заметок: растет при любом изменении заметок пользователя
+    notes_version: Mapped[int] = mapped_column(default=0, server_default="0")
+    # Время смены роли или отзыва токенов: токены, выданные раньше,
+    # недействительны (UTC)
+    auth_changed_at: Mapped[datetime | None] = mapped_column(default=None)
 
     notes: Mapped[List["Note"]] = relationship(back_populates="user")
 
 
 class Note(TimestampMixin, Base):
+    # ID не переиспользуются в SQLite после удаления последней заметки:
+    # ID заметок в архиве, ревизиях и курсорах синхронизации уникальны
+    __table_args__ = {"sqlite_autoincrement": True}
+
     title: Mapped[str] = mapped_column(String(256), nullable=False)
     body: Mapped[str] = mapped_column(Text, nullable=False)
     is_deleted: Mapped[bool] = mapped_column(default=False)
+    # Версия заметки: растет при каждом изменении, используется в ETag
+    version: Mapped[int] = mapped_column(default=1, server_default="1")
+    # Номер изменения: версия списка заметок владельца (notes_version),
+    # в которой заметка последний раз создавалась, менялась, удалялась
+    # или восстанавливалась (инкрементальная синхронизация)
+    change_seq: Mapped[int] = mapped_column(default=0, server_default="0")
 
     user_id: Mapped[int] = mapped_column(ForeignKey("user.id"))
     user: Mapped["User"] = relationship("User", back_populates="notes")
+
+
+# Частичные индексы. Живые заметки: keyset-пагинация списка пользователя
+# без записей удаленных заметок в индексе. Удаленные: выбор заметок для
+# архивации по времени удаления (updated_at удаленной заметки не меняется).
+# Условие записано так же, как в запросах (`is_deleted IS false`), иначе
+# SQLite не использует частичный индекс.
+Index(
+    "ix_note_live_user_id_id",
+    Note.user_id,
+    Note.id,
+    postgresql_where=Note.is_deleted.is_(False),
+    sqlite_where=Note.is_deleted.is_(False),
+)
+Index(
+    "ix_note_deleted_updated_at",
+    Note.updated_at,
+    Note.id,
+    postgresql_where=Note.is_deleted.is_(True),
+    sqlite_where=Note.is_deleted.is_(True),
+)
+# Изменения заметок пользователя после курсора синхронизации
+Index(
+    "ix_note_user_id_change_seq", Note.user_id, Note.change_seq, Note.id
+)
+
+
+class NoteArchive(Base):
+    """Удаленные заметки, перенесенные из `note` по истечении срока."""
+    __tablename__ = "note_archive"
+
+    # ID исходной заметки: сохраняется при архивации и восстановлении
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    title: Mapped[str] = mapped_column(String(256), nullable=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey("user.id"))
+    version: Mapped[int] = mapped_column(nullable=False)
+    # Номер изменения, в котором заметка была удалена
+    change_seq: Mapped[int] = mapped_column(default=0, server_default="0")
+    created_at: Mapped[datetime] = mapped_column(nullable=False)
+    # Время удаления заметки
+    deleted_at: Mapped[datetime] = mapped_column(nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(
+        default=func.now(), server_default=func.now()
+    )
+
+
+# Удаленные заметки для синхронизации клиентов с давним курсором
+Index(
+    "ix_note_archive_user_id_change_seq",
+    NoteArchive.user_id,
+    NoteArchive.change_seq,
+    NoteArchive.id,
+)
+
+
+class NoteRevision(Base):
+    """
+    Ревизия заметки: состояние после изменения заголовка или текста.
+
+    Текст хранится полностью (`is_snapshot`) или дельтой относительно
+    предыдущей ревизии; `depth` — число дельт после последней полной
+    копии. Внешнего ключа на `note` нет: ревизии архивированной заметки
+    сохраняются до ее восстановления и удаляются при очистке (purge).
+    """
+    __tablename__ = "note_revision"
+    __table_args__ = (
+        UniqueConstraint("note_id", "version"),
+    )
+
+    note_id: Mapped[int] = mapped_column(nullable=False)
+    # Версия заметки, которой соответствует ревизия
+    version: Mapped[int] = mapped_column(nullable=False)
+    title: Mapped[str] = mapped_column(String(256), nullable=False)
+    is_snapshot: Mapped[bool] = mapped_column(nullable=False)
+    depth: Mapped[int] = mapped_column(nullable=False)
+    data: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        default=func.now(), server_default=func.now()
+    )
+
+
+class NoteStats(Base):
+    """
+    Сводка по заметкам пользователя для административной статистики.
+
+    Обновляется в транзакциях записи заметок (NoteStatsService) и
+    пересчитывается фоновой сверкой.
+    """
+    __tablename__ = "note_stats"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("user.id"), unique=True)
+    live_notes: Mapped[int] = mapped_column(default=0, server_default="0")
+    # Удаленные заметки, в том числе перенесенные в архив
+    deleted_notes: Mapped[int] = mapped_column(default=0, server_default="0")
+    # Объем текстов неудаленных заметок в байтах UTF-8
+    body_bytes: Mapped[int] = mapped_column(default=0, server_default="0")
+
+
+class NoteDailyStats(Base):
+    """Созданные и измененные заметки пользователя по дням (UTC)."""
+    __tablename__ = "note_daily_stats"
+    __table_args__ = (
+        UniqueConstraint("user_id", "day"),
+    )
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("user.id"))
+    day: Mapped[date] = mapped_column(nullable=False)
+    created: Mapped[int] = mapped_column(default=0, server_default="0")
+    # Изменения заголовка или текста
+    updated: Mapped[int] = mapped_column(default=0, server_default="0")
+
+
+# Статистика за период по всем пользователям
+Index("ix_note_daily_stats_day", NoteDailyStats.day)
+
+
+class SchemaState(Base):
+    # Отпечаток схемы, для которой последний раз выполнялась миграция
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+
+
+# Полнотекстовый поиск по заметкам.
+# PostgreSQL: вычисляемая колонка tsvector с GIN-индексом.
+# SQLite: внешняя FTS5-таблица, синхронизируемая триггерами.
+# Выражения идемпотентны: для существующей таблицы `note` их повторно
+# выполняет миграция (migrate_schema).
+_search_ddl = [
+    DDL(
+        "ALTER TABLE note ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS (to_tsvector("
+        f"'{SEARCH_CONFIG}'::regconfig, "
+        "coalesce(title, '') || ' ' || coalesce(body, ''))) STORED"
+    ).execute_if(dialect="postgresql"),
+    DDL(
+        "CREATE INDEX IF NOT EXISTS ix_note_search_vector "
+        "ON note USING GIN (search_vector)"
+    ).execute_if(dialect="postgresql"),
+    DDL(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS note_fts USING fts5("
+        "title, body, content='note', content_rowid='id')"
+    ).execute_if(dialect="sqlite"),
+    DDL(
+        "CREATE TRIGGER IF NOT EXISTS note_fts_ai AFTER INSERT ON note BEGIN "
+        "INSERT INTO note_fts(rowid, title, body) "
+        "VALUES (new.id, new.title, new.body); END"
+    ).execute_if(dialect="sqlite"),
+    DDL(
+        "CREATE TRIGGER IF NOT EXISTS note_fts_ad AFTER DELETE ON note BEGIN "
+        "INSERT INTO note_fts(note_fts, rowid, title, body) "
+        "VALUES ('delete', old.id, old.title, old.body); END"
+    ).execute_if(dialect="sqlite"),
+    DDL(
+        "CREATE TRIGGER IF NOT EXISTS note_fts_au "
+        "AFTER UPDATE OF title, body ON note BEGIN "
+        "INSERT INTO note_fts(note_fts, rowid, title, body) "
+        "VALUES ('delete', old.id, old.title, old.body); "
+        "INSERT INTO note_fts(rowid, title, body) "
+        "VALUES (new.id, new.title, new.body); END"
+    ).execute_if(dialect="sqlite"),
+]
+for _ddl in _search_ddl:
+    event.listen(Note.__table__, "after_create", _ddl)
+
+event.listen(
+    Note.__table__,
+    "after_drop",
+    DDL("DROP TABLE IF EXISTS note_fts").execute_if(dialect="sqlite")
+)
@@ -0,0 +1,127 @@
+import time
+import weakref
+from contextvars import ContextVar, Token
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import counter, gauge, histogram
+
+from typing import Any, Dict, List
+
+
+POOL_CHECKED_OUT = gauge(
+    "db_pool_checked_out",
+    "Соединения, выданные из пула",
+    ("pool",)
+)
+POOL_OVERFLOW = gauge(
+    "db_pool_overflow",
+    "Соединения сверх pool_size (отрицательное значение — еще не созданы)",
+    ("pool",)
+)
+POOL_WAIT = histogram(
+    "db_pool_wait_seconds",
+    "Время получения соединения из пула",
+    ("pool",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+)
+POOL_TIMEOUTS = counter(
+    "db_pool_timeouts_total",
+    "Запросы соединения, завершившиеся таймаутом пула",
+    ("pool",)
+)
+
+# Суммарное ожидание соединений и число получений в рамках HTTP-запроса
+_request_wait: ContextVar[List[float] | None] = ContextVar(
+    "request_pool_wait", default=None
+)
+
+_pools: "weakref.WeakValueDictionary[str, InstrumentedPool]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def begin_request_tracking() -> Token:
+    """
+    Начинает учет ожидания соединений для текущего HTTP-запроса.
+    """
+    return _request_wait.set([0.0, 0])
+
+
+def end_request_tracking(token: Token) -> tuple[float, int]:
+    """
+    Завершает учет и возвращает суммарное время ожидания соединений
+    и количество полученных соединений.
+    """
+    wait, acquisitions = _request_wait.get() or (0.0, 0)
+    _request_wait.reset(token)
+    return wait, int(acquisitions)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Пул соединений с учетом времени ожидания, таймаутов и загрузки.
+
+    Время получения соединения записывается в гистограмму пула и
+    добавляется к счетчику текущего HTTP-запроса.
+    """
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        _pools[self.name] = self
+
+    @property
+    def name(self) -> str:
+        return self.logging_name or "primary"
+
+    def _update_gauges(self) -> None:
+        POOL_CHECKED_OUT.set(self.checkedout(), pool=self.name)
+        POOL_OVERFLOW.set(self.overflow(), pool=self.name)
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            POOL_TIMEOUTS.inc(pool=self.name)
+            raise
+        finally:
+            wait = time.perf_counter() - start
+            POOL_WAIT.observe(wait, pool=self.name)
+            request_wait = _request_wait.get()
+            if request_wait is not None:
+                request_wait[0] += wait
+                request_wait[1] += 1
+            self._update_gauges()
+
+    def _do_return_conn(self, record: Any) -> None:
+        super()._do_return_conn(record)
+        self._update_gauges()
+
+    def recreate(self) -> "InstrumentedPool":
+        pool = super().recreate()
+        _pools[pool.name] = pool  # type: ignore[index]
+        return pool  # type: ignore[return-value]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Текущее состояние пула и накопленная статистика ожидания.
+        """
+        return {
+            "pool": self.name,
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": self.overflow(),
+            "timeout": self.timeout(),
+            "acquisitions": POOL_WAIT.count(pool=self.name),
+            "wait_seconds_total": POOL_WAIT.sum(pool=self.name),
+            "timeouts": POOL_TIMEOUTS.value(pool=self.name),
+        }
+
+
+def pool_stats() -> List[Dict[str, Any]]:
+    """
+    Состояние всех инструментированных пулов приложения.
+    """
+    return [pool.stats() for pool in list(_pools.values())]
@@ -0,0 +1,235 @@
+import time
+from collections import Counter
+from contextvars import ContextVar, Token
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import (
+    SQL_PROFILING, SQL_REPEAT_THRESHOLD, SQL_SLOW_QUERY_LOG,
+    SQL_SLOW_QUERY_MS
+)
+from app.core.logger import get_logger
+from app.core.metrics import counter, histogram
+
+from typing import Any, List, Tuple
+
+
+slow_query_logger = get_logger(
+    "app.db.slow_query", log_file=SQL_SLOW_QUERY_LOG
+)
+
+STATEMENTS_PER_REQUEST = histogram(
+    "db_statements_per_request",
+    "Число SQL-запросов за HTTP-запрос",
+    ("route",),
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100, 500)
+)
+REPEATED_STATEMENTS = counter(
+    "db_repeated_statements_total",
+    "HTTP-запросы с повторяющимся SQL-запросом (признак N+1)",
+    ("route",)
+)
+SLOW_QUERIES = counter(
+    "db_slow_queries_total", "SQL-запросы дольше SQL_SLOW_QUERY_MS"
+)
+
+# Длинные списки параметров (например, IN с сотнями значений)
+# сворачиваются до типа и количества
+_SHAPE_LIMIT = 10
+
+
+class QueryProfile:
+    """
+    Статистика SQL-запросов одного HTTP-запроса: число, суммарное и
+    максимальное время и количество выполнений каждого текста запроса.
+    """
+    def __init__(self):
+        self.statements = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.counts: Counter[str] = Counter()
+
+    def add(self, statement: str, elapsed: float) -> None:
+        self.statements += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+        self.counts[statement] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """
+        Запросы, выполненные не меньше `threshold` раз.
+
+        Возвращает:
+            List[Tuple[str, int]]: Текст запроса и число выполнений,
+            по убыванию числа выполнений.
+        """
+        return [
+            (statement, count)
+            for statement, count in self.counts.most_common()
+            if count >= threshold
+        ]
+
+    def server_timing(self) -> str:
+        """
+        Значение заголовка Server-Timing: время в БД (мс) с числом
+        запросов и самый долгий запрос.
+        """
+        return (
+            f'db;dur={self.total * 1000:.2f};desc="{self.statements} '
+            f'queries", db-max;dur={self.max * 1000:.2f}'
+        )
+
+
+class SqlProfiler:
+    """
+    Профилирование SQL по HTTP-запросам на событиях движка SQLAlchemy.
+
+    Обработчики событий подключены ко всем движкам (включая реплики):
+    время выполнения каждого запроса добавляется к профилю текущего
+    HTTP-запроса (ContextVar), а запросы дольше `slow_query_ms` пишутся
+    в журнал медленных запросов. Значения параметров в журнал не
+    попадают, только их типы: в них могут быть пароли и тексты заметок.
+    """
+    def __init__(
+        self,
+        repeat_threshold: int = SQL_REPEAT_THRESHOLD,
+        slow_query_ms: float = SQL_SLOW_QUERY_MS
+    ):
+        self.repeat_threshold = max(repeat_threshold, 2)
+        self.slow_query = slow_query_ms / 1000
+
+    @staticmethod
+    def begin() -> Token:
+        """Начинает профиль текущего HTTP-запроса."""
+        return _request_profile.set(QueryProfile())
+
+    @staticmethod
+    def end(token: Token) -> QueryProfile:
+        """Завершает профиль и возвращает собранную статистику."""
+        profile = _request_profile.get()
+        _request_profile.reset(token)
+        return profile
+
+    @staticmethod
+    def current() -> QueryProfile | None:
+        return _request_profile.get()
+
+    def finish(self, profile: QueryProfile, route: str) -> None:
+        """
+        Записывает метрики профиля и предупреждение о повторяющихся
+        запросах.
+        """
+        if not profile.statements:
+            return
+        STATEMENTS_PER_REQUEST.observe(profile.statements, route=route)
+        repeated = profile.repeated(self.repeat_threshold)
+        if repeated:
+            REPEATED_STATEMENTS.inc(route=route)
+            statement, count = repeated[0]
+            slow_query_logger.warning(
+                "Repeated statement (possible N+1): route=%s, count=%s, "
+                "statement=%s", route, count, _one_line(statement)
+            )
+
+    def observe(
+        self,
+        statement: str,
+        parameters: Any,
+        executemany: bool,
+        elapsed: float
+    ) -> None:
+        profile = _request_profile.get()
+        if profile is not None:
+            profile.add(statement, elapsed)
+        if 0 < self.slow_query <= elapsed:
+            SLOW_QUERIES.inc()
+            slow_query_logger.warning(
+                "Slow query: duration_ms=%.1f, statement=%s, params=%s",
+                elapsed * 1000, _one_line(statement),
+                param_shape(parameters, executemany)
+            )
+
+
+def _one_line(statement: str) -> str:
+    return " ".join(statement.split())
+
+
+def _type_name(value: Any) -> str:
+    return "NULL" if value is None else type(value).__name__
+
+
+def _values_shape(values: Any) -> str:
+    if isinstance(values, dict):
+        return "{" + ", ".join(
+            f"{key}: {_type_name(value)}" for key, value in values.items()
+        ) + "}"
+    if isinstance(values, (list, tuple)):
+        types = [_type_name(value) for value in values]
+        if len(types) > _SHAPE_LIMIT and len(set(types)) == 1:
+            return f"({types[0]} x {len(types)})"
+        if len(types) > _SHAPE_LIMIT:
+            return f"({', '.join(types[:_SHAPE_LIMIT])}, ... {len(types)})"
+        return f"({', '.join(types)})"
+    return _type_name(values)
+
+
+def param_shape(parameters: Any, executemany: bool = False) -> str:
+    """
+    Описание параметров запроса без значений.
+
+    Аргументы:
+        parameters (Any): Параметры DBAPI (кортеж, словарь или список
+        наборов при executemany).
+        executemany (bool): Запрос выполняется для нескольких наборов.
+
+    Возвращает:
+        str: Типы параметров, например `(int, str)` или
+        `[(str, int)] x 100` для executemany.
+    """
+    if executemany and isinstance(parameters, (list, tuple)):
+        if not parameters:
+            return "[]"
+        return f"[{_values_shape(parameters[0])}] x {len(parameters)}"
+    return _values_shape(parameters)
+
+
+# Профиль SQL текущего HTTP-запроса
+_request_profile: ContextVar[QueryProfile | None] = ContextVar(
+    "request_sql_profile", default=None
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    if sql_profiler is not None:
+        conn.info.setdefault("query_started", []).append(
+            time.perf_counter()
+        )
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    started = conn.info.get("query_started")
+    if sql_profiler is None or not started:
+        return
+    sql_profiler.observe(
+        statement, parameters, executemany,
+        time.perf_counter() - started.pop()
+    )
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    started = context.connection.info.get("query_started") if (
+        context.connection is not None
+    ) else None
+    if started:
+        started.pop()
+
+
+sql_profiler = SqlProfiler() if SQL_PROFILING else None
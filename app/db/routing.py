@@ -0,0 +1,248 @@
+import hashlib
+import hmac
+import itertools
+import math
+import time
+from collections import OrderedDict
+from contextvars import ContextVar, Token
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import ORMExecuteState, Session
+from starlette.requests import cookie_parser
+
+from app.core.config import (
+    DB_READ_STICKY_SECONDS, DB_REPLICA_STRATEGY, SECRET_KEY
+)
+from app.core.metrics import counter
+
+from typing import Sequence, Tuple
+
+
+READS_ROUTED = counter(
+    "db_reads_routed_total",
+    "Сессии чтения по выбранной БД",
+    ("target",)
+)
+
+STRATEGIES = ("round_robin", "least_loaded")
+
+# Cookie с подписанным сроком чтения из основной БД после записи
+STICKY_COOKIE = "read_primary"
+
+# Пользователь текущего запроса (устанавливается при аутентификации)
+current_user_id: ContextVar[int | None] = ContextVar(
+    "db_route_user_id", default=None
+)
+
+
+class RequestRoute:
+    """
+    Состояние маршрутизации чтений HTTP-запроса.
+
+    `sticky` — пользователь и срок (UTC, секунды) привязки к основной БД
+    из cookie запроса; `wrote` — пользователь, чья запись в этом запросе
+    зафиксирована (ответ получает новую cookie).
+    """
+    def __init__(self, sticky: Tuple[int, float] | None = None):
+        self.sticky = sticky
+        self.wrote: int | None = None
+
+
+# Состояние маршрутизации текущего HTTP-запроса (RequestMiddleware)
+_request_route: ContextVar[RequestRoute | None] = ContextVar(
+    "db_request_route", default=None
+)
+
+
+def _sticky_signature(user_id: int, until: int) -> str:
+    return hmac.new(
+        SECRET_KEY.encode(), f"{user_id}:{until}".encode(), hashlib.sha256
+    ).hexdigest()[:32]
+
+
+def sign_sticky(user_id: int, until: int) -> str:
+    """Значение cookie привязки пользователя к основной БД до `until`."""
+    return f"{user_id}:{until}:{_sticky_signature(user_id, until)}"
+
+
+def parse_sticky(value: str) -> Tuple[int, float] | None:
+    """
+    Проверяет подпись cookie привязки.
+
+    Возвращает:
+        Tuple[int, float] | None: Пользователь и срок привязки или None,
+        если значение повреждено или подделано.
+    """
+    try:
+        user_id, until, signature = value.split(":")
+        parsed = int(user_id), int(until)
+    except ValueError:
+        return None
+    if not hmac.compare_digest(signature, _sticky_signature(*parsed)):
+        return None
+    return parsed
+
+
+def begin_request(cookie_header: str | None) -> Token:
+    """Начинает маршрутизацию HTTP-запроса с cookie из заголовка Cookie."""
+    value = cookie_parser(cookie_header).get(STICKY_COOKIE) if (
+        cookie_header
+    ) else None
+    return _request_route.set(
+        RequestRoute(parse_sticky(value) if value else None)
+    )
+
+
+def end_request(token: Token) -> RequestRoute:
+    """Завершает маршрутизацию HTTP-запроса и возвращает ее состояние."""
+    route = _request_route.get()
+    _request_route.reset(token)
+    return route
+
+
+def sticky_cookie(sticky_seconds: float) -> bytes | None:
+    """
+    Заголовок Set-Cookie для ответа на запрос, выполнивший запись.
+
+    Возвращает:
+        bytes | None: Значение заголовка или None, если записи не было.
+    """
+    route = _request_route.get()
+    if route is None or route.wrote is None or sticky_seconds <= 0:
+        return None
+    max_age = math.ceil(sticky_seconds)
+    value = sign_sticky(route.wrote, int(time.time()) + max_age)
+    return (
+        f"{STICKY_COOKIE}={value}; Max-Age={max_age}; Path=/; HttpOnly; "
+        "SameSite=Lax"
+    ).encode("latin-1")
+
+
+def _cookie_sticky(user_id: int) -> bool:
+    route = _request_route.get()
+    if route is None or route.sticky is None:
+        return False
+    sticky_user, until = route.sticky
+    return sticky_user == user_id and time.time() < until
+
+
+def engine_name(engine: AsyncEngine) -> str:
+    """Имя пула движка для метрик: "primary" или "replicaN"."""
+    return engine.sync_engine.pool.logging_name or "primary"
+
+
+def _checked_out(engine: AsyncEngine) -> int:
+    checkedout = getattr(engine.sync_engine.pool, "checkedout", None)
+    return checkedout() if checkedout is not None else 0
+
+
+class ReplicaRouter:
+    """
+    Выбор БД для сессий чтения.
+
+    Чтения распределяются по репликам по кругу или на наименее
+    загруженную реплику. Пользователь, недавно выполнивший запись,
+    в течение `sticky_seconds` читает из основной БД, чтобы видеть
+    собственные изменения независимо от отставания реплик.
+
+    Время записи хранится в памяти процесса и в подписанной cookie
+    ответа (STICKY_COOKIE): с cookie привязка действует и в других
+    воркерах и экземплярах приложения. Клиент без cookie привязан к
+    основной БД только в воркере, выполнившем запись.
+    """
+    def __init__(
+        self,
+        strategy: str = DB_REPLICA_STRATEGY,
+        sticky_seconds: float = DB_READ_STICKY_SECONDS,
+        max_users: int = 100000
+    ):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown replica strategy: {strategy}")
+        self.strategy = strategy
+        self.sticky_seconds = sticky_seconds
+        self.max_users = max_users
+        self._recent_writes: OrderedDict[int, float] = OrderedDict()
+        self._next = itertools.count()
+
+    def mark_write(self, user_id: int, now: float | None = None) -> None:
+        """Запоминает время записи пользователя."""
+        self._recent_writes[user_id] = (
+            time.monotonic() if now is None else now
+        )
+        self._recent_writes.move_to_end(user_id)
+        if len(self._recent_writes) > self.max_users:
+            self._recent_writes.popitem(last=False)
+
+    def is_sticky(self, user_id: int, now: float | None = None) -> bool:
+        """Проверяет, должен ли пользователь читать из основной БД."""
+        written = self._recent_writes.get(user_id)
+        if written is None:
+            return False
+        now = time.monotonic() if now is None else now
+        if now - written < self.sticky_seconds:
+            return True
+        del self._recent_writes[user_id]
+        return False
+
+    def choose(
+        self,
+        primary: AsyncEngine,
+        replicas: Sequence[AsyncEngine],
+        user_id: int | None = None
+    ) -> AsyncEngine:
+        """
+        Выбирает движок для сессии чтения.
+
+        Аргументы:
+            primary (AsyncEngine): Движок основной БД.
+            replicas (Sequence[AsyncEngine]): Движки реплик.
+            user_id (int | None): Пользователь запроса.
+
+        Возвращает:
+            AsyncEngine: Основная БД, если реплик нет или пользователь
+            недавно выполнял запись, иначе одна из реплик.
+        """
+        if not replicas or user_id is not None and (
+            self.is_sticky(user_id) or _cookie_sticky(user_id)
+        ):
+            engine = primary
+        elif self.strategy == "least_loaded":
+            engine = min(replicas, key=_checked_out)
+        else:
+            engine = replicas[next(self._next) % len(replicas)]
+        READS_ROUTED.inc(target=engine_name(engine))
+        return engine
+
+
+replica_router = ReplicaRouter()
+
+
+# Запись отмечается по факту фиксации транзакции, в которой выполнялись
+# INSERT/UPDATE/DELETE (через flush или execute), до отправки ответа
+@event.listens_for(Session, "after_flush")
+def _flushed(session: Session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _executed(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _committed(session: Session) -> None:
+    if not session.info.pop("wrote", False):
+        return
+    user_id = current_user_id.get()
+    if user_id is not None:
+        replica_router.mark_write(user_id)
+        route = _request_route.get()
+        if route is not None:
+            route.wrote = user_id
+
+
+@event.listens_for(Session, "after_rollback")
+def _rolled_back(session: Session) -> None:
+    session.info.pop("wrote", None)
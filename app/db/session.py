@@ -1,50 +1,277 @@
+import asyncio
+import hashlib
+import os
+from contextlib import AsyncExitStack
+
+from sqlalchemy import DDL, delete, insert, inspect, text
 from sqlalchemy.ext.asyncio import (
-    async_sessionmaker, create_async_engine, AsyncSession
+    async_sessionmaker, create_async_engine, AsyncConnection, AsyncEngine,
+    AsyncSession
 )
+from sqlalchemy.engine import URL, Dialect, make_url
 from sqlalchemy.future import select
-from app.core.config import DB_URL
-from app.db.models import Base, User
+from sqlalchemy.schema import CreateIndex, CreateTable
+from app.core.config import (
+    DB_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING, DB_POOL_WARM, DB_REPLICA_URLS, DB_STATEMENT_CACHE_SIZE,
+    LOG_FILE
+)
+from app.core.logger import get_logger
+from app.db.dialects import dialect_insert
+from app.db.migrations import migrate_schema, schema_problems
+from app.db.models import Base, SchemaState, User
+from app.db.pool import InstrumentedPool
+from app.db import routing
+from app.core.hashing import password_hasher
 
-from passlib.context import CryptContext
+from typing import Any, AsyncGenerator, Dict, List, Tuple
 
-from typing import AsyncGenerator
 
+logger = get_logger("app.db", log_file=LOG_FILE)
 
-engine = create_async_engine(DB_URL, echo=False)
 
-AsyncSessionLocal = async_sessionmaker(
-    bind=engine,
-    expire_on_commit=False
-)
+def engine_options(url: str) -> Tuple[URL, Dict[str, Any]]:
+    """
+    Формирует URL и параметры движка с настройками пула из конфигурации.
+
+    Для SQLite в памяти пул не настраивается: SQLAlchemy использует
+    StaticPool с единственным соединением. Для asyncpg размер кеша
+    подготовленных выражений передается через параметр URL.
+
+    Аргументы:
+        url (str): URL подключения к базе данных.
+
+    Возвращает:
+        Tuple[URL, Dict[str, Any]]: URL и аргументы create_async_engine.
+    """
+    db_url = make_url(url)
+    options: Dict[str, Any] = {"echo": False}
+    if db_url.get_backend_name() == "sqlite" and db_url.database in (
+        None, "", ":memory:"
+    ):
+        return db_url, options
+
+    options.update(
+        poolclass=InstrumentedPool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+    if db_url.get_driver_name() == "asyncpg":
+        db_url = db_url.update_query_dict({
+            "prepared_statement_cache_size": str(DB_STATEMENT_CACHE_SIZE)
+        })
+    return db_url, options
+
+
+_engine: AsyncEngine | None = None
+_sessionmaker: async_sessionmaker[AsyncSession] | None = None
+_engine_pid: int | None = None
+_replicas: List[AsyncEngine] = []
+
+
+def get_engine() -> AsyncEngine:
+    """
+    Возвращает движок БД текущего процесса, создавая его при первом вызове.
+
+    Движок не создается при импорте: при запуске с предварительным
+    fork (gunicorn --preload, несколько воркеров uvicorn) каждый воркер
+    получает собственный пул. Если процесс был порожден fork после
+    создания движка, унаследованный пул отбрасывается без закрытия
+    соединений, которые принадлежат родителю.
+    """
+    global _engine, _sessionmaker, _engine_pid, _replicas
+    pid = os.getpid()
+    if _engine is not None and _engine_pid != pid:
+        for engine in (_engine, *_replicas):
+            engine.sync_engine.dispose(close=False)
+        _engine = None
+    if _engine is None:
+        url, options = engine_options(DB_URL)
+        _engine = create_async_engine(url, **options)
+        _sessionmaker = async_sessionmaker(
+            bind=_engine, expire_on_commit=False
+        )
+        _replicas = []
+        for index, replica_url in enumerate(_replica_urls()):
+            url, options = engine_options(replica_url)
+            _replicas.append(create_async_engine(
+                url, pool_logging_name=f"replica{index}", **options
+            ))
+        _engine_pid = pid
+    return _engine
+
+
+def _replica_urls() -> List[str]:
+    return [url.strip() for url in DB_REPLICA_URLS.split(",") if url.strip()]
+
+
+def get_replicas() -> List[AsyncEngine]:
+    """Движки реплик для чтения текущего процесса (DB_REPLICA_URLS)."""
+    get_engine()
+    return _replicas
+
+
+def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Фабрика сессий для движка текущего процесса."""
+    get_engine()
+    return _sessionmaker  # type: ignore[return-value]
+
+
+async def dispose_engine() -> None:
+    """Закрывает соединения пула и сбрасывает движок процесса."""
+    global _engine, _sessionmaker, _engine_pid, _replicas
+    if _engine is not None and _engine_pid == os.getpid():
+        for engine in (_engine, *_replicas):
+            await engine.dispose()
+    _engine = _sessionmaker = _engine_pid = None
+    _replicas = []
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSessionLocal() as session:
+    """Сессия основной БД для записи (и чтений, требующих свежих данных)."""
+    async with get_sessionmaker()() as session:
         yield session
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Сессия для чтения: реплика или основная БД.
+
+    Пользователь запроса берется из контекста, который заполняет
+    get_current_user, поэтому зависимость должна разрешаться после
+    аутентификации (см. get_read_note_service). Пользователь, недавно
+    выполнявший запись, читает из основной БД.
+    """
+    engine = routing.replica_router.choose(
+        get_engine(), get_replicas(), routing.current_user_id.get()
+    )
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+
+def schema_fingerprint(dialect: Dialect) -> str:
+    """
+    Отпечаток схемы: хеш DDL всех таблиц, индексов и DDL-обработчиков
+    моделей для указанного диалекта.
+    """
+    statements = []
+    for table in Base.metadata.sorted_tables:
+        statements.append(str(CreateTable(table).compile(dialect=dialect)))
+        statements.extend(
+            str(CreateIndex(index).compile(dialect=dialect))
+            for index in sorted(table.indexes, key=lambda i: i.name or "")
+        )
+        statements.extend(
+            listener.statement
+            for listener in table.dispatch.after_create
+            if isinstance(listener, DDL)
+        )
+    return hashlib.sha256("\n".join(statements).encode()).hexdigest()
+
+
+async def _stored_fingerprint(conn: AsyncConnection) -> str | None:
+    has_table = await conn.run_sync(
+        lambda sync_conn: inspect(sync_conn).has_table(
+            SchemaState.__tablename__
+        )
+    )
+    if not has_table:
+        return None
+    return await conn.scalar(select(SchemaState.fingerprint).limit(1))
 
 
 # Инициализация базы данных: создание таблиц, если их нет
-async def init_db():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+async def init_db(engine: AsyncEngine | None = None) -> bool:
+    """
+    Создает или обновляет схему БД и администратора.
+
+    Миграция (migrate_schema) выполняется, только если сохраненный
+    отпечаток схемы отличается от отпечатка моделей (или еще не
+    сохранен). Новый отпечаток сохраняется только после проверки, что
+    схема БД совпадает с моделями; иначе старт прерывается, а миграция
+    повторяется при следующем запуске. Пароль администратора
+    хешируется, только если администратора еще нет; вставка с
+    ON CONFLICT DO NOTHING безопасна при одновременном старте воркеров.
+
+    Аргументы:
+        engine (AsyncEngine | None): Движок БД; по умолчанию движок процесса.
+
+    Возвращает:
+        bool: True, если выполнялась миграция (отпечаток не совпал).
+
+    Исключения:
+        RuntimeError: Если после миграции схема БД не совпадает с моделями.
+    """
+    engine = engine or get_engine()
+    fingerprint = schema_fingerprint(engine.dialect)
+    async with engine.connect() as conn:
+        stored = await _stored_fingerprint(conn)
+
+    created = stored != fingerprint
+    if created:
+        async with engine.begin() as conn:
+            await conn.run_sync(migrate_schema)
+            problems = await conn.run_sync(schema_problems)
+            if problems:
+                logger.error(
+                    "Database schema is out of date: %s", "; ".join(problems)
+                )
+                raise RuntimeError(
+                    "Database schema does not match models: "
+                    + "; ".join(problems)
+                )
+            await conn.execute(delete(SchemaState))
+            await conn.execute(
+                insert(SchemaState).values(fingerprint=fingerprint)
+            )
+        logger.info("Database schema migrated, fingerprint %s", fingerprint)
 
     # Проверка наличия администратора
-    async with AsyncSessionLocal() as session:
-        result = await session.execute(
-            select(User).where(User.username == "admin")
+    async with AsyncSession(engine) as session:
+        admin_id = await session.scalar(
+            select(User.id).where(User.username == "admin")
         )
-        admin = result.scalars().first()
-
-        if not admin:
-            hashed_password = pwd_context.hash("adminpass")
-            new_admin = User(
-                username="admin", password=hashed_password, role="admin"
+        if admin_id is None:
+            hashed_password = await password_hasher.hash("adminpass")
+            await session.execute(
+                dialect_insert(session, User).values(
+                    username="admin", password=hashed_password, role="admin"
+                ).on_conflict_do_nothing(index_elements=[User.username])
             )
-            session.add(new_admin)
             await session.commit()
-            print("Администратор успешно создан.")
-        else:
-            print("Администратор уже существует.")
+            logger.info("Admin user created")
+    return created
+
+
+async def warm_pool(
+    engine: AsyncEngine | None = None, connections: int = DB_POOL_WARM
+) -> int:
+    """
+    Открывает соединения пула заранее, до приема запросов.
+
+    Соединения открываются одновременно, проверяются запросом SELECT 1
+    и возвращаются в пул, поэтому первые запросы не ждут установки
+    соединений.
+
+    Аргументы:
+        engine (AsyncEngine | None): Движок БД; по умолчанию движок процесса.
+        connections (int): Количество соединений.
+
+    Возвращает:
+        int: Количество открытых соединений.
+    """
+    engine = engine or get_engine()
+    if connections <= 0:
+        return 0
+    async with AsyncExitStack() as stack:
+        conns = await asyncio.gather(*(
+            stack.enter_async_context(engine.connect())
+            for _ in range(connections)
+        ))
+        await asyncio.gather(*(
+            conn.execute(text("SELECT 1")) for conn in conns
+        ))
+    return len(conns)
@@ -1,29 +1,112 @@
+import asyncio
+import contextlib
+import time
+
 from fastapi import FastAPI
-from app.api.v1.endpoints import users, notes, auth
-from app.middleware.log_middleware import LoggingMiddleware
-from app.db.session import init_db, engine
+from app import IMPORT_STARTED
+from app.api.v1.endpoints import (
+    users, notes, auth, metrics, health, events, stats
+)
+from app.middleware.admission_middleware import AdmissionMiddleware
+from app.middleware.request_middleware import RequestMiddleware
+from app.db.session import (
+    dispose_engine, get_engine, get_sessionmaker, init_db, warm_pool
+)
+from app.core import events as note_events
+from app.core.config import (
+    ARCHIVE_MODE, LOG_FILE, STATS_RECONCILE_INTERVAL
+)
+from app.core.hashing import password_hasher
+from app.core.logger import get_logger, shutdown_logging
+from app.core.serialization import FastJSONResponse
+from app.services.archive import archive_forever
+from app.services.note_cache import note_cache
+from app.services.stats import reconcile_forever
 
 from contextlib import asynccontextmanager
 
+# Время импорта приложения (FastAPI, SQLAlchemy, модули приложения)
+IMPORT_TIME = time.perf_counter() - IMPORT_STARTED
+
+logger = get_logger("app.main", log_file=LOG_FILE)
+
 
 # Контекстный менеджер для управления жизненным циклом приложения
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await init_db()
+    # Выполняется в каждом воркере: движок и пул создаются после fork
+    started = time.perf_counter()
+    engine = get_engine()
+    schema_created = await init_db(engine)
+    init_time = time.perf_counter() - started
+    warm_started = time.perf_counter()
+    warmed = await warm_pool(engine)
+    app.state.startup = {
+        "import_seconds": round(IMPORT_TIME, 4),
+        "init_db_seconds": round(init_time, 4),
+        "schema": "created" if schema_created else "unchanged",
+        "warm_connections": warmed,
+        "warm_seconds": round(time.perf_counter() - warm_started, 4),
+        "startup_seconds": round(time.perf_counter() - started, 4),
+    }
+    logger.info("Startup report: %s", app.state.startup)
+    tasks = []
+    if ARCHIVE_MODE != "off":
+        tasks.append(asyncio.create_task(archive_forever(get_sessionmaker())))
+    if STATS_RECONCILE_INTERVAL > 0:
+        tasks.append(
+            asyncio.create_task(reconcile_forever(get_sessionmaker()))
+        )
     yield
-    await engine.dispose()
+    for task in tasks:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    await dispose_engine()
+    password_hasher.shutdown()
+    if note_cache is not None:
+        await note_cache.backend.close()
+    if note_events.event_hub is not None:
+        await note_events.event_hub.close()
+    shutdown_logging()
+
+
+def create_app() -> FastAPI:
+    """
+    Создает приложение FastAPI.
+
+    Создание не открывает соединений с БД: движок создается лениво
+    в каждом процессе при старте (lifespan), поэтому фабрику можно
+    использовать с предварительным fork, например
+    `uvicorn --factory app.main:create_app --workers 4`.
 
+    Возвращает:
+        FastAPI: Настроенное приложение.
+    """
+    app = FastAPI(
+        title="Notes API",
+        lifespan=lifespan,
+        default_response_class=FastJSONResponse
+    )
 
-app = FastAPI(title="Notes API", lifespan=lifespan)
+    # RequestMiddleware внешний: отклоненные запросы тоже попадают в
+    # логи и метрики
+    app.add_middleware(AdmissionMiddleware)
+    app.add_middleware(RequestMiddleware)
 
-app.add_middleware(LoggingMiddleware)
+    app.include_router(users.router, prefix="/admin", tags=["Admin"])
+    app.include_router(notes.router, prefix="/api/v1", tags=["Note"])
+    app.include_router(events.router, prefix="/api/v1", tags=["Note"])
+    app.include_router(stats.router, prefix="/api/v1", tags=["Admin"])
+    app.include_router(auth.router, tags=["Auth"])
+    app.include_router(metrics.router, tags=["Monitoring"])
+    app.include_router(health.router, tags=["Monitoring"])
 
+    @app.get("/")
+    async def main():
+        return {"msg": "Welcome to Notes API"}
 
-app.include_router(users.router, prefix="/admin", tags=["Admin"])
-app.include_router(notes.router, prefix="/api/v1", tags=["Note"])
-app.include_router(auth.router, tags=["Auth"])
+    return app
 
 
-@app.get("/")
-async def main():
-    return {"msg": "Welcome to Notes API"}
+app = create_app()
@@ -0,0 +1,79 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core import admission
+from app.core.config import LOG_FILE
+from app.core.logger import get_logger
+from app.core.serialization import FastJSONResponse
+
+
+logger = get_logger("app.middleware.admission", log_file=LOG_FILE)
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware контроля допуска запросов.
+
+    Отклоняет запрос до маршрутизации и обращения к БД: при превышении
+    частоты запросов пользователя или IP — с кодом 429, при исчерпании
+    лимита одновременных запросов (и очереди) — с кодом 503. В обоих
+    случаях ответ содержит заголовок Retry-After. Маршруты мониторинга
+    (ADMISSION_EXEMPT_PATHS) не ограничиваются, для потоков событий
+    (ADMISSION_STREAM_PATHS) ограничивается только частота подключений.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        controller = admission.admission_controller
+        if (
+            scope["type"] != "http"
+            or controller is None
+            or controller.exempt(scope["path"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        limited = controller.check_rate(scope)
+        if limited is not None:
+            reason, retry_after = limited
+            logger.debug(
+                "Rate limited: path=%s, reason=%s", scope["path"], reason
+            )
+            await self._reject(
+                scope, receive, send, 429, "Too many requests", retry_after
+            )
+            return
+
+        if controller.is_stream(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        if not await controller.acquire(
+            controller.is_priority(scope["path"])
+        ):
+            logger.debug("Overloaded: path=%s", scope["path"])
+            await self._reject(
+                scope, receive, send, 503, "Service overloaded",
+                controller.retry_after
+            )
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release()
+
+    @staticmethod
+    async def _reject(
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        status_code: int,
+        detail: str,
+        retry_after: int
+    ) -> None:
+        response = FastJSONResponse(
+            {"detail": detail},
+            status_code=status_code,
+            headers={"Retry-After": str(retry_after)}
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,171 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import capture as traffic_capture
+from app.core.config import LOG_FILE
+from app.core.logger import get_logger
+from app.core.metrics import counter, gauge, histogram
+from app.db import profiler as sql_profiling
+from app.db import routing
+from app.db.pool import begin_request_tracking, end_request_tracking
+
+
+logger = get_logger("app.middleware", log_file=LOG_FILE)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUESTS_TOTAL = counter(
+    "http_requests_total",
+    "Количество обработанных HTTP-запросов",
+    ("method", "route", "status_class")
+)
+REQUEST_DURATION = histogram(
+    "http_request_duration_seconds",
+    "Время обработки HTTP-запроса",
+    ("method", "route")
+)
+REQUESTS_IN_FLIGHT = gauge(
+    "http_requests_in_flight",
+    "HTTP-запросы, обрабатываемые в данный момент"
+)
+REQUEST_POOL_WAIT = histogram(
+    "http_request_db_pool_wait_seconds",
+    "Суммарное время ожидания соединений с БД за HTTP-запрос",
+    ("route",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+)
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Возвращает шаблон пути маршрута (например, `/api/v1/notes/{note_id}`).
+
+    Роутер FastAPI записывает найденный маршрут в `scope["route"]`;
+    использование шаблона вместо фактического пути ограничивает
+    количество меток метрик.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+def _header(scope: Scope, name: bytes) -> str | None:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class RequestMiddleware:
+    """
+    ASGI middleware для логирования и метрик HTTP-запросов.
+
+    В отличие от BaseHTTPMiddleware не создает отдельную задачу и поток
+    тела ответа на каждый запрос и не буферизует потоковые ответы.
+    Для каждого запроса учитывает количество по маршруту и классу статуса,
+    время обработки, число одновременно выполняемых запросов и
+    суммарное ожидание соединений из пула БД.
+
+    Если включена запись трафика (REQUEST_CAPTURE), сведения о запросе
+    дополнительно записываются в JSONL для воспроизведения. Если
+    включено профилирование SQL (SQL_PROFILING), ответ получает заголовок
+    Server-Timing с числом и временем запросов к БД, выполненных до
+    начала ответа.
+
+    Ответ на запрос, выполнивший запись, получает cookie привязки
+    чтений пользователя к основной БД (см. ReplicaRouter).
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+        capture = traffic_capture.request_capture
+        if capture is not None and not capture.sampled():
+            capture = None
+        request_bytes = response_bytes = 0
+        profiler = sql_profiling.sql_profiler
+
+        async def receive_wrapper() -> Message:
+            nonlocal request_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                request_bytes += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = []
+                if profiler is not None:
+                    timing = profiler.current().server_timing()
+                    headers.append(
+                        (b"server-timing", timing.encode("latin-1"))
+                    )
+                cookie = routing.sticky_cookie(
+                    routing.replica_router.sticky_seconds
+                )
+                if cookie is not None:
+                    headers.append((b"set-cookie", cookie))
+                if headers:
+                    message = {
+                        **message,
+                        "headers": [*message.get("headers", ()), *headers],
+                    }
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        tracking = begin_request_tracking()
+        profiling = profiler.begin() if profiler is not None else None
+        routing_token = routing.begin_request(
+            _header(scope, b"cookie")
+        )
+        try:
+            await self.app(
+                scope,
+                receive_wrapper if capture is not None else receive,
+                send_wrapper
+            )
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            pool_wait, acquisitions = end_request_tracking(tracking)
+            process_time = time.perf_counter() - start_time
+            method = scope["method"]
+            route = route_template(scope)
+            routing.end_request(routing_token)
+            if profiling is not None:
+                profiler.finish(profiler.end(profiling), route)
+            if acquisitions:
+                REQUEST_POOL_WAIT.observe(pool_wait, route=route)
+            REQUESTS_TOTAL.inc(
+                method=method,
+                route=route,
+                status_class=f"{status_code // 100}xx"
+            )
+            REQUEST_DURATION.observe(process_time, method=method, route=route)
+            client = scope.get("client")
+            logger.info(
+                "Request: method=%s, path=%s, client=%s, status_code=%s, "
+                "time_taken=%s, pool_wait=%s",
+                method, scope["path"], client[0] if client else None,
+                status_code, process_time, pool_wait
+            )
+            if capture is not None:
+                capture.record(
+                    method=method,
+                    route=route,
+                    query_string=scope.get("query_string", b""),
+                    status=status_code,
+                    duration=process_time,
+                    request_bytes=request_bytes,
+                    response_bytes=response_bytes,
+                    user_id=scope.get("state", {}).get("user_id"),
+                )
@@ -1,4 +1,10 @@
-from pydantic import BaseModel
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.core.config import BATCH_MAX_ITEMS
+
+from typing import List, Literal, NamedTuple
 
 
 class NoteBase(BaseModel):
@@ -20,5 +26,83 @@ class NoteResponse(NoteBase):
     user_id: int
     is_deleted: bool
 
-    class ConfigDict:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class NoteRow(NamedTuple):
+    """
+    Строка списка заметок: поля NoteResponse, выбранные из БД колонками.
+
+    Используется в списках вместо ORM-объектов и сериализуется
+    без валидации через NoteResponse.
+    """
+    id: int
+    title: str
+    body: str
+    user_id: int
+    is_deleted: bool
+
+
+# Поля, доступные для выбора в списках заметок (?fields=)
+NOTE_LIST_FIELDS = NoteRow._fields + ("created_at", "updated_at")
+
+
+class NoteChanges(BaseModel):
+    notes: List[NoteResponse]
+    deleted: List[int]
+    cursor: str
+    has_more: bool
+
+
+class NoteRevisionInfo(BaseModel):
+    id: int
+    version: int
+    is_snapshot: bool
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class NoteRevisionResponse(NoteBase):
+    note_id: int
+    version: int
+    created_at: datetime
+
+
+class NoteSearchResult(BaseModel):
+    id: int
+    title: str
+    snippet: str
+    rank: float
+
+
+class NoteBatchCreate(BaseModel):
+    items: List[NoteCreate] = Field(
+        ..., min_length=1, max_length=BATCH_MAX_ITEMS
+    )
+
+
+class NoteBatchUpdateItem(NoteUpdate):
+    id: int
+    title: str | None = None
+    body: str | None = None
+
+
+class NoteBatchUpdate(BaseModel):
+    items: List[NoteBatchUpdateItem] = Field(
+        ..., min_length=1, max_length=BATCH_MAX_ITEMS
+    )
+
+
+class NoteBatchIds(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=BATCH_MAX_ITEMS)
+
+
+class BatchItemResult(BaseModel):
+    id: int | None = None
+    status: Literal["created", "updated", "deleted", "restored", "not_found"]
+    note: NoteResponse | None = None
+
+
+class BatchResponse(BaseModel):
+    results: List[BatchItemResult]
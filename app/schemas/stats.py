@@ -0,0 +1,40 @@
+from datetime import date
+
+from pydantic import BaseModel, ConfigDict
+
+from typing import List
+
+
+class NoteTotals(BaseModel):
+    live_notes: int
+    deleted_notes: int
+    body_bytes: int
+
+
+class DailyNoteStats(BaseModel):
+    day: date
+    created: int
+    updated: int
+
+
+class NoteStatsSummary(NoteTotals):
+    # Пользователи, у которых есть заметки
+    users: int
+    daily: List[DailyNoteStats]
+
+
+class UserNoteStats(NoteTotals):
+    user_id: int
+    username: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class UserNoteStatsDetail(UserNoteStats):
+    daily: List[DailyNoteStats]
+
+
+class StatsReconcileResult(BaseModel):
+    users: int
+    # Пользователи, сводка которых расходилась с пересчетом
+    drift: int
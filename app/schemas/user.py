@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from enum import Enum
 
 
@@ -20,9 +20,12 @@ class UserCreate(UserBase):
     role: UserRole = UserRole.user
 
 
+class UserRoleUpdate(BaseModel):
+    role: UserRole
+
+
 class UserResponse(UserBase):
     id: int
     role: str
 
-    class ConfigDict:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
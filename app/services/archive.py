@@ -0,0 +1,192 @@
+import asyncio
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import (
+    ARCHIVE_BATCH_PAUSE, ARCHIVE_BATCH_SIZE, ARCHIVE_INTERVAL, ARCHIVE_MODE,
+    LOG_FILE, NOTE_RETENTION_DAYS
+)
+from app.core.logger import get_logger
+from app.core.metrics import counter
+from app.db.dialects import dialect_insert
+from app.db.models import Note, NoteArchive, NoteRevision
+from app.services.stats import NoteStatsService
+
+from typing import Callable
+
+
+logger = get_logger("app.service.archive", log_file=LOG_FILE)
+
+ARCHIVE_MODES = ("archive", "purge")
+
+NOTES_ARCHIVED = counter(
+    "notes_archived_total",
+    "Удаленные заметки, перенесенные в архив или удаленные безвозвратно",
+    ("mode",)
+)
+
+
+def retention_cutoff(days: float) -> datetime:
+    """Момент удаления, раньше которого заметки архивируются (UTC)."""
+    return (
+        datetime.now(timezone.utc) - timedelta(days=days)
+    ).replace(tzinfo=None)
+
+
+class NoteArchiveService:
+    """
+    Перенос давно удаленных заметок из таблицы `note`.
+
+    Заметки обрабатываются пачками; каждая пачка — отдельная транзакция
+    (DELETE ... RETURNING из `note` и INSERT в `note_archive`), поэтому
+    прерванный процесс не оставляет частично перенесенных заметок и
+    при перезапуске продолжает с оставшихся.
+    """
+    def __init__(self, db: AsyncSession):
+        """
+        Аргументы:
+            db (AsyncSession): Асинхронная сессия для взаимодействия с БД.
+        """
+        self.db = db
+
+    async def archive_batch(
+        self, cutoff: datetime, batch_size: int, mode: str = "archive"
+    ) -> int:
+        """
+        Переносит в архив (или удаляет) одну пачку удаленных заметок.
+
+        Аргументы:
+            cutoff (datetime): Заметки, удаленные раньше этого момента
+            (UTC), обрабатываются.
+            batch_size (int): Максимальный размер пачки.
+            mode (str): "archive" или "purge".
+
+        Возвращает:
+            int: Количество обработанных заметок.
+        """
+        candidates = (
+            select(Note.id)
+            .where(Note.is_deleted.is_(True), Note.updated_at < cutoff)
+            .order_by(Note.updated_at, Note.id)
+            .limit(batch_size)
+        )
+        if self.db.bind.dialect.name == "postgresql":
+            # Параллельные воркеры берут разные пачки
+            candidates = candidates.with_for_update(skip_locked=True)
+
+        try:
+            result = await self.db.execute(
+                delete(Note)
+                .where(Note.id.in_(candidates), Note.is_deleted.is_(True))
+                .returning(
+                    Note.id, Note.title, Note.body, Note.user_id,
+                    Note.version, Note.change_seq, Note.created_at,
+                    Note.updated_at
+                ),
+                execution_options={"synchronize_session": False}
+            )
+            rows = result.all()
+            if rows and mode == "archive":
+                await self.db.execute(
+                    dialect_insert(self.db, NoteArchive)
+                    .on_conflict_do_nothing(index_elements=[NoteArchive.id]),
+                    [
+                        {
+                            "id": row.id,
+                            "title": row.title,
+                            "body": row.body,
+                            "user_id": row.user_id,
+                            "version": row.version,
+                            "change_seq": row.change_seq,
+                            "created_at": row.created_at,
+                            "deleted_at": row.updated_at,
+                        }
+                        for row in rows
+                    ]
+                )
+            elif rows:
+                # Ревизии удаляемой безвозвратно заметки больше не нужны
+                await self.db.execute(
+                    delete(NoteRevision)
+                    .where(NoteRevision.note_id.in_([row.id for row in rows])),
+                    execution_options={"synchronize_session": False}
+                )
+                purged = Counter(row.user_id for row in rows)
+                await NoteStatsService(self.db).record({
+                    user_id: {"deleted_notes": -count}
+                    for user_id, count in purged.items()
+                })
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            logger.error("Error archiving deleted notes: %s", e)
+            raise
+        NOTES_ARCHIVED.inc(len(rows), mode=mode)
+        return len(rows)
+
+    async def run(
+        self,
+        retention_days: float = NOTE_RETENTION_DAYS,
+        mode: str = ARCHIVE_MODE,
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+        pause: float = ARCHIVE_BATCH_PAUSE,
+    ) -> int:
+        """
+        Обрабатывает все заметки, удаленные раньше срока хранения.
+
+        Между пачками выдерживается пауза `pause`, чтобы архивация
+        не вытесняла пользовательские запросы.
+
+        Аргументы:
+            retention_days (float): Срок хранения удаленных заметок, дни.
+            mode (str): "archive" или "purge".
+            batch_size (int): Размер пачки.
+            pause (float): Пауза между пачками, секунды.
+
+        Возвращает:
+            int: Общее количество обработанных заметок.
+
+        Исключения:
+            HTTPException: Ошибка 400 для неизвестного режима.
+        """
+        if mode not in ARCHIVE_MODES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown archive mode: {mode}"
+            )
+        total = 0
+        while True:
+            processed = await self.archive_batch(
+                retention_cutoff(retention_days), batch_size, mode
+            )
+            total += processed
+            if processed < batch_size:
+                break
+            await asyncio.sleep(pause)
+        if total:
+            logger.info("Processed %s deleted notes (mode=%s)", total, mode)
+        return total
+
+
+async def archive_forever(
+    session_factory: Callable[[], AsyncSession] | async_sessionmaker,
+    interval: float = ARCHIVE_INTERVAL,
+) -> None:
+    """
+    Фоновая задача: запускает архивацию каждые `interval` секунд.
+
+    Ошибки записываются в лог и не останавливают задачу.
+    """
+    while True:
+        try:
+            async with session_factory() as session:
+                await NoteArchiveService(session).run()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Archive run failed: %s", e)
+        await asyncio.sleep(interval)
@@ -1,17 +1,115 @@
+from collections import namedtuple
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import (
+    case, cast, delete, func, insert, literal_column, text, tuple_, update
+)
 from sqlalchemy.future import select
+from sqlalchemy.sql import Select
 from fastapi import HTTPException, status
 
-from app.db.models import Note, User
-from app.schemas.note import NoteCreate, NoteUpdate
+from app.db.dialects import octet_length
+from app.db.models import Note, NoteArchive, User
+from app.schemas.note import (
+    BatchItemResult,
+    NoteBatchUpdateItem,
+    NoteCreate,
+    NoteResponse,
+    NoteRow,
+    NoteSearchResult,
+    NoteUpdate,
+)
 from app.core.logger import get_logger
-from app.core.config import LOG_FILE
+from app.core.pagination import encode_sync_cursor
+from app.core.projection import NoteListView
+from app.core.config import LOG_FILE, STREAM_CHUNK_SIZE, SEARCH_CONFIG
+from app.core.events import EventHub
+from app.services.note_cache import NoteCache
+from app.services.revision import NoteContent, NoteRevisionService
+from app.services.stats import (
+    NoteStatsService, created_change, deleted_change, text_bytes,
+    updated_change
+)
 
-from typing import Sequence, Dict
+from typing import (
+    Any, AsyncIterator, Dict, Iterable, List, Sequence, Tuple
+)
 
 
 logger = get_logger("app.service.note", log_file=LOG_FILE)
 
+# UPDATE ... RETURNING возвращает актуальные значения строк; объекты,
+# уже загруженные в сессию, перезаписываются ими.
+_RETURNING_OPTIONS = {
+    "synchronize_session": False, "populate_existing": True
+}
+
+SNIPPET_START = "<mark>"
+SNIPPET_END = "</mark>"
+
+_SQLITE_SEARCH = text(
+    "SELECT note.id, note.title, "
+    "snippet(note_fts, -1, :start, :end, '…', 16) AS snippet, "
+    "-bm25(note_fts) AS rank "
+    "FROM note_fts JOIN note ON note.id = note_fts.rowid "
+    "WHERE note_fts MATCH :query "
+    "AND note.user_id = :user_id AND note.is_deleted = 0 "
+    "ORDER BY rank DESC LIMIT :limit"
+)
+
+
+_CACHED_COLUMNS = ("id", "title", "body", "user_id", "is_deleted", "version")
+
+
+# Колонки строк списков, в порядке полей NoteRow
+_ROW_COLUMNS = tuple(getattr(Note, field) for field in NoteRow._fields)
+
+
+def _list_columns(view: NoteListView | None) -> tuple:
+    """
+    Колонки выборки для представления списка.
+
+    Невыбранные поля не попадают в SELECT, а превью тела вычисляется
+    в БД (substr), поэтому полный текст заметки не передается.
+    """
+    if view is None:
+        return _ROW_COLUMNS
+    columns = []
+    for field in view.fields:
+        if field == "body" and view.preview is not None:
+            columns.append(
+                func.substr(Note.body, 1, view.preview).label("body")
+            )
+        else:
+            columns.append(getattr(Note, field))
+    return tuple(columns)
+
+
+@lru_cache(maxsize=64)
+def _row_type(fields: tuple) -> type:
+    """Тип строки для страницы списка, восстановленной из кеша."""
+    if fields == NoteRow._fields:
+        return NoteRow
+    return namedtuple("NoteRowView", fields)
+
+
+def _note_payload(note: Note) -> Dict[str, Any]:
+    return {column: getattr(note, column) for column in _CACHED_COLUMNS}
+
+
+def _fts5_query(query: str) -> str:
+    """
+    Преобразует пользовательский запрос в безопасное выражение FTS5.
+
+    Каждое слово берется в кавычки, поэтому спецсимволы синтаксиса FTS5
+    трактуются как текст, а слова объединяются через неявный AND.
+    """
+    return " ".join(
+        '"' + term.replace('"', '""') + '"' for term in query.split()
+    )
+
 
 class NoteService:
     """
@@ -20,66 +118,326 @@ class NoteService:
     Этот сервис включает в себя методы для создания, получения, обновления,
     удаления и восстановления заметок, а также административные функции.
     """
-    def __init__(self, db: AsyncSession):
+    def __init__(
+        self,
+        db: AsyncSession,
+        cache: NoteCache | None = None,
+        events: EventHub | None = None
+    ):
         """
         Инициализация сервиса заметок.
 
         Аргументы:
             db (AsyncSession): Асинхронная сессия для взаимодействия с БД.
+            cache (NoteCache | None): Кеш чтения заметок пользователя.
+            Если не задан, все чтения выполняются из БД.
+            events (EventHub | None): Раздача событий об изменениях
+            заметок подписчикам. Если не задана, события не публикуются.
         """
         self.db = db
+        self.cache = cache
+        self.events = events
+        self.revisions = NoteRevisionService(db)
+        self.stats = NoteStatsService(db)
 
-    async def create_note(
-        self, note_data: NoteCreate, user: User
-    ) -> Note:
+    async def _publish(
+        self, action: str, owners: Dict[int, int], versions: Dict[int, int]
+    ) -> None:
         """
-        Создание новой заметки.
+        Публикует событие об изменении заметок после фиксации записи.
+
+        Событие сообщает клиенту, что нужно запросить изменения по курсору
+        синхронизации: `seq` — номер изменения (`change_seq`), после
+        которого изменения уже видны в /notes/changes.
 
         Аргументы:
-            note_data (NoteCreate): Данные для создания заметки.
-            user (User): Текущий авторизованный пользователь.
+            action (str): "created", "updated", "deleted" или "restored".
+            owners (Dict[int, int]): ID измененных заметок и их владельцев.
+            versions (Dict[int, int]): Новые версии списков владельцев.
+        """
+        if self.events is None or not owners:
+            return
+        ids: Dict[int, List[int]] = {}
+        for note_id, user_id in owners.items():
+            ids.setdefault(user_id, []).append(note_id)
+        for user_id, note_ids in ids.items():
+            await self.events.publish(user_id, {
+                "type": action,
+                "ids": note_ids,
+                "seq": versions[user_id],
+            })
 
-        Возвращает:
-            NoteResponse: Созданная заметка в виде Pydantic модели.
+    async def _contents(
+        self, ids: Iterable[int], *condition: Any
+    ) -> Dict[int, NoteContent]:
+        """
+        Заголовки, тексты и версии заметок до изменения (для ревизий).
+
+        Читаются после _bump_notes_version: строка владельца заблокирована,
+        поэтому до UPDATE заметки не изменятся.
+        """
+        result = await self.db.execute(
+            select(Note.id, Note.title, Note.body, Note.version)
+            .where(Note.id.in_(ids), *condition)
+        )
+        return {row.id: (row.title, row.body, row.version) for row in result}
+
+    @staticmethod
+    def _after(query: Select, after_id: int | None) -> Select:
+        """
+        Добавляет к запросу условие keyset-пагинации и сортировку по ID.
         """
-        note = Note(
-            title=note_data.title, body=note_data.body, user_id=user.id
+        if after_id is not None:
+            query = query.where(Note.id > after_id)
+        return query.order_by(Note.id)
+
+    @staticmethod
+    def _user_notes_query(
+        user_id: int,
+        after_id: int | None,
+        view: NoteListView | None = None,
+    ) -> Select:
+        return NoteService._after(
+            select(*_list_columns(view)).where(
+                Note.user_id == user_id, Note.is_deleted.is_(False)
+            ),
+            after_id
+        )
+
+    @staticmethod
+    def _all_notes_query(
+        after_id: int | None, view: NoteListView | None = None
+    ) -> Select:
+        return NoteService._after(select(*_list_columns(view)), after_id)
+
+    @staticmethod
+    def _admin_user_notes_query(
+        user_id: int,
+        after_id: int | None,
+        view: NoteListView | None = None,
+    ) -> Select:
+        return NoteService._after(
+            select(*_list_columns(view)).where(Note.user_id == user_id),
+            after_id
         )
-        self.db.add(note)
+
+    async def _stream(self, query: Select) -> AsyncIterator[NoteRow]:
+        """
+        Потоковое чтение строк заметок серверным курсором.
+
+        Используется отдельная сессия на том же движке: сессия запроса
+        закрывается до отправки ответа, а поток читается уже во время
+        отправки. Строки выбираются пачками по STREAM_CHUNK_SIZE.
+
+        Аргументы:
+            query (Select): Запрос на выборку заметок.
+
+        Возвращает:
+            AsyncIterator[NoteRow]: Строки заметок в порядке выборки.
+        """
+        async with AsyncSession(
+            self.db.bind, expire_on_commit=False
+        ) as session:
+            result = await session.stream(
+                query.execution_options(yield_per=STREAM_CHUNK_SIZE)
+            )
+            async for row in result:
+                yield row
+
+    @asynccontextmanager
+    async def _write(self, error_message: str, *args: Any):
+        """
+        Транзакция операции записи.
+
+        Фиксирует изменения при успешном выходе из блока. При
+        HTTPException (например, 404) откатывает транзакцию и пробрасывает
+        исключение, при любой другой ошибке откатывает транзакцию, пишет
+        `error_message` в лог и возвращает 500.
+        """
         try:
+            yield
             await self.db.commit()
-            await self.db.refresh(note)
-            logger.info(f"Note created with id: {note.id} for user: {user.id}")
+        except HTTPException:
+            await self.db.rollback()
+            raise
         except Exception as e:
             await self.db.rollback()
-            logger.error("Error creating note", exc_info=e)
+            logger.error(error_message, *args, exc_info=e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Internal server error"
             )
-        logger.info(f"User '{user.username}' created note ID {note.id}")
+
+    async def _bump_notes_version(
+        self, user_ids: Iterable[int]
+    ) -> Dict[int, int]:
+        """
+        Увеличивает версию списка заметок пользователей.
+
+        Выполняется в начале транзакции записи: строка пользователя
+        блокируется до фиксации, поэтому параллельные изменения заметок
+        одного пользователя получают версии в порядке фиксации. Новая
+        версия записывается в `change_seq` измененных заметок.
+
+        Возвращает:
+            Dict[int, int]: Новые версии по ID пользователей.
+        """
+        ids = sorted(set(user_ids))
+        if not ids:
+            return {}
+        result = await self.db.execute(
+            update(User)
+            .where(User.id.in_(ids))
+            # updated_at пользователя не меняется при изменении его заметок
+            .values(
+                notes_version=User.notes_version + 1,
+                updated_at=User.updated_at
+            )
+            .returning(User.id, User.notes_version),
+            execution_options={"synchronize_session": False}
+        )
+        return dict(result.tuples().all())
+
+    @staticmethod
+    def _change_seq(versions: Dict[int, int]) -> Any:
+        """Значение `change_seq` для заметок владельцев из `versions`."""
+        if len(versions) == 1:
+            return next(iter(versions.values()))
+        return case(versions, value=Note.user_id)
+
+    async def get_notes_version(self, user_id: int) -> int:
+        """
+        Текущая версия списка заметок пользователя (для ETag списка).
+        """
+        result = await self.db.execute(
+            select(User.notes_version).where(User.id == user_id)
+        )
+        return result.scalar_one_or_none() or 0
+
+    async def get_note_version(self, note_id: int, user: User) -> int | None:
+        """
+        Версия заметки без загрузки ее содержимого (для ETag).
+
+        Возвращает:
+            int | None: Версия или None, если заметка не найдена.
+        """
+        result = await self.db.execute(
+            select(Note.version).where(
+                Note.id == note_id,
+                Note.user_id == user.id,
+                Note.is_deleted.is_(False)
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def create_note(
+        self, note_data: NoteCreate, user: User
+    ) -> Note:
+        """
+        Создание новой заметки.
+
+        Аргументы:
+            note_data (NoteCreate): Данные для создания заметки.
+            user (User): Текущий авторизованный пользователь.
+
+        Возвращает:
+            NoteResponse: Созданная заметка в виде Pydantic модели.
+        """
+        async with self._write("Error creating note"):
+            versions = await self._bump_notes_version([user.id])
+            result = await self.db.scalars(
+                insert(Note)
+                .values(
+                    title=note_data.title,
+                    body=note_data.body,
+                    user_id=user.id,
+                    change_seq=versions[user.id]
+                )
+                .returning(Note)
+            )
+            note = result.one()
+            await self.revisions.record([note])
+            await self.stats.record({user.id: created_change([note])})
+        await self._publish("created", {note.id: user.id}, versions)
+        logger.info("Note created with id: %s for user: %s", note.id, user.id)
+        logger.info("User '%s' created note ID %s", user.username, note.id)
         return note
 
-    async def get_user_notes(self, user: User) -> Sequence[Note]:
+    async def get_user_notes(
+        self,
+        user: User,
+        limit: int,
+        after_id: int | None = None,
+        notes_version: int | None = None,
+        view: NoteListView | None = None,
+    ) -> Sequence[NoteRow]:
         """
-        Получение всех заметок текущего пользователя.
+        Получение страницы заметок текущего пользователя.
+
+        Заметки выбираются колонками полей ответа, без загрузки
+        ORM-объектов в сессию.
 
         Аргументы:
             user (User): Текущий авторизованный пользователь.
+            limit (int): Максимальное количество заметок на странице.
+            after_id (int | None): ID последней заметки предыдущей страницы.
+            notes_version (int | None): Версия списка заметок, прочитанная
+            до запроса страницы (см. `get_notes_version`). Если задана,
+            страница читается из кеша и сохраняется в него под этой версией.
+            view (NoteListView | None): Набор полей и длина превью тела;
+            по умолчанию все поля NoteRow.
 
         Возвращает:
-            List[NoteResponse]: Список заметок пользователя в
-            виде Pydantic моделей.
+            Sequence[NoteRow]: Строки заметок пользователя (с полями
+            представления, если оно задано).
         """
-        result = await self.db.execute(
-            select(Note).where(
-                Note.user_id == user.id, Note.is_deleted.is_(False)
+        fields = view.fields if view is not None else NoteRow._fields
+        view_key = view.key if view is not None else ""
+        use_cache = self.cache is not None and notes_version is not None
+        if use_cache:
+            cached = await self.cache.get_list(
+                user.id, notes_version, limit, after_id, view_key
             )
+            if cached is not None:
+                logger.info(
+                    "User '%s' retrieved %s notes from cache",
+                    user.username, len(cached)
+                )
+                row_type = _row_type(fields)
+                return [row_type(*values) for values in cached]
+
+        result = await self.db.execute(
+            self._user_notes_query(user.id, after_id, view).limit(limit)
         )
-        notes = result.scalars().all()
-        logger.info(f"User '{user.username}' retrieved {len(notes)} notes")
+        notes = result.all()
+        if use_cache:
+            await self.cache.set_list(
+                user.id, notes_version, limit, after_id,
+                [tuple(note) for note in notes], view_key
+            )
+        logger.info("User '%s' retrieved %s notes", user.username, len(notes))
         return notes
 
+    def stream_user_notes(
+        self,
+        user: User,
+        after_id: int | None = None,
+        view: NoteListView | None = None,
+    ) -> AsyncIterator[NoteRow]:
+        """
+        Потоковая выдача всех заметок текущего пользователя.
+
+        Аргументы:
+            user (User): Текущий авторизованный пользователь.
+            after_id (int | None): ID заметки, после которой начать выдачу.
+            view (NoteListView | None): Набор полей и длина превью тела.
+
+        Возвращает:
+            AsyncIterator[NoteRow]: Строки заметок пользователя.
+        """
+        logger.info("User '%s' started notes stream", user.username)
+        return self._stream(self._user_notes_query(user.id, after_id, view))
+
     async def get_note_by_id(self, note_id: int, user: User) -> Note:
         """
         Получение заметки по ее ID.
@@ -94,6 +452,20 @@ class NoteService:
         Исключения:
             HTTPException: Если заметка не найдена.
         """
+        notes_version = None
+        if self.cache is not None:
+            # Версия читается до заметки (см. NoteCache)
+            notes_version = await self.get_notes_version(user.id)
+            cached = await self.cache.get_note(
+                user.id, notes_version, note_id
+            )
+            if cached is not None:
+                logger.info(
+                    "User '%s' retrieved %s note from cache",
+                    user.username, note_id
+                )
+                return Note(**cached)
+
         result = await self.db.execute(
             select(Note).where(
                 Note.id == note_id,
@@ -103,14 +475,172 @@ class NoteService:
         )
         note = result.scalars().first()
         if not note:
-            logger.warning(f"Note {note_id} not found for user {user.id}")
+            logger.warning("Note %s not found for user %s", note_id, user.id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Note not found"
             )
-        logger.info(f"User '{user.username}' retrieved {note.id} note")
+        if notes_version is not None:
+            await self.cache.set_note(
+                user.id, notes_version, note.id, _note_payload(note)
+            )
+        logger.info("User '%s' retrieved %s note", user.username, note.id)
         return note
 
+    async def search_notes(
+        self, user: User, query: str, limit: int
+    ) -> List[NoteSearchResult]:
+        """
+        Полнотекстовый поиск по заголовкам и текстам заметок пользователя.
+
+        На PostgreSQL используется индексированная колонка `search_vector`,
+        на SQLite — таблица FTS5 `note_fts`. Удаленные заметки и заметки
+        других пользователей в выдачу не попадают.
+
+        Аргументы:
+            user (User): Текущий авторизованный пользователь.
+            query (str): Поисковый запрос.
+            limit (int): Максимальное количество результатов.
+
+        Возвращает:
+            List[NoteSearchResult]: Найденные заметки, отсортированные
+            по релевантности, с подсвеченными фрагментами текста.
+        """
+        # Запрос из одних пробелов не содержит слов: FTS5 отклоняет
+        # пустое выражение MATCH
+        if not query.split():
+            return []
+        if self.db.bind.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import REGCONFIG
+            tsquery = func.websearch_to_tsquery(
+                cast(SEARCH_CONFIG, REGCONFIG), query
+            )
+            vector = literal_column("note.search_vector")
+            rank = func.ts_rank_cd(vector, tsquery).label("rank")
+            snippet = func.ts_headline(
+                cast(SEARCH_CONFIG, REGCONFIG), Note.body, tsquery,
+                f"StartSel={SNIPPET_START}, StopSel={SNIPPET_END}, "
+                "MaxFragments=2, MaxWords=16, MinWords=4"
+            ).label("snippet")
+            result = await self.db.execute(
+                select(Note.id, Note.title, snippet, rank)
+                .where(
+                    vector.op("@@")(tsquery),
+                    Note.user_id == user.id,
+                    Note.is_deleted.is_(False)
+                )
+                .order_by(rank.desc())
+                .limit(limit)
+            )
+        else:
+            result = await self.db.execute(
+                _SQLITE_SEARCH,
+                {
+                    "query": _fts5_query(query),
+                    "user_id": user.id,
+                    "start": SNIPPET_START,
+                    "end": SNIPPET_END,
+                    "limit": limit,
+                }
+            )
+        found = [
+            NoteSearchResult.model_validate(row, from_attributes=True)
+            for row in result.all()
+        ]
+        logger.info(
+            "User '%s' searched notes, found %s", user.username, len(found)
+        )
+        return found
+
+    async def get_changes(
+        self,
+        user: User,
+        since: Tuple[int, int | None] | None,
+        limit: int
+    ) -> Dict[str, Any]:
+        """
+        Изменения заметок пользователя после курсора синхронизации.
+
+        Номер изменения — версия списка заметок владельца
+        (`notes_version`), записанная в `change_seq` заметки. Версия
+        увеличивается под блокировкой строки пользователя, поэтому номера
+        фиксируются по порядку и без пропусков: изменения с номером не
+        больше прочитанной в начале версии уже видны целиком, а более
+        поздние отсекаются и попадут в следующий ответ. Удаленные
+        заметки возвращаются как ID (tombstone), в том числе перенесенные
+        в архив; после очистки архива (`mode=purge`) клиент с очень старым
+        курсором их не получит.
+
+        Аргументы:
+            user (User): Пользователь.
+            since (Tuple[int, int | None] | None): Декодированный курсор
+            (см. `decode_sync_cursor`); None — полная синхронизация, в
+            которую входят только неудаленные заметки.
+            limit (int): Максимальное число записей в ответе.
+
+        Возвращает:
+            Dict[str, Any]: Измененные заметки (`notes`, NoteRow), ID
+            удаленных (`deleted`), курсор следующего запроса (`cursor`)
+            и признак того, что изменения выданы не полностью
+            (`has_more`).
+        """
+        version = await self.get_notes_version(user.id)
+        conditions = [Note.user_id == user.id, Note.change_seq <= version]
+        archived = None
+        if since is None:
+            conditions.append(Note.is_deleted.is_(False))
+        else:
+            seq, last_id = since
+            if last_id is None:
+                position = (
+                    Note.change_seq > seq, NoteArchive.change_seq > seq
+                )
+            else:
+                position = (
+                    tuple_(Note.change_seq, Note.id) > (seq, last_id),
+                    tuple_(NoteArchive.change_seq, NoteArchive.id)
+                    > (seq, last_id),
+                )
+            conditions.append(position[0])
+            archived = await self.db.execute(
+                select(NoteArchive.change_seq, NoteArchive.id)
+                .where(
+                    NoteArchive.user_id == user.id,
+                    NoteArchive.change_seq <= version,
+                    position[1]
+                )
+                .order_by(NoteArchive.change_seq, NoteArchive.id)
+                .limit(limit + 1)
+            )
+        result = await self.db.execute(
+            select(Note.change_seq, *_ROW_COLUMNS)
+            .where(*conditions)
+            .order_by(Note.change_seq, Note.id)
+            .limit(limit + 1)
+        )
+        changes = [(row[0], row[1], NoteRow(*row[1:])) for row in result]
+        if archived is not None:
+            changes.extend((seq, note_id, None) for seq, note_id in archived)
+            changes.sort(key=lambda change: change[:2])
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        if has_more:
+            cursor = encode_sync_cursor(changes[-1][0], changes[-1][1])
+        else:
+            cursor = encode_sync_cursor(version)
+        return {
+            "notes": [
+                row for _, _, row in changes
+                if row is not None and not row.is_deleted
+            ],
+            "deleted": [
+                note_id for _, note_id, row in changes
+                if row is None or row.is_deleted
+            ],
+            "cursor": cursor,
+            "has_more": has_more,
+        }
+
     async def update_note(
         self, note_id: int, note_data: NoteUpdate, user: User
     ) -> Note:
@@ -128,35 +658,80 @@ class NoteService:
         Исключения:
             HTTPException: Если заметка не найдена.
         """
-        result = await self.db.execute(
-            select(Note).where(Note.id == note_id, Note.user_id == user.id)
-        )
-        note = result.scalars().first()
-        if not note:
-            logger.warning(
-                f"Note {note_id} not found for update by user {user.id}"
-            )
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Note not found"
-            )
-
-        note.title = note_data.title or note.title
-        note.body = note_data.body or note.body
+        values = {}
+        if note_data.title:
+            values["title"] = note_data.title
+        if note_data.body:
+            values["body"] = note_data.body
+        condition = (Note.id == note_id, Note.user_id == user.id)
 
-        try:
-            await self.db.commit()
-            await self.db.refresh(note)
-            logger.info(f"Note {note_id} updated for user {user.id}")
-        except Exception as e:
-            await self.db.rollback()
-            logger.error(f"Error updating note {note_id}", exc_info=e)
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Internal server error"
-            )
+        async with self._write("Error updating note %s", note_id):
+            previous = None
+            if values:
+                versions = await self._bump_notes_version([user.id])
+                previous = await self._contents(
+                    [note_id], Note.user_id == user.id
+                )
+                result = await self.db.scalars(
+                    update(Note)
+                    .where(*condition)
+                    .values(
+                        **values,
+                        version=Note.version + 1,
+                        change_seq=versions[user.id]
+                    )
+                    .returning(Note),
+                    execution_options=_RETURNING_OPTIONS
+                )
+            else:
+                result = await self.db.scalars(select(Note).where(*condition))
+            note = result.first()
+            if not note:
+                logger.warning(
+                    "Note %s not found for update by user %s",
+                    note_id, user.id
+                )
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Note not found"
+                )
+            if previous:
+                await self.revisions.record([note], previous)
+                await self.stats.record(
+                    {user.id: updated_change([note], previous)}
+                )
+        if values:
+            await self._publish("updated", {note.id: user.id}, versions)
+        logger.info("Note %s updated for user %s", note_id, user.id)
         return note
 
+    async def revert_note(
+        self, note_id: int, version: int, user: User
+    ) -> Note:
+        """
+        Возврат заметки к состоянию ревизии.
+
+        Заголовок и текст ревизии записываются как обычное изменение,
+        поэтому возврат сам становится новой ревизией и может быть отменен.
+
+        Аргументы:
+            note_id (int): ID заметки.
+            version (int): Версия, к которой нужно вернуться.
+            user (User): Текущий авторизованный пользователь.
+
+        Возвращает:
+            Note: Заметка после возврата.
+
+        Исключения:
+            HTTPException: Ошибка 404, если заметка или ревизия не найдена.
+        """
+        revision = await self.revisions.get_revision(note_id, version, user)
+        return await self.update_note(
+            note_id,
+            NoteUpdate(title=revision.title, body=revision.body),
+            user
+        )
+
     async def delete_note(self, note_id: int, user: User) -> Dict:
         """
         Удаление (мягкое) заметки по ID.
@@ -168,62 +743,312 @@ class NoteService:
         Возвращает:
             HTTPException: Если заметка не найдена.
         """
+        async with self._write("Error deleting note %s", note_id):
+            versions = await self._bump_notes_version([user.id])
+            deleted = await self._set_deleted(
+                [note_id], True, versions, Note.user_id == user.id
+            )
+            if not deleted:
+                logger.warning(
+                    "Note %s not found for deletion by user %s",
+                    note_id, user.id
+                )
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Note not found"
+                )
+        await self._publish("deleted", {note_id: user.id}, versions)
+        logger.info("Note %s marked as deleted for user %s", note_id, user.id)
+        return {"message": f"Заметка ID {note_id} удалена"}
+
+    async def _set_deleted(
+        self,
+        ids: List[int],
+        deleted: bool,
+        versions: Dict[int, int],
+        *condition: Any
+    ) -> set[int]:
+        """
+        Меняет флаг `is_deleted` одним UPDATE ... WHERE id IN ... RETURNING
+        и обновляет сводную статистику владельцев.
+
+        Изменяются только заметки с другим значением флага; повторное
+        удаление уже удаленной заметки не меняет ее, но не считается
+        ошибкой.
+
+        Аргументы:
+            versions (Dict[int, int]): Новые версии списков владельцев
+            (из _bump_notes_version) для `change_seq`.
+
+        Возвращает:
+            set[int]: ID заметок, удовлетворяющих условию.
+        """
         result = await self.db.execute(
-            select(Note).where(Note.id == note_id, Note.user_id == user.id)
+            update(Note)
+            .where(
+                Note.id.in_(ids), Note.is_deleted.is_(not deleted), *condition
+            )
+            .values(
+                is_deleted=deleted,
+                version=Note.version + 1,
+                change_seq=self._change_seq(versions)
+            )
+            .returning(
+                Note.id, Note.user_id, octet_length(self.db, Note.body)
+            ),
+            execution_options=_RETURNING_OPTIONS
         )
-        note = result.scalars().first()
-        if not note:
-            logger.warning(
-                f"Note {note_id} not found for deletion by user {user.id}"
+        rows = result.all()
+        await self.stats.record(
+            deleted_change(((row[1], row[2]) for row in rows), deleted)
+        )
+        found = {row[0] for row in rows}
+        missing = [note_id for note_id in ids if note_id not in found]
+        if deleted and missing:
+            result = await self.db.scalars(
+                select(Note.id).where(
+                    Note.id.in_(missing), Note.is_deleted.is_(True),
+                    *condition
+                )
             )
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Note not found"
+            found.update(result.all())
+        return found
+
+    async def create_notes(
+        self, items: List[NoteCreate], user: User
+    ) -> List[BatchItemResult]:
+        """
+        Пакетное создание заметок одним многострочным INSERT ... RETURNING.
+
+        Аргументы:
+            items (List[NoteCreate]): Данные создаваемых заметок.
+            user (User): Текущий авторизованный пользователь.
+
+        Возвращает:
+            List[BatchItemResult]: Результаты в порядке входных данных.
+        """
+        async with self._write("Error in batch create"):
+            versions = await self._bump_notes_version([user.id])
+            result = await self.db.scalars(
+                insert(Note).returning(Note, sort_by_parameter_order=True),
+                [
+                    {
+                        "title": item.title,
+                        "body": item.body,
+                        "user_id": user.id,
+                        "change_seq": versions[user.id],
+                    }
+                    for item in items
+                ]
             )
-        note.is_deleted = True
-        try:
-            await self.db.commit()
-            logger.info(f"Note {note_id} marked as deleted for user {user.id}")
-        except Exception as e:
-            await self.db.rollback()
-            logger.error(f"Error deleting note {note_id}", exc_info=e)
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Internal server error"
+            notes = result.all()
+            await self.revisions.record(notes)
+            await self.stats.record({user.id: created_change(notes)})
+        await self._publish(
+            "created", {note.id: user.id for note in notes}, versions
+        )
+        logger.info(
+            "User '%s' created %s notes in batch", user.username, len(notes)
+        )
+        return [
+            BatchItemResult(
+                id=note.id,
+                status="created",
+                note=NoteResponse.model_validate(note, from_attributes=True)
+            )
+            for note in notes
+        ]
+
+    async def update_notes(
+        self, items: List[NoteBatchUpdateItem], user: User
+    ) -> List[BatchItemResult]:
+        """
+        Пакетное обновление заметок одним UPDATE ... WHERE id IN.
+
+        Новые значения подставляются через CASE по ID; пустые поля, как
+        и в `update_note`, оставляют прежнее значение. Если один ID
+        встречается несколько раз, применяется последнее изменение.
+
+        Аргументы:
+            items (List[NoteBatchUpdateItem]): ID заметок и новые данные.
+            user (User): Текущий авторизованный пользователь.
+
+        Возвращает:
+            List[BatchItemResult]: Результаты в порядке входных данных;
+            чужие и несуществующие заметки получают статус "not_found".
+        """
+        changes = {item.id: item for item in items}
+        values: Dict[str, Any] = {}
+        titles = {i: c.title for i, c in changes.items() if c.title}
+        bodies = {i: c.body for i, c in changes.items() if c.body}
+        if titles:
+            values["title"] = case(titles, value=Note.id, else_=Note.title)
+        if bodies:
+            values["body"] = case(bodies, value=Note.id, else_=Note.body)
+
+        condition = (Note.id.in_(changes), Note.user_id == user.id)
+        async with self._write("Error in batch update"):
+            previous = None
+            if values:
+                versions = await self._bump_notes_version([user.id])
+                previous = await self._contents(
+                    changes, Note.user_id == user.id
+                )
+                result = await self.db.scalars(
+                    update(Note)
+                    .where(*condition)
+                    .values(
+                        **values,
+                        version=Note.version + 1,
+                        change_seq=versions[user.id]
+                    )
+                    .returning(Note),
+                    execution_options=_RETURNING_OPTIONS
+                )
+            else:
+                result = await self.db.scalars(select(Note).where(*condition))
+            notes = {note.id: note for note in result.all()}
+            if previous:
+                await self.revisions.record(list(notes.values()), previous)
+                await self.stats.record(
+                    {user.id: updated_change(notes.values(), previous)}
+                )
+        if values:
+            await self._publish(
+                "updated", dict.fromkeys(notes, user.id), versions
+            )
+        logger.info(
+            "User '%s' updated %s notes in batch", user.username, len(notes)
+        )
+        return [
+            BatchItemResult(
+                id=item.id,
+                status="updated",
+                note=NoteResponse.model_validate(
+                    notes[item.id], from_attributes=True
+                )
+            )
+            if item.id in notes
+            else BatchItemResult(id=item.id, status="not_found")
+            for item in items
+        ]
+
+    async def delete_notes(
+        self, ids: List[int], user: User
+    ) -> List[BatchItemResult]:
+        """
+        Пакетное (мягкое) удаление заметок одним UPDATE ... WHERE id IN.
+
+        Аргументы:
+            ids (List[int]): ID заметок для удаления.
+            user (User): Текущий авторизованный пользователь.
+
+        Возвращает:
+            List[BatchItemResult]: Результаты в порядке входных данных.
+        """
+        async with self._write("Error in batch delete"):
+            versions = await self._bump_notes_version([user.id])
+            deleted = await self._set_deleted(
+                ids, True, versions, Note.user_id == user.id
             )
-        return {"message": f"Заметка ID {note.id} удалена"}
+        await self._publish(
+            "deleted", dict.fromkeys(sorted(deleted), user.id), versions
+        )
+        logger.info(
+            "User '%s' deleted %s notes in batch", user.username, len(deleted)
+        )
+        return [
+            BatchItemResult(
+                id=note_id,
+                status="deleted" if note_id in deleted else "not_found"
+            )
+            for note_id in ids
+        ]
 
     # Методы для административных действий можно добавить аналогичным образом:
-    async def get_all_notes(self) -> Sequence[Note]:
+    async def get_all_notes(
+        self,
+        limit: int,
+        after_id: int | None = None,
+        view: NoteListView | None = None,
+    ) -> Sequence[NoteRow]:
         """
-        Получение всех заметок (для администратора).
+        Получение страницы всех заметок (для администратора).
+
+        Аргументы:
+            limit (int): Максимальное количество заметок на странице.
+            after_id (int | None): ID последней заметки предыдущей страницы.
+            view (NoteListView | None): Набор полей и длина превью тела.
 
         Возвращает:
-            List[NoteResponse]: Список всех заметок в виде
-            Pydantic моделей.
+            Sequence[NoteRow]: Строки всех заметок.
         """
-        result = await self.db.execute(select(Note))
-        notes = result.scalars().all()
-        return notes
+        result = await self.db.execute(
+            self._all_notes_query(after_id, view).limit(limit)
+        )
+        return result.all()
+
+    def stream_all_notes(
+        self, after_id: int | None = None, view: NoteListView | None = None
+    ) -> AsyncIterator[NoteRow]:
+        """
+        Потоковая выгрузка всех заметок (для администратора).
+
+        Аргументы:
+            after_id (int | None): ID заметки, после которой начать выдачу.
+            view (NoteListView | None): Набор полей и длина превью тела.
+
+        Возвращает:
+            AsyncIterator[NoteRow]: Строки всех заметок.
+        """
+        return self._stream(self._all_notes_query(after_id, view))
 
     async def get_user_notes_admin(
-        self, user_id: int
-    ) -> Sequence[Note]:
+        self,
+        user_id: int,
+        limit: int,
+        after_id: int | None = None,
+        view: NoteListView | None = None,
+    ) -> Sequence[NoteRow]:
         """
-        Получение заметок пользователя (для администратора).
+        Получение страницы заметок пользователя (для администратора).
 
         Аргументы:
             user_id (int): ID пользователя, чьи заметки нужно получить.
+            limit (int): Максимальное количество заметок на странице.
+            after_id (int | None): ID последней заметки предыдущей страницы.
+            view (NoteListView | None): Набор полей и длина превью тела.
 
         Возвращает:
-            List[NoteResponse]: Список заметок указанного пользователя в
-            виде Pydantic моделей.
+            Sequence[NoteRow]: Строки заметок указанного пользователя.
         """
         result = await self.db.execute(
-            select(Note).where(Note.user_id == user_id)
+            self._admin_user_notes_query(
+                user_id, after_id, view
+            ).limit(limit)
+        )
+        return result.all()
+
+    def stream_user_notes_admin(
+        self,
+        user_id: int,
+        after_id: int | None = None,
+        view: NoteListView | None = None,
+    ) -> AsyncIterator[NoteRow]:
+        """
+        Потоковая выгрузка заметок пользователя (для администратора).
+
+        Аргументы:
+            user_id (int): ID пользователя, чьи заметки нужно получить.
+            after_id (int | None): ID заметки, после которой начать выдачу.
+            view (NoteListView | None): Набор полей и длина превью тела.
+
+        Возвращает:
+            AsyncIterator[NoteRow]: Строки заметок указанного пользователя.
+        """
+        return self._stream(
+            self._admin_user_notes_query(user_id, after_id, view)
         )
-        notes = result.scalars().all()
-        return notes
 
     async def restore_note(self, note_id: int) -> Dict:
         """
@@ -235,25 +1060,129 @@ class NoteService:
         Возвращает:
             HTTPException: Если заметка не найдена.
         """
-        result = await self.db.execute(
-            select(Note).where(Note.id == note_id, Note.is_deleted.is_(True))
+        async with self._write("Error restoring note %s", note_id):
+            restored, versions = await self._restore(ids=[note_id])
+            if not restored:
+                logger.warning("Note %s not found for restore", note_id)
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Note not found"
+                )
+        await self._publish("restored", restored, versions)
+        logger.info("Note %s restored", note_id)
+        return {"message": f"Заметка ID {note_id} востановлена"}
+
+    async def _restore(
+        self, ids: List[int]
+    ) -> Tuple[Dict[int, int], Dict[int, int]]:
+        """
+        Восстанавливает удаленные заметки и обновляет версии списков
+        их владельцев.
+
+        Заметки, уже перенесенные в архив (`note_archive`), возвращаются
+        в таблицу `note` с прежними ID.
+
+        Возвращает:
+            Tuple[Dict[int, int], Dict[int, int]]: ID восстановленных
+            заметок и ID их владельцев; новые версии списков владельцев.
+
+        Владельцы определяются заранее, чтобы строки пользователей
+        блокировались раньше строк заметок, как и в остальных операциях
+        записи, и параллельные транзакции не взаимоблокировались.
+        """
+        owners = await self.db.execute(
+            select(Note.id, Note.user_id).where(
+                Note.id.in_(ids), Note.is_deleted.is_(True)
+            )
         )
-        note = result.scalars().first()
-        if not note:
-            logger.warning(f"Note {note_id} not found for restore")
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Note not found"
+        found = dict(owners.tuples().all())
+        missing = [note_id for note_id in ids if note_id not in found]
+        archived: Dict[int, int] = {}
+        if missing:
+            archive_owners = await self.db.execute(
+                select(NoteArchive.id, NoteArchive.user_id).where(
+                    NoteArchive.id.in_(missing)
+                )
             )
-        note.is_deleted = False
-        try:
-            await self.db.commit()
-            logger.info(f"Note {note_id} restored")
-        except Exception as e:
-            await self.db.rollback()
-            logger.error(f"Error restoring note {note_id}", exc_info=e)
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Internal server error"
+            archived = dict(archive_owners.tuples().all())
+        if not found and not archived:
+            return {}, {}
+        versions = await self._bump_notes_version(
+            [*found.values(), *archived.values()]
+        )
+        restored = await self._set_deleted(
+            list(found), False, versions, Note.is_deleted.is_(True)
+        )
+        result = {note_id: found[note_id] for note_id in restored}
+        if archived:
+            result.update(await self._unarchive(list(archived), versions))
+        return result, versions
+
+    async def _unarchive(
+        self, ids: List[int], versions: Dict[int, int]
+    ) -> Dict[int, int]:
+        """
+        Переносит заметки из архива обратно в таблицу `note`.
+
+        DELETE ... RETURNING из архива гарантирует, что при параллельном
+        восстановлении заметку вернет только одна транзакция.
+
+        Аргументы:
+            ids (List[int]): ID заметок в архиве.
+            versions (Dict[int, int]): Новые версии списков владельцев.
+
+        Возвращает:
+            Dict[int, int]: ID восстановленных заметок и ID их владельцев.
+        """
+        result = await self.db.execute(
+            delete(NoteArchive)
+            .where(NoteArchive.id.in_(ids))
+            .returning(
+                NoteArchive.id, NoteArchive.title, NoteArchive.body,
+                NoteArchive.user_id, NoteArchive.version,
+                NoteArchive.created_at
+            ),
+            execution_options={"synchronize_session": False}
+        )
+        rows = result.all()
+        if rows:
+            await self.stats.record(deleted_change(
+                ((row.user_id, text_bytes(row.body)) for row in rows), False
+            ))
+            await self.db.execute(insert(Note), [
+                {
+                    "id": row.id,
+                    "title": row.title,
+                    "body": row.body,
+                    "user_id": row.user_id,
+                    "version": row.version + 1,
+                    "change_seq": versions[row.user_id],
+                    "created_at": row.created_at,
+                    "is_deleted": False,
+                }
+                for row in rows
+            ])
+        return {row.id: row.user_id for row in rows}
+
+    async def restore_notes(self, ids: List[int]) -> List[BatchItemResult]:
+        """
+        Пакетное восстановление удаленных заметок (для администратора).
+
+        Аргументы:
+            ids (List[int]): ID заметок для восстановления.
+
+        Возвращает:
+            List[BatchItemResult]: Результаты в порядке входных данных;
+            заметки, которые не были удалены, получают статус "not_found".
+        """
+        async with self._write("Error in batch restore"):
+            restored, versions = await self._restore(ids)
+        await self._publish("restored", restored, versions)
+        logger.info("Restored %s notes in batch", len(restored))
+        return [
+            BatchItemResult(
+                id=note_id,
+                status="restored" if note_id in restored else "not_found"
             )
-        return {"message": f"Заметка ID {note.id} востановлена"}
+            for note_id in ids
+        ]
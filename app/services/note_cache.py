@@ -0,0 +1,134 @@
+from app.core.cache import (
+    CACHE_HITS, CACHE_MISSES, CacheBackend, MemoryCache, RedisCache
+)
+from app.core.config import CACHE_BACKEND, CACHE_TTL, LOG_FILE
+from app.core.logger import get_logger
+from app.core.serialization import dumps, loads
+
+from typing import Any, Dict, List
+
+
+logger = get_logger("app.service.note_cache", log_file=LOG_FILE)
+
+
+class NoteCache:
+    """
+    Кеш чтения заметок с инвалидацией по версии списка заметок.
+
+    Ключи заметок и страниц списка содержат версию списка заметок
+    пользователя из БД (`User.notes_version`), по которой строится и
+    ETag списка. Любая запись в заметки пользователя увеличивает версию,
+    после чего его прежние записи становятся недоступны и вытесняются по
+    TTL или LRU. Версия читается из БД, поэтому запись в одном воркере
+    сразу делает недоступными записи кеша в памяти других воркеров.
+    Под версией V хранятся только данные, прочитанные после фиксации V,
+    поэтому данные из кеша никогда не старше своей версии.
+
+    Ошибки хранилища не прерывают запрос: чтение считается промахом,
+    а неудачная запись в кеш — в лог.
+    """
+    def __init__(self, backend: CacheBackend, ttl: float = CACHE_TTL):
+        """
+        Аргументы:
+            backend (CacheBackend): Хранилище кеша.
+            ttl (float): Время жизни записей в секундах.
+        """
+        self.backend = backend
+        self.ttl = ttl
+
+    async def _get(self, key: str) -> Any:
+        try:
+            raw = await self.backend.get(key)
+        except Exception as e:
+            logger.warning("Cache read failed for %s", key, exc_info=e)
+            raw = None
+        if raw is None:
+            CACHE_MISSES.inc(backend=self.backend.name)
+            return None
+        CACHE_HITS.inc(backend=self.backend.name)
+        return loads(raw)
+
+    async def _set(self, key: str, value: Any) -> None:
+        try:
+            await self.backend.set(key, dumps(value), self.ttl)
+        except Exception as e:
+            logger.warning("Cache write failed for %s", key, exc_info=e)
+
+    @staticmethod
+    def _note_key(user_id: int, notes_version: int, note_id: int) -> str:
+        return f"notes:{user_id}:note:{notes_version}:{note_id}"
+
+    @staticmethod
+    def _list_key(
+        user_id: int,
+        notes_version: int,
+        limit: int,
+        after_id: int | None,
+        view: str,
+    ) -> str:
+        return (
+            f"notes:{user_id}:list:{notes_version}:{limit}:{after_id}:{view}"
+        )
+
+    async def get_note(
+        self, user_id: int, notes_version: int, note_id: int
+    ) -> Dict[str, Any] | None:
+        return await self._get(
+            self._note_key(user_id, notes_version, note_id)
+        )
+
+    async def set_note(
+        self,
+        user_id: int,
+        notes_version: int,
+        note_id: int,
+        payload: Dict[str, Any]
+    ) -> None:
+        await self._set(
+            self._note_key(user_id, notes_version, note_id), payload
+        )
+
+    async def get_list(
+        self,
+        user_id: int,
+        notes_version: int,
+        limit: int,
+        after_id: int | None,
+        view: str = "",
+    ) -> List[Any] | None:
+        return await self._get(
+            self._list_key(user_id, notes_version, limit, after_id, view)
+        )
+
+    async def set_list(
+        self,
+        user_id: int,
+        notes_version: int,
+        limit: int,
+        after_id: int | None,
+        payload: List[Any],
+        view: str = "",
+    ) -> None:
+        await self._set(
+            self._list_key(user_id, notes_version, limit, after_id, view),
+            payload
+        )
+
+
+def build_note_cache(backend: str = CACHE_BACKEND) -> NoteCache | None:
+    """
+    Создает кеш заметок по настройке CACHE_BACKEND.
+
+    Возвращает:
+        NoteCache | None: Кеш или None, если кеширование отключено.
+    """
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return NoteCache(MemoryCache())
+    if backend == "redis":
+        return NoteCache(RedisCache.from_url())
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+
+note_cache = build_note_cache()
@@ -0,0 +1,227 @@
+from sqlalchemy import and_, func, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from fastapi import HTTPException, status
+
+from app.db.models import Note, NoteRevision, User
+from app.schemas.note import NoteRevisionResponse
+from app.core.config import (
+    LOG_FILE, REVISION_MAX_DELTA_RATIO, REVISION_SNAPSHOT_INTERVAL
+)
+from app.core.delta import apply_delta, encode_revision
+from app.core.logger import get_logger
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+
+logger = get_logger("app.service.revision", log_file=LOG_FILE)
+
+# Заголовок, текст и версия заметки до изменения
+NoteContent = Tuple[str, str, int]
+
+
+class NoteRevisionService:
+    """
+    Сервис истории ревизий заметок.
+
+    Ревизии записываются в транзакции изменения заметки: полная копия
+    текста при создании и периодически, между ними — дельты относительно
+    предыдущей ревизии. Любая ревизия восстанавливается от ближайшей
+    предшествующей полной копии применением не более
+    REVISION_SNAPSHOT_INTERVAL - 1 дельт.
+    """
+    def __init__(self, db: AsyncSession):
+        """
+        Инициализация сервиса ревизий.
+
+        Аргументы:
+            db (AsyncSession): Асинхронная сессия базы данных.
+        """
+        self.db = db
+
+    async def _latest_depths(self, note_ids: List[int]) -> Dict[int, int]:
+        latest = (
+            select(
+                NoteRevision.note_id,
+                func.max(NoteRevision.version).label("version")
+            )
+            .where(NoteRevision.note_id.in_(note_ids))
+            .group_by(NoteRevision.note_id)
+            .subquery()
+        )
+        result = await self.db.execute(
+            select(NoteRevision.note_id, NoteRevision.depth).join(
+                latest,
+                and_(
+                    NoteRevision.note_id == latest.c.note_id,
+                    NoteRevision.version == latest.c.version
+                )
+            )
+        )
+        return dict(result.tuples().all())
+
+    async def record(
+        self,
+        notes: Sequence[Note],
+        previous: Dict[int, NoteContent] | None = None
+    ) -> int:
+        """
+        Записывает ревизии созданных или измененных заметок.
+
+        Вызывается внутри транзакции записи. Заметки, у которых заголовок
+        и текст не изменились, пропускаются. Если у измененной заметки
+        еще нет истории (создана до ее появления), сначала сохраняется
+        полная копия прежнего состояния.
+
+        Аргументы:
+            notes (Sequence[Note]): Заметки в новом состоянии.
+            previous (Dict[int, NoteContent] | None): Прежние заголовок,
+            текст и версия изменяемых заметок; для новых заметок — нет.
+
+        Возвращает:
+            int: Количество записанных ревизий.
+        """
+        previous = previous or {}
+        changed = [
+            note for note in notes
+            if note.id not in previous
+            or previous[note.id][:2] != (note.title, note.body)
+        ]
+        if not changed:
+            return 0
+        depths = await self._latest_depths(
+            [note.id for note in changed if note.id in previous]
+        )
+        rows: List[Dict[str, Any]] = []
+        for note in changed:
+            if note.id not in previous:
+                is_snapshot, data, depth = True, note.body, 0
+            else:
+                title, body, version = previous[note.id]
+                depth = depths.get(note.id)
+                if depth is None:
+                    rows.append({
+                        "note_id": note.id, "version": version,
+                        "title": title, "is_snapshot": True, "depth": 0,
+                        "data": body,
+                    })
+                    depth = 0
+                is_snapshot, data, depth = encode_revision(
+                    body, note.body, depth,
+                    REVISION_SNAPSHOT_INTERVAL, REVISION_MAX_DELTA_RATIO
+                )
+            rows.append({
+                "note_id": note.id, "version": note.version,
+                "title": note.title, "is_snapshot": is_snapshot,
+                "depth": depth, "data": data,
+            })
+        await self.db.execute(insert(NoteRevision), rows)
+        return len(rows)
+
+    async def _check_owner(self, note_id: int, user: User) -> None:
+        owned = await self.db.scalar(
+            select(Note.id).where(
+                Note.id == note_id,
+                Note.user_id == user.id,
+                Note.is_deleted.is_(False)
+            )
+        )
+        if owned is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Note not found"
+            )
+
+    async def list_revisions(
+        self,
+        note_id: int,
+        user: User,
+        limit: int,
+        after_id: int | None = None
+    ) -> Sequence[Any]:
+        """
+        Получение страницы ревизий заметки (от старых к новым).
+
+        Аргументы:
+            note_id (int): ID заметки.
+            user (User): Текущий авторизованный пользователь.
+            limit (int): Размер страницы.
+            after_id (int | None): ID последней ревизии предыдущей страницы.
+
+        Возвращает:
+            Sequence: Строки ревизий без текста (id, версия, признак
+            полной копии, время).
+
+        Исключения:
+            HTTPException: Ошибка 404, если заметка не найдена.
+        """
+        await self._check_owner(note_id, user)
+        query = select(
+            NoteRevision.id, NoteRevision.version,
+            NoteRevision.is_snapshot, NoteRevision.created_at
+        ).where(NoteRevision.note_id == note_id)
+        if after_id is not None:
+            query = query.where(NoteRevision.id > after_id)
+        result = await self.db.execute(
+            query.order_by(NoteRevision.id).limit(limit)
+        )
+        return result.all()
+
+    async def get_revision(
+        self, note_id: int, version: int, user: User
+    ) -> NoteRevisionResponse:
+        """
+        Получение заметки в состоянии указанной ревизии.
+
+        Текст восстанавливается от ближайшей предшествующей полной копии:
+        выбираются `depth + 1` последних ревизий до запрошенной.
+
+        Аргументы:
+            note_id (int): ID заметки.
+            version (int): Версия заметки.
+            user (User): Текущий авторизованный пользователь.
+
+        Возвращает:
+            NoteRevisionResponse: Заголовок и текст ревизии.
+
+        Исключения:
+            HTTPException: Ошибка 404, если заметка или ревизия не найдена.
+        """
+        await self._check_owner(note_id, user)
+        target = await self.db.scalar(
+            select(NoteRevision).where(
+                NoteRevision.note_id == note_id,
+                NoteRevision.version == version
+            )
+        )
+        if target is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Revision not found"
+            )
+        body = target.data
+        if not target.is_snapshot:
+            result = await self.db.execute(
+                select(NoteRevision.data)
+                .where(
+                    NoteRevision.note_id == note_id,
+                    NoteRevision.version <= version
+                )
+                .order_by(NoteRevision.version.desc())
+                .limit(target.depth + 1)
+            )
+            chain = result.scalars().all()[::-1]
+            body = chain[0]
+            for delta in chain[1:]:
+                body = apply_delta(body, delta)
+        logger.info(
+            "Revision %s of note %s rebuilt for user %s",
+            version, note_id, user.id
+        )
+        return NoteRevisionResponse(
+            note_id=note_id,
+            version=version,
+            title=target.title,
+            body=body,
+            created_at=target.created_at
+        )
@@ -0,0 +1,475 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+
+from fastapi import HTTPException, status
+from sqlalchemy import case, delete, exists, func, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import (
+    LOG_FILE, STATS_RECONCILE_BATCH, STATS_RECONCILE_INTERVAL,
+    STATS_RECONCILE_PAUSE
+)
+from app.core.logger import get_logger
+from app.core.metrics import counter
+from app.db.dialects import dialect_insert, octet_length
+from app.db.models import (
+    Note, NoteArchive, NoteDailyStats, NoteRevision, NoteStats, User
+)
+from app.services.revision import NoteContent
+
+from typing import Any, Callable, Dict, Iterable, List, Sequence
+
+
+logger = get_logger("app.service.stats", log_file=LOG_FILE)
+
+TOTAL_COLUMNS = ("live_notes", "deleted_notes", "body_bytes")
+DAILY_COLUMNS = ("created", "updated")
+
+STATS_RECONCILED = counter(
+    "note_stats_reconciled_users_total",
+    "Пользователи, сводка заметок которых пересчитана сверкой"
+)
+STATS_DRIFT = counter(
+    "note_stats_drift_total",
+    "Пользователи, сводка которых расходилась с пересчетом"
+)
+
+# Изменения сводки пользователя: колонка -> приращение
+StatsChange = Dict[str, int]
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def text_bytes(text: str) -> int:
+    return len(text.encode())
+
+
+def _day(value: date | str) -> date:
+    # func.date() возвращает строку в SQLite и date в PostgreSQL
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def created_change(notes: Sequence[Note]) -> StatsChange:
+    """Изменение сводки при создании заметок."""
+    return {
+        "live_notes": len(notes),
+        "body_bytes": sum(text_bytes(note.body) for note in notes),
+        "created": len(notes),
+    }
+
+
+def updated_change(
+    notes: Iterable[Note], previous: Dict[int, NoteContent]
+) -> StatsChange:
+    """
+    Изменение сводки при обновлении заметок.
+
+    Изменением считается смена заголовка или текста, как и для ревизий;
+    объем текста учитывается только у неудаленных заметок.
+    """
+    changed = [
+        note for note in notes
+        if note.id in previous
+        and previous[note.id][:2] != (note.title, note.body)
+    ]
+    return {
+        "updated": len(changed),
+        "body_bytes": sum(
+            text_bytes(note.body) - text_bytes(previous[note.id][1])
+            for note in changed if not note.is_deleted
+        ),
+    }
+
+
+def deleted_change(
+    rows: Iterable[Any], deleted: bool
+) -> Dict[int, StatsChange]:
+    """
+    Изменения сводки при удалении или восстановлении заметок.
+
+    Аргументы:
+        rows (Iterable): Пары (ID владельца, объем текста в байтах).
+        deleted (bool): True — заметки удалены, False — восстановлены.
+
+    Возвращает:
+        Dict[int, StatsChange]: Приращения по ID пользователей.
+    """
+    sign = 1 if deleted else -1
+    changes: Dict[int, StatsChange] = {}
+    for user_id, body_bytes in rows:
+        change = changes.setdefault(user_id, dict.fromkeys(TOTAL_COLUMNS, 0))
+        change["live_notes"] -= sign
+        change["deleted_notes"] += sign
+        change["body_bytes"] -= sign * body_bytes
+    return changes
+
+
+class NoteStatsService:
+    """
+    Сводная статистика заметок для администратора.
+
+    Сводка (`note_stats`, `note_daily_stats`) обновляется приращениями
+    в транзакциях записи заметок, после блокировки строки пользователя,
+    поэтому запросы статистики читают O(пользователей) строк вместо
+    подсчета по всем заметкам. Сверка (`reconcile`) пересчитывает сводку
+    по самим заметкам и исправляет расхождения, например после ручных
+    изменений в БД.
+    """
+    def __init__(self, db: AsyncSession):
+        """
+        Аргументы:
+            db (AsyncSession): Асинхронная сессия для взаимодействия с БД.
+        """
+        self.db = db
+
+    async def _upsert(
+        self,
+        model: Any,
+        rows: List[Dict[str, Any]],
+        keys: Sequence[str],
+        columns: Sequence[str]
+    ) -> None:
+        query = dialect_insert(self.db, model).values(rows)
+        await self.db.execute(query.on_conflict_do_update(
+            index_elements=[getattr(model, key) for key in keys],
+            set_={
+                column: getattr(model, column)
+                + getattr(query.excluded, column)
+                for column in columns
+            }
+        ))
+
+    async def record(self, changes: Dict[int, StatsChange]) -> None:
+        """
+        Применяет приращения сводки пользователей.
+
+        Вызывается внутри транзакции записи после _bump_notes_version:
+        строки сводки пользователя изменяются только под блокировкой его
+        строки, поэтому параллельные записи не теряют приращений.
+
+        Аргументы:
+            changes (Dict[int, StatsChange]): Приращения колонок
+            (TOTAL_COLUMNS, DAILY_COLUMNS) по ID пользователей.
+        """
+        totals, daily = [], []
+        today = utc_today()
+        for user_id, change in sorted(changes.items()):
+            if any(change.get(column) for column in TOTAL_COLUMNS):
+                totals.append({"user_id": user_id, **{
+                    column: change.get(column, 0) for column in TOTAL_COLUMNS
+                }})
+            if any(change.get(column) for column in DAILY_COLUMNS):
+                daily.append({"user_id": user_id, "day": today, **{
+                    column: change.get(column, 0) for column in DAILY_COLUMNS
+                }})
+        if totals:
+            await self._upsert(NoteStats, totals, ("user_id",), TOTAL_COLUMNS)
+        if daily:
+            await self._upsert(
+                NoteDailyStats, daily, ("user_id", "day"), DAILY_COLUMNS
+            )
+
+    async def _daily(
+        self, days: int, user_id: int | None = None
+    ) -> List[Dict[str, Any]]:
+        since = utc_today() - timedelta(days=days - 1)
+        query = (
+            select(
+                NoteDailyStats.day,
+                func.sum(NoteDailyStats.created).label("created"),
+                func.sum(NoteDailyStats.updated).label("updated"),
+            )
+            .where(NoteDailyStats.day >= since)
+            .group_by(NoteDailyStats.day)
+            .order_by(NoteDailyStats.day)
+        )
+        if user_id is not None:
+            query = query.where(NoteDailyStats.user_id == user_id)
+        result = await self.db.execute(query)
+        return [row._asdict() for row in result]
+
+    async def summary(self, days: int) -> Dict[str, Any]:
+        """
+        Итоги по всем пользователям и создания/изменения по дням.
+
+        Аргументы:
+            days (int): Число последних дней (включая текущий).
+
+        Возвращает:
+            Dict[str, Any]: Число пользователей с заметками, суммы
+            колонок сводки и `daily` — список по дням.
+        """
+        result = await self.db.execute(
+            select(
+                func.count(NoteStats.id).label("users"),
+                *(
+                    func.coalesce(
+                        func.sum(getattr(NoteStats, column)), 0
+                    ).label(column)
+                    for column in TOTAL_COLUMNS
+                )
+            )
+        )
+        return {**result.one()._asdict(), "daily": await self._daily(days)}
+
+    async def list_users(
+        self, limit: int, after_id: int | None = None
+    ) -> List[Any]:
+        """
+        Сводка по пользователям, упорядоченная по ID пользователя.
+
+        Аргументы:
+            limit (int): Размер страницы.
+            after_id (int | None): ID пользователя из курсора.
+
+        Возвращает:
+            List[Row]: Строки с полями user_id, username и TOTAL_COLUMNS.
+        """
+        query = (
+            select(
+                NoteStats.user_id, User.username,
+                *(getattr(NoteStats, column) for column in TOTAL_COLUMNS)
+            )
+            .join(User, User.id == NoteStats.user_id)
+            .order_by(NoteStats.user_id)
+            .limit(limit)
+        )
+        if after_id is not None:
+            query = query.where(NoteStats.user_id > after_id)
+        result = await self.db.execute(query)
+        return result.all()
+
+    async def user_stats(self, user_id: int, days: int) -> Dict[str, Any]:
+        """
+        Сводка одного пользователя с созданиями/изменениями по дням.
+
+        Исключения:
+            HTTPException: Ошибка 404, если пользователь не найден.
+        """
+        result = await self.db.execute(
+            select(
+                User.id.label("user_id"), User.username,
+                *(
+                    func.coalesce(getattr(NoteStats, column), 0).label(column)
+                    for column in TOTAL_COLUMNS
+                )
+            )
+            .outerjoin(NoteStats, NoteStats.user_id == User.id)
+            .where(User.id == user_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        return {**row._asdict(), "daily": await self._daily(days, user_id)}
+
+    async def _computed_totals(
+        self, user_ids: List[int]
+    ) -> Dict[int, Dict[str, int]]:
+        live = Note.is_deleted.is_(False)
+        result = await self.db.execute(
+            select(
+                Note.user_id,
+                func.sum(case((live, 1), else_=0)),
+                func.sum(case((live, 0), else_=1)),
+                func.sum(
+                    case((live, octet_length(self.db, Note.body)), else_=0)
+                ),
+            )
+            .where(Note.user_id.in_(user_ids))
+            .group_by(Note.user_id)
+        )
+        totals = {
+            user_id: {
+                "live_notes": int(live_notes),
+                "deleted_notes": int(deleted_notes),
+                "body_bytes": int(body_bytes),
+            }
+            for user_id, live_notes, deleted_notes, body_bytes in result
+        }
+        archived = await self.db.execute(
+            select(NoteArchive.user_id, func.count())
+            .where(NoteArchive.user_id.in_(user_ids))
+            .group_by(NoteArchive.user_id)
+        )
+        for user_id, count in archived:
+            totals.setdefault(user_id, dict.fromkeys(TOTAL_COLUMNS, 0))
+            totals[user_id]["deleted_notes"] += count
+        return totals
+
+    async def _computed_daily(self, user_ids: List[int]) -> List[dict]:
+        # Заметки пользователей, в том числе перенесенные в архив
+        owners = union_all(
+            select(Note.id, Note.user_id, Note.created_at)
+            .where(Note.user_id.in_(user_ids)),
+            select(NoteArchive.id, NoteArchive.user_id, NoteArchive.created_at)
+            .where(NoteArchive.user_id.in_(user_ids)),
+        ).subquery()
+        daily: Dict[tuple, Dict[str, Any]] = {}
+
+        def add(rows: Iterable[Any], column: str) -> None:
+            for user_id, day, count in rows:
+                key = (user_id, _day(day))
+                row = daily.setdefault(key, {
+                    "user_id": user_id, "day": key[1],
+                    "created": 0, "updated": 0,
+                })
+                row[column] = count
+
+        created_day = func.date(owners.c.created_at)
+        add(await self.db.execute(
+            select(owners.c.user_id, created_day, func.count())
+            .group_by(owners.c.user_id, created_day)
+        ), "created")
+        # Изменения — ревизии после первой версии заметки
+        updated_day = func.date(NoteRevision.created_at)
+        add(await self.db.execute(
+            select(owners.c.user_id, updated_day, func.count())
+            .join(owners, owners.c.id == NoteRevision.note_id)
+            .where(NoteRevision.version > 1)
+            .group_by(owners.c.user_id, updated_day)
+        ), "updated")
+        return list(daily.values())
+
+    async def reconcile_users(self, user_ids: List[int]) -> int:
+        """
+        Пересчитывает сводку пользователей по заметкам и фиксирует ее.
+
+        Строки пользователей блокируются до пересчета (как и в записях
+        заметок), поэтому приращения параллельных записей не теряются.
+        Изменения по дням восстанавливаются по датам создания заметок и
+        ревизий; ревизии удаленных безвозвратно заметок не сохраняются,
+        и их изменения из истории по дням исчезают.
+
+        Аргументы:
+            user_ids (List[int]): ID пользователей.
+
+        Возвращает:
+            int: Число пользователей, сводка которых была неверной.
+        """
+        try:
+            await self.db.execute(
+                select(User.id)
+                .where(User.id.in_(user_ids))
+                .order_by(User.id)
+                .with_for_update()
+            )
+            computed = await self._computed_totals(user_ids)
+            stored = await self.db.execute(
+                select(
+                    NoteStats.user_id,
+                    *(getattr(NoteStats, column) for column in TOTAL_COLUMNS)
+                ).where(NoteStats.user_id.in_(user_ids))
+            )
+            current = {
+                row.user_id: {column: getattr(row, column)
+                              for column in TOTAL_COLUMNS}
+                for row in stored
+            }
+            zero = dict.fromkeys(TOTAL_COLUMNS, 0)
+            drift = sum(
+                1 for user_id in user_ids
+                if current.get(user_id, zero) != computed.get(user_id, zero)
+            )
+            daily = await self._computed_daily(user_ids)
+            for model in (NoteStats, NoteDailyStats):
+                await self.db.execute(
+                    delete(model).where(model.user_id.in_(user_ids)),
+                    execution_options={"synchronize_session": False}
+                )
+            if computed:
+                await self.db.execute(dialect_insert(self.db, NoteStats), [
+                    {"user_id": user_id, **totals}
+                    for user_id, totals in computed.items()
+                ])
+            if daily:
+                await self.db.execute(
+                    dialect_insert(self.db, NoteDailyStats), daily
+                )
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            logger.error("Error reconciling note stats: %s", e)
+            raise
+        STATS_RECONCILED.inc(len(user_ids))
+        if drift:
+            STATS_DRIFT.inc(drift)
+        return drift
+
+    async def reconcile(
+        self,
+        batch_size: int = STATS_RECONCILE_BATCH,
+        pause: float = STATS_RECONCILE_PAUSE
+    ) -> Dict[str, int]:
+        """
+        Пересчитывает сводку всех пользователей пачками.
+
+        Каждая пачка — отдельная транзакция; между пачками выдерживается
+        пауза `pause`, чтобы сверка не вытесняла пользовательские запросы.
+
+        Возвращает:
+            Dict[str, int]: Число обработанных пользователей и
+            пользователей с расхождениями.
+        """
+        users = drift = 0
+        after_id = 0
+        while True:
+            result = await self.db.scalars(
+                select(User.id)
+                .where(User.id > after_id)
+                .order_by(User.id)
+                .limit(batch_size)
+            )
+            user_ids = list(result.all())
+            if not user_ids:
+                break
+            drift += await self.reconcile_users(user_ids)
+            users += len(user_ids)
+            after_id = user_ids[-1]
+            if len(user_ids) < batch_size:
+                break
+            await asyncio.sleep(pause)
+        if drift:
+            logger.warning(
+                "Note stats drift fixed for %s of %s users", drift, users
+            )
+        return {"users": users, "drift": drift}
+
+    async def needs_initial_fill(self) -> bool:
+        """Сводка пуста, а заметки есть (например, после обновления)."""
+        result = await self.db.execute(select(
+            ~exists().where(NoteStats.id.is_not(None)),
+            exists().where(Note.id.is_not(None)),
+        ))
+        empty, has_notes = result.one()
+        return bool(empty and has_notes)
+
+
+async def reconcile_forever(
+    session_factory: Callable[[], AsyncSession] | async_sessionmaker,
+    interval: float = STATS_RECONCILE_INTERVAL,
+) -> None:
+    """
+    Фоновая задача: сверяет сводку каждые `interval` секунд.
+
+    При старте сверка выполняется сразу только для пустой сводки:
+    полный пересчет при каждом перезапуске воркеров был бы лишней
+    нагрузкой. Ошибки записываются в лог и не останавливают задачу.
+    """
+    first = True
+    while True:
+        try:
+            async with session_factory() as session:
+                service = NoteStatsService(session)
+                if not first or await service.needs_initial_fill():
+                    await service.reconcile()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Note stats reconcile failed: %s", e)
+        first = False
+        await asyncio.sleep(interval)
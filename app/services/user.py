@@ -1,8 +1,11 @@
+from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 from app.db.models import User
-from app.core.security import get_password_hash
+from app.db.dialects import dialect_insert
+from app.core.revocation import revocations, utcnow
+from app.core.security import get_password_hash_async
 from app.schemas.user import UserCreate
 from app.core.logger import get_logger
 from app.core.config import LOG_FILE
@@ -29,16 +32,26 @@ class UserService:
         self.db = db
 
     # Получение всех пользователей
-    async def get_all_users(self) -> Sequence[User]:
+    async def get_all_users(
+        self, limit: int, after_id: int | None = None
+    ) -> Sequence[User]:
         """
-        Получение списка всех пользователей.
+        Получение страницы списка пользователей.
+
+        Аргументы:
+            limit (int): Максимальное количество пользователей на странице.
+            after_id (int | None): ID последнего пользователя
+            предыдущей страницы.
 
         Возвращает:
-            List[User]: Список всех пользователей.
+            List[User]: Список пользователей.
         """
-        result = await self.db.execute(select(User))
+        query = select(User)
+        if after_id is not None:
+            query = query.where(User.id > after_id)
+        result = await self.db.execute(query.order_by(User.id).limit(limit))
         users = result.scalars().all()
-        logger.info(f"Получено {len(users)} пользователей.")
+        logger.info("Получено %s пользователей.", len(users))
         return users
 
     # Создание нового пользователя
@@ -51,17 +64,91 @@ class UserService:
 
         Возвращает:
             User: Созданный пользователь.
+
+        Исключения:
+            HTTPException: Ошибка 400, если имя пользователя уже занято.
         """
-        hashed_password = get_password_hash(user_data.password)
-        new_user = User(
-            username=user_data.username,
-            password=hashed_password,
-            role=user_data.role
+        hashed_password = await get_password_hash_async(user_data.password)
+        result = await self.db.scalars(
+            dialect_insert(self.db, User)
+            .values(
+                username=user_data.username,
+                password=hashed_password,
+                role=user_data.role
+            )
+            .on_conflict_do_nothing(index_elements=[User.username])
+            .returning(User)
         )
-        self.db.add(new_user)
+        new_user = result.first()
+        if new_user is None:
+            await self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Пользователь с таким именем уже существует"
+            )
         await self.db.commit()
-        await self.db.refresh(new_user)
         logger.info(
-            f"Создан пользователь '{user_data.username}' с ролью '{user_data.role}'"
+            "Создан пользователь '%s' с ролью '%s'",
+            user_data.username, user_data.role
         )
         return new_user
+
+    # Изменение роли пользователя
+    async def change_role(self, user_id: int, role: str) -> User:
+        """
+        Изменение роли пользователя.
+
+        Ранее выданные токены пользователя перестают действовать
+        (содержат прежнюю роль); для новой роли нужен новый вход.
+
+        Аргументы:
+            user_id (int): ID пользователя.
+            role (str): Новая роль.
+
+        Возвращает:
+            User: Пользователь с новой ролью.
+
+        Исключения:
+            HTTPException: Ошибка 404, если пользователь не найден.
+        """
+        user = await self._invalidate_tokens(user_id, role=role)
+        logger.info("Роль пользователя ID %s изменена на '%s'", user_id, role)
+        return user
+
+    # Отзыв токенов пользователя
+    async def revoke_tokens(self, user_id: int) -> User:
+        """
+        Отзыв всех выданных пользователю токенов.
+
+        Аргументы:
+            user_id (int): ID пользователя.
+
+        Возвращает:
+            User: Пользователь.
+
+        Исключения:
+            HTTPException: Ошибка 404, если пользователь не найден.
+        """
+        user = await self._invalidate_tokens(user_id)
+        logger.info("Токены пользователя ID %s отозваны", user_id)
+        return user
+
+    async def _invalidate_tokens(self, user_id: int, **values: str) -> User:
+        changed_at = utcnow()
+        result = await self.db.scalars(
+            update(User)
+            .where(User.id == user_id)
+            .values(auth_changed_at=changed_at, **values)
+            .returning(User)
+            .execution_options(synchronize_session=False)
+        )
+        user = result.first()
+        if user is None:
+            await self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Пользователь не найден"
+            )
+        await self.db.commit()
+        revocations.mark(user_id, changed_at)
+        return user
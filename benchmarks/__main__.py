@@ -0,0 +1,142 @@
+"""
+Нагрузочный прогон API в процессе, без сетевого сервера.
+
+Пример:
+    python -m benchmarks --iterations 200 --concurrency 8 \\
+        --save benchmarks/baselines/sqlite.json
+    python -m benchmarks --compare benchmarks/baselines/sqlite.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.harness import LATENCY_METRICS, compare_results, run_scenario
+from benchmarks.scenarios import (
+    all_scenarios, authenticate, bench_client, seed_database
+)
+
+from typing import Any, Dict, List
+
+
+DEFAULT_SIZES = "100,1000,10000"
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Бенчмарк API через httpx.ASGITransport."
+    )
+    parser.add_argument(
+        "--dsn",
+        help="URL БД для прогона (по умолчанию временный файл SQLite). "
+             "ВНИМАНИЕ: схема БД удаляется и создается заново."
+    )
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument(
+        "--sizes", default=DEFAULT_SIZES,
+        help="Размеры наборов заметок для сценариев списков"
+    )
+    parser.add_argument(
+        "--scenario", action="append", default=[],
+        help="Запустить только сценарии с этим префиксом (можно повторять)"
+    )
+    parser.add_argument(
+        "--cache", choices=("memory", "none"), default="memory",
+        help="Кеш чтения заметок на время прогона"
+    )
+    parser.add_argument("--save", type=Path, help="Сохранить результаты")
+    parser.add_argument(
+        "--compare", type=Path, help="Сравнить с базовыми результатами"
+    )
+    parser.add_argument(
+        "--metric", choices=LATENCY_METRICS, default="p95",
+        help="Метрика для проверки регрессий"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.2,
+        help="Допустимый относительный рост метрики (0.2 = 20%%)"
+    )
+    parser.add_argument(
+        "--min-delta", type=float, default=1.0,
+        help="Минимальный значимый рост метрики, мс"
+    )
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Заполняет БД, выполняет сценарии и возвращает результаты прогона.
+    """
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    results: Dict[str, Dict[str, float]] = {}
+    async with bench_client(args.dsn, args.cache) as (engine, client):
+        await seed_database(engine, sizes)
+        context = await authenticate(client, sizes)
+        for scenario in all_scenarios(sizes):
+            if args.scenario and not any(
+                scenario.name.startswith(prefix) for prefix in args.scenario
+            ):
+                continue
+            result = await run_scenario(
+                client, scenario, context,
+                iterations=args.iterations,
+                concurrency=args.concurrency,
+                warmup=args.warmup,
+            )
+            results[scenario.name] = result.to_dict()
+            print(format_row(scenario.name, results[scenario.name]))
+        dialect = engine.dialect.name
+
+    return {
+        "meta": {
+            "dialect": dialect,
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+            "sizes": sizes,
+            "cache": args.cache,
+            "python": platform.python_version(),
+            "timestamp": int(time.time()),
+        },
+        "scenarios": results,
+    }
+
+
+def format_row(name: str, result: Dict[str, float]) -> str:
+    return (
+        f"{name:<24} {result['throughput']:>9.1f} req/s  "
+        f"p50 {result['p50']:>8.2f}ms  p95 {result['p95']:>8.2f}ms  "
+        f"p99 {result['p99']:>8.2f}ms  errors {result['errors']}"
+    )
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare_results(
+            baseline["scenarios"], report["scenarios"],
+            metric=args.metric,
+            threshold=args.threshold,
+            min_delta=args.min_delta,
+        )
+        if regressions:
+            print("Regressions:", *regressions, sep="\n  ")
+            return 1
+        print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
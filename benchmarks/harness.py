@@ -0,0 +1,171 @@
+import asyncio
+import math
+import statistics
+import time
+from dataclasses import dataclass, field
+
+from httpx import AsyncClient, Response
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+RequestFn = Callable[[AsyncClient, Dict[str, Any], int], Awaitable[Response]]
+SetupFn = Callable[[AsyncClient, Dict[str, Any], int], Awaitable[None]]
+
+# Метрики результата, по которым сравниваются прогоны
+LATENCY_METRICS = ("mean", "p50", "p95", "p99")
+
+
+@dataclass
+class Scenario:
+    """
+    Сценарий нагрузки: одна операция API, выполняемая многократно.
+
+    request получает клиент, общий контекст прогона и номер итерации;
+    setup (необязательно) подготавливает данные перед прогоном.
+    """
+    name: str
+    request: RequestFn
+    expected_status: tuple = (200,)
+    setup: Optional[SetupFn] = None
+
+
+@dataclass
+class ScenarioResult:
+    """Результат прогона сценария; задержки в миллисекундах."""
+    name: str
+    requests: int
+    errors: int
+    duration: float
+    latencies: List[float] = field(default_factory=list, repr=False)
+
+    @property
+    def throughput(self) -> float:
+        """Успешные запросы в секунду."""
+        if not self.duration:
+            return 0.0
+        return (self.requests - self.errors) / self.duration
+
+    def to_dict(self) -> Dict[str, float]:
+        latencies = sorted(self.latencies)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "duration": round(self.duration, 4),
+            "throughput": round(self.throughput, 2),
+            "mean": round(statistics.fmean(latencies), 3)
+            if latencies else 0.0,
+            "p50": round(percentile(latencies, 50), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "p99": round(percentile(latencies, 99), 3),
+        }
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """
+    Перцентиль методом ближайшего ранга по отсортированной выборке.
+
+    Аргументы:
+        sorted_values (List[float]): Отсортированные значения.
+        q (float): Перцентиль от 0 до 100.
+
+    Возвращает:
+        float: Значение перцентиля или 0 для пустой выборки.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def run_scenario(
+    client: AsyncClient,
+    scenario: Scenario,
+    context: Dict[str, Any],
+    iterations: int,
+    concurrency: int = 1,
+    warmup: int = 0,
+) -> ScenarioResult:
+    """
+    Выполняет сценарий заданное число раз с ограниченным параллелизмом.
+
+    Итерации прогрева выполняются до замера и в результат не входят.
+    Ответ со статусом вне expected_status считается ошибкой, его
+    задержка в перцентили не включается.
+
+    Аргументы:
+        client (AsyncClient): Клиент, подключенный к приложению.
+        scenario (Scenario): Сценарий.
+        context (Dict[str, Any]): Общие данные прогона (токены, id).
+        iterations (int): Количество замеряемых итераций.
+        concurrency (int): Количество одновременных запросов.
+        warmup (int): Количество итераций прогрева.
+
+    Возвращает:
+        ScenarioResult: Задержки, ошибки и общая длительность.
+    """
+    if scenario.setup is not None:
+        await scenario.setup(client, context, warmup + iterations)
+
+    for i in range(warmup):
+        await scenario.request(client, context, i)
+
+    result = ScenarioResult(scenario.name, iterations, 0, 0.0)
+    counter = iter(range(warmup, warmup + iterations))
+
+    async def worker() -> None:
+        for i in counter:
+            start = time.perf_counter()
+            response = await scenario.request(client, context, i)
+            elapsed = (time.perf_counter() - start) * 1000
+            if response.status_code in scenario.expected_status:
+                result.latencies.append(elapsed)
+            else:
+                result.errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    result.duration = time.perf_counter() - start
+    return result
+
+
+def compare_results(
+    baseline: Dict[str, Dict[str, float]],
+    current: Dict[str, Dict[str, float]],
+    metric: str = "p95",
+    threshold: float = 0.2,
+    min_delta: float = 1.0,
+) -> List[str]:
+    """
+    Сравнивает результаты прогона с базовыми и находит регрессии.
+
+    Регрессией считается рост метрики более чем на threshold (доля)
+    и одновременно более чем на min_delta миллисекунд — это отсекает
+    шум на очень быстрых операциях. Появление ошибок там, где в базовом
+    прогоне их не было, тоже считается регрессией. Сценарии,
+    отсутствующие в одном из прогонов, не сравниваются.
+
+    Аргументы:
+        baseline (dict): Результаты базового прогона по сценариям.
+        current (dict): Результаты текущего прогона по сценариям.
+        metric (str): Сравниваемая метрика задержки.
+        threshold (float): Допустимый относительный рост.
+        min_delta (float): Минимальный значимый рост, мс.
+
+    Возвращает:
+        List[str]: Описания регрессий; пустой список, если их нет.
+    """
+    regressions = []
+    for name, result in current.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["errors"] and not base["errors"]:
+            regressions.append(f"{name}: {result['errors']} errors")
+        before, after = base[metric], result[metric]
+        if after > before * (1 + threshold) and after - before > min_delta:
+            regressions.append(
+                f"{name}: {metric} {before:.3f}ms -> {after:.3f}ms "
+                f"(+{(after / before - 1) * 100 if before else math.inf:.0f}%)"
+            )
+    return regressions
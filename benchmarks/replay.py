@@ -0,0 +1,369 @@
+"""
+Воспроизведение записанного трафика (REQUEST_CAPTURE) против приложения.
+
+Пример:
+    python -m benchmarks.replay requests.jsonl --speed 2
+    python -m benchmarks.replay requests.jsonl --speed 0 --concurrency 32
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import re
+import sys
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from httpx import AsyncClient, Response
+from sqlalchemy import select
+
+from app.core.config import BATCH_MAX_ITEMS
+from app.db.models import Note
+from app.middleware.request_middleware import UNMATCHED_ROUTE
+
+from benchmarks.harness import percentile
+from benchmarks.scenarios import (
+    ADMIN_PASSWORD, PASSWORD, bench_client, seed_database, seed_users, token
+)
+
+from typing import Any, Dict, Iterable, List
+
+
+# Примерный размер одного элемента пакетного запроса в байтах
+BATCH_ITEM_BYTES = 60
+# Подстановка для параметров запроса, значения которых не записываются
+QUERY_PLACEHOLDERS = {"q": "note"}
+_PATH_PARAM = re.compile(r"\{(\w+)\}")
+
+
+@dataclass
+class ReplayResult:
+    """Задержки (мс) и ошибки воспроизведения по маршрутам."""
+    latencies: Dict[str, List[float]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    errors: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    mismatches: Dict[str, int] = field(
+        default_factory=lambda: defaultdict(int)
+    )
+    # Записи маршрутов с параметрами пути, которые нечем заполнить
+    skipped: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    # Опоздание запуска запроса относительно расписания, мс
+    lag: List[float] = field(default_factory=list)
+    duration: float = 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        routes = {}
+        for key in sorted(self.latencies.keys() | self.errors.keys()):
+            latencies = sorted(self.latencies[key])
+            routes[key] = {
+                "requests": len(latencies) + self.errors[key],
+                "errors": self.errors[key],
+                "status_mismatches": self.mismatches[key],
+                "p50": round(percentile(latencies, 50), 3),
+                "p95": round(percentile(latencies, 95), 3),
+                "p99": round(percentile(latencies, 99), 3),
+            }
+        total = sum(route["requests"] for route in routes.values())
+        lag = sorted(self.lag)
+        return {
+            "requests": total,
+            "duration": round(self.duration, 3),
+            "throughput": round(total / self.duration, 2)
+            if self.duration else 0.0,
+            "lag_p95": round(percentile(lag, 95), 3),
+            "routes": routes,
+            "skipped": dict(sorted(self.skipped.items())),
+        }
+
+
+def load_records(path: Path) -> List[Dict[str, Any]]:
+    """
+    Читает записи трафика, пропуская поврежденные строки и запросы
+    без найденного маршрута, и сортирует их по времени.
+    """
+    records = []
+    with path.open(encoding="utf-8") as stream:
+        for line in stream:
+            try:
+                record = json.loads(line)
+                if record["route"] != UNMATCHED_ROUTE:
+                    records.append(record)
+            except (ValueError, KeyError, TypeError):
+                continue
+    records.sort(key=lambda record: record["ts"])
+    return records
+
+
+class TrafficMapper:
+    """
+    Превращает обезличенную запись в конкретный запрос к данным прогона.
+
+    Каждому псевдониму пользователя из записи ставится в соответствие
+    один из пользователей прогона; параметры пути заполняются id его
+    заметок, тела запросов генерируются по размеру исходного тела.
+    """
+    def __init__(
+        self,
+        users: Dict[str, Dict[str, Any]],
+        admin_headers: dict,
+        user_ids: Dict[str, int],
+    ):
+        """
+        Аргументы:
+            users (dict): Пользователи прогона: заголовки и id заметок.
+            admin_headers (dict): Заголовки авторизации администратора.
+            user_ids (dict): id пользователей прогона по имени.
+        """
+        self.users = users
+        self.admin_headers = admin_headers
+        self.user_ids = list(user_ids.values())
+        self._assigned: Dict[str | None, str] = {}
+        self._names = itertools.cycle(sorted(users))
+        self._run = uuid.uuid4().hex[:6]
+        self._counter = itertools.count()
+
+    def _user(self, alias: str | None) -> str:
+        if alias not in self._assigned:
+            self._assigned[alias] = next(self._names)
+        return self._assigned[alias]
+
+    def request(self, record: Dict[str, Any]) -> Dict[str, Any] | None:
+        """
+        Возвращает аргументы client.request для записи или None, если
+        параметры пути маршрута заполнить нечем.
+        """
+        route: str = record["route"]
+        method: str = record["method"]
+        size = int(record.get("request_bytes", 0))
+        name = self._user(record.get("user"))
+        user = self.users[name]
+        note_ids: List[int] = user["note_ids"]
+
+        if route == "/token":
+            return {"method": method, "url": route, "data": {
+                "username": name, "password": PASSWORD
+            }}
+        if route == "/register":
+            return {"method": method, "url": route, "json": {
+                "username": f"rp{self._run}{next(self._counter)}",
+                "password": PASSWORD,
+                "role": "user",
+            }}
+
+        params = {
+            key: value if value is not None else QUERY_PLACEHOLDERS[key]
+            for key, value in record.get("query", {}).items()
+            if value is not None or key in QUERY_PLACEHOLDERS
+        }
+        values = {
+            "note_id": lambda: random.choice(note_ids),
+            "user_id": lambda: random.choice(self.user_ids),
+            # Ревизия 1 сохраняется при создании заметки через API
+            "version": lambda: 1,
+        }
+        if not set(_PATH_PARAM.findall(route)) <= values.keys():
+            return None
+        url = _PATH_PARAM.sub(lambda m: str(values[m.group(1)]()), route)
+        admin = route.startswith(("/admin", "/api/v1/admin", "/metrics"))
+        headers = self.admin_headers if admin else user["headers"]
+        if record.get("user") is None and not admin:
+            headers = {}
+
+        request: Dict[str, Any] = {
+            "method": method, "url": url, "params": params,
+            "headers": headers,
+        }
+        body = self._body(method, route, size, note_ids)
+        if body is not None:
+            request["json"] = body
+        return request
+
+    @staticmethod
+    def _body(
+        method: str, route: str, size: int, note_ids: List[int]
+    ) -> Any:
+        if size <= 0:
+            return None
+        items = max(1, min(BATCH_MAX_ITEMS, size // BATCH_ITEM_BYTES))
+        if route.endswith("/batch") and method == "POST":
+            return {"items": [
+                {"title": "Replay", "body": "Replay body"}
+                for _ in range(items)
+            ]}
+        if route.endswith("/batch") and method == "PATCH":
+            return {"items": [
+                {"id": note_id, "title": "Replay"}
+                for note_id in random.sample(
+                    note_ids, min(items, len(note_ids))
+                )
+            ]}
+        if route.endswith("/batch") or route.endswith("/batch/restore"):
+            return {"ids": random.sample(note_ids, min(items, len(note_ids)))}
+        # Создание и изменение заметки: тело примерно исходного размера
+        return {"title": "Replay", "body": "x" * max(1, size - 30)}
+
+
+async def replay(
+    client: AsyncClient,
+    records: Iterable[Dict[str, Any]],
+    mapper: TrafficMapper,
+    speed: float = 1.0,
+    concurrency: int = 64,
+) -> ReplayResult:
+    """
+    Воспроизводит записи с исходными интервалами, ускоренными в speed раз.
+
+    При speed=0 запросы выполняются без пауз, не более concurrency
+    одновременно. Ошибкой считается статус 5xx; расхождение статуса
+    с записанным учитывается отдельно (например, 404 на удаленную
+    при воспроизведении заметку).
+
+    Аргументы:
+        client (AsyncClient): Клиент приложения.
+        records (Iterable[dict]): Записи трафика, упорядоченные по времени.
+        mapper (TrafficMapper): Построитель конкретных запросов.
+        speed (float): Множитель скорости; 0 — без пауз.
+        concurrency (int): Предел одновременных запросов.
+
+    Возвращает:
+        ReplayResult: Задержки и ошибки по маршрутам.
+    """
+    records = list(records)
+    result = ReplayResult()
+    if not records:
+        return result
+    semaphore = asyncio.Semaphore(concurrency)
+    first_ts = records[0]["ts"]
+    start = time.perf_counter()
+
+    async def issue(record: Dict[str, Any]) -> None:
+        due = (record["ts"] - first_ts) / speed if speed > 0 else 0.0
+        delay = due - (time.perf_counter() - start)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        async with semaphore:
+            if speed > 0:
+                lag = (time.perf_counter() - start - due) * 1000
+                result.lag.append(max(0.0, lag))
+            key = f"{record['method']} {record['route']}"
+            request = mapper.request(record)
+            if request is None:
+                if not result.skipped[key]:
+                    print(
+                        f"Skipping {key}: unknown path parameters",
+                        file=sys.stderr
+                    )
+                result.skipped[key] += 1
+                return
+            request_start = time.perf_counter()
+            try:
+                response: Response = await client.request(**request)
+            except Exception:
+                result.errors[key] += 1
+                return
+            elapsed = (time.perf_counter() - request_start) * 1000
+            if response.status_code >= 500:
+                result.errors[key] += 1
+                return
+            result.latencies[key].append(elapsed)
+            if response.status_code != record.get("status"):
+                result.mismatches[key] += 1
+
+    await asyncio.gather(*(issue(record) for record in records))
+    result.duration = time.perf_counter() - start
+    return result
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.replay",
+        description="Воспроизведение трафика, записанного REQUEST_CAPTURE."
+    )
+    parser.add_argument("capture", type=Path, help="Файл JSONL с трафиком")
+    parser.add_argument(
+        "--speed", type=float, default=1.0,
+        help="Множитель скорости (2 — вдвое быстрее, 0 — без пауз)"
+    )
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument(
+        "--users", type=int, default=20,
+        help="Количество пользователей прогона"
+    )
+    parser.add_argument(
+        "--notes", type=int, default=200,
+        help="Количество заметок у каждого пользователя прогона"
+    )
+    parser.add_argument(
+        "--dsn", help="URL БД (схема пересоздается; по умолчанию SQLite)"
+    )
+    parser.add_argument(
+        "--cache", choices=("memory", "none"), default="memory"
+    )
+    parser.add_argument("--save", type=Path, help="Сохранить отчет в JSON")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    records = load_records(args.capture)
+    aliases = {record.get("user") for record in records}
+    count = max(1, min(args.users, len(aliases)))
+    names = [f"replay_{n}" for n in range(count)]
+    async with bench_client(args.dsn, args.cache) as (engine, client):
+        await seed_database(engine, [])
+        async with engine.begin() as conn:
+            user_ids = await seed_users(conn, names, notes=args.notes)
+            rows = await conn.execute(select(Note.user_id, Note.id))
+            notes_by_user: Dict[int, List[int]] = defaultdict(list)
+            for user_id, note_id in rows:
+                notes_by_user[user_id].append(note_id)
+        users = {
+            name: {
+                "headers": await token(client, name, PASSWORD),
+                "note_ids": notes_by_user[user_id] or [0],
+            }
+            for name, user_id in user_ids.items()
+        }
+        mapper = TrafficMapper(
+            users, await token(client, "admin", ADMIN_PASSWORD), user_ids
+        )
+        result = await replay(
+            client, records, mapper, args.speed, args.concurrency
+        )
+    return result.summary()
+
+
+def format_report(summary: Dict[str, Any]) -> List[str]:
+    lines = [
+        f"{summary['requests']} requests in {summary['duration']}s "
+        f"({summary['throughput']} req/s), "
+        f"schedule lag p95 {summary['lag_p95']}ms"
+    ]
+    routes: Dict[str, Dict[str, Any]] = summary["routes"]
+    for key, route in routes.items():
+        lines.append(
+            f"{key:<48} n={route['requests']:<6} "
+            f"p50 {route['p50']:>8.2f}ms  p95 {route['p95']:>8.2f}ms  "
+            f"p99 {route['p99']:>8.2f}ms  errors {route['errors']}  "
+            f"mismatches {route['status_mismatches']}"
+        )
+    for key, count in summary.get("skipped", {}).items():
+        lines.append(f"{key:<48} n={count:<6} skipped")
+    return lines
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = parse_args(argv)
+    summary = asyncio.run(run(args))
+    print(*format_report(summary), sep="\n")
+    if args.save:
+        args.save.write_text(json.dumps(summary, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Объем хранения истории ревизий (полные копии через интервал и дельты
+между ними) в сравнении с полной копией на каждое изменение, а также
+время восстановления ревизии с самой длинной цепочкой дельт.
+
+Пример:
+    python -m benchmarks.revisions --lines 400 --edits 500
+"""
+import argparse
+import random
+import sys
+import time
+
+from app.core.config import (
+    REVISION_MAX_DELTA_RATIO, REVISION_SNAPSHOT_INTERVAL
+)
+from app.core.delta import apply_delta, encode_revision
+
+from typing import Any, Dict, List, Tuple
+
+
+WORDS = (
+    "note", "draft", "meeting", "project", "deadline", "review", "budget",
+    "release", "customer", "feature", "issue", "summary", "plan", "idea",
+)
+
+
+def _line(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 14)))
+
+
+def edit(rng: random.Random, body: str) -> str:
+    """
+    Типичная правка: изменение слова в строке, вставка, удаление
+    или добавление строк в конец.
+    """
+    lines = body.split("\n")
+    index = rng.randrange(len(lines))
+    kind = rng.random()
+    if kind < 0.5:
+        words = lines[index].split(" ")
+        words[rng.randrange(len(words))] = rng.choice(WORDS)
+        lines[index] = " ".join(words)
+    elif kind < 0.7:
+        lines.insert(index, _line(rng))
+    elif kind < 0.8 and len(lines) > 1:
+        del lines[index]
+    else:
+        lines.extend(_line(rng) for _ in range(rng.randint(1, 3)))
+    return "\n".join(lines)
+
+
+def run(
+    lines: int,
+    edits: int,
+    interval: int,
+    max_ratio: float,
+    seed: int = 0
+) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    body = "\n".join(_line(rng) for _ in range(lines))
+    texts = [body]
+    # (полная копия, данные) для каждой ревизии
+    stored: List[Tuple[bool, str]] = [(True, body)]
+    depth = 0
+    for _ in range(edits):
+        new = edit(rng, texts[-1])
+        is_snapshot, data, depth = encode_revision(
+            texts[-1], new, depth, interval, max_ratio
+        )
+        stored.append((is_snapshot, data))
+        texts.append(new)
+
+    # Восстановление каждой ревизии от ближайшей полной копии
+    worst = 0.0
+    for index, expected in enumerate(texts):
+        start = index
+        while not stored[start][0]:
+            start -= 1
+        started = time.perf_counter()
+        text = stored[start][1]
+        for _, delta in stored[start + 1:index + 1]:
+            text = apply_delta(text, delta)
+        worst = max(worst, time.perf_counter() - started)
+        assert text == expected
+
+    delta_bytes = sum(len(data.encode()) for _, data in stored)
+    full_bytes = sum(len(text.encode()) for text in texts)
+    return {
+        "revisions": len(stored),
+        "snapshots": sum(1 for is_snapshot, _ in stored if is_snapshot),
+        "body_bytes": len(texts[-1].encode()),
+        "delta_bytes_per_edit": delta_bytes / len(stored),
+        "full_bytes_per_edit": full_bytes / len(stored),
+        "ratio": delta_bytes / full_bytes,
+        "worst_rebuild_ms": worst * 1000,
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.revisions")
+    parser.add_argument("--lines", type=int, default=400)
+    parser.add_argument("--edits", type=int, default=500)
+    parser.add_argument(
+        "--interval", type=int, default=REVISION_SNAPSHOT_INTERVAL
+    )
+    parser.add_argument(
+        "--ratio", type=float, default=REVISION_MAX_DELTA_RATIO
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    result = run(args.lines, args.edits, args.interval, args.ratio, args.seed)
+    print(
+        f"{result['revisions']} revisions, {result['snapshots']} snapshots, "
+        f"final body {result['body_bytes']}B"
+    )
+    print(
+        f"stored per edit: snapshots+deltas "
+        f"{result['delta_bytes_per_edit']:.0f}B, full copies "
+        f"{result['full_bytes_per_edit']:.0f}B "
+        f"({result['ratio']:.1%} of full copies)"
+    )
+    print(f"worst revision rebuild {result['worst_rebuild_ms']:.2f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,344 @@
+import tempfile
+import uuid
+from contextlib import asynccontextmanager
+
+from fastapi import Depends
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection, AsyncEngine, AsyncSession, async_sessionmaker,
+    create_async_engine
+)
+
+from app.core import admission
+from app.core.config import BATCH_MAX_ITEMS
+from app.core.security import get_password_hash
+from app.db.models import Base, Note, User
+from app.api.v1.endpoints.notes import (
+    get_note_service, get_read_note_service
+)
+from app.db.session import engine_options, get_db, get_read_db
+from app.main import app
+from app.services.note import NoteService
+from app.services.note_cache import NoteCache, build_note_cache
+
+from benchmarks.harness import Scenario
+
+from typing import Any, AsyncIterator, Dict, Iterable, List, Tuple
+
+
+PASSWORD = "benchpass"
+ADMIN_PASSWORD = "adminpass"
+# Размер страницы в сценариях списков
+PAGE_SIZE = 50
+# Размер пачки при заполнении БД
+SEED_CHUNK = 1000
+
+
+def dataset_user(size: int) -> str:
+    return f"bench_{size}"
+
+
+async def insert_notes(
+    conn: AsyncConnection, user_id: int, count: int
+) -> None:
+    """Добавляет пользователю count заметок пачками по SEED_CHUNK."""
+    for start in range(0, count, SEED_CHUNK):
+        await conn.execute(insert(Note), [
+            {
+                "title": f"Note {n}",
+                "body": f"Benchmark note {n} body " * 8,
+                "user_id": user_id,
+            }
+            for n in range(start, min(start + SEED_CHUNK, count))
+        ])
+
+
+async def seed_users(
+    conn: AsyncConnection, usernames: Iterable[str], notes: int = 0
+) -> Dict[str, int]:
+    """
+    Создает пользователей с паролем PASSWORD и заметками.
+
+    Возвращает:
+        Dict[str, int]: id пользователей по имени.
+    """
+    usernames = list(usernames)
+    if not usernames:
+        return {}
+    # Хеш вычисляется один раз: bcrypt намеренно медленный
+    password = get_password_hash(PASSWORD)
+    await conn.execute(insert(User), [
+        {"username": name, "password": password, "role": "user"}
+        for name in usernames
+    ])
+    rows = await conn.execute(
+        select(User.username, User.id).where(User.username.in_(usernames))
+    )
+    user_ids = dict(rows.all())
+    for user_id in user_ids.values():
+        await insert_notes(conn, user_id, notes)
+    return user_ids
+
+
+async def seed_database(engine: AsyncEngine, sizes: Iterable[int]) -> None:
+    """
+    Пересоздает схему и заполняет БД данными для сценариев.
+
+    Создаются администратор, пользователи для входа и CRUD-сценариев
+    и по одному пользователю на каждый размер набора данных с
+    соответствующим числом заметок. Все данные в БД удаляются.
+
+    Аргументы:
+        engine (AsyncEngine): Движок БД для прогона.
+        sizes (Iterable[int]): Размеры наборов заметок.
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User).values(
+            username="admin",
+            password=get_password_hash(ADMIN_PASSWORD),
+            role="admin",
+        ))
+        await seed_users(conn, ["bench_login", "bench_crud"])
+        for size in sizes:
+            await seed_users(conn, [dataset_user(size)], notes=size)
+
+
+def note_service_override(cache: NoteCache | None):
+    """
+    Зависимость NoteService с кешем прогона вместо глобального.
+
+    Отдельный кеш не дает данным прошлых прогонов (или тестов) в том
+    же процессе попасть в результаты.
+    """
+    def _get_note_service(db: AsyncSession = Depends(get_db)) -> NoteService:
+        return NoteService(db, cache)
+    return _get_note_service
+
+
+@asynccontextmanager
+async def bench_client(
+    dsn: str | None = None, cache: str = "memory"
+) -> AsyncIterator[Tuple[AsyncEngine, AsyncClient]]:
+    """
+    Подключает приложение к отдельной БД прогона и открывает клиент.
+
+    Без dsn используется временный файл SQLite. Зависимости приложения
+    (сессия БД, сервис заметок) переопределяются на время прогона
+    и восстанавливаются после него; контроль допуска на время прогона
+    отключается, чтобы измерять обработку, а не отказы.
+
+    Аргументы:
+        dsn (str | None): URL БД прогона.
+        cache (str): Кеш чтения заметок: "memory" или "none".
+
+    Возвращает:
+        Tuple[AsyncEngine, AsyncClient]: Движок БД прогона и клиент.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        url, options = engine_options(
+            dsn or f"sqlite+aiosqlite:///{tmp}/bench.db"
+        )
+        engine = create_async_engine(url, **options)
+        session_factory = async_sessionmaker(
+            bind=engine, expire_on_commit=False
+        )
+
+        async def _get_db():
+            async with session_factory() as session:
+                yield session
+
+        overrides = dict(app.dependency_overrides)
+        controller = admission.admission_controller
+        admission.admission_controller = None
+        service = note_service_override(build_note_cache(cache))
+        app.dependency_overrides[get_db] = _get_db
+        app.dependency_overrides[get_read_db] = _get_db
+        app.dependency_overrides[get_note_service] = service
+        app.dependency_overrides[get_read_note_service] = service
+        try:
+            async with AsyncClient(
+                transport=ASGITransport(app=app),
+                base_url="http://bench"
+            ) as client:
+                yield engine, client
+        finally:
+            app.dependency_overrides.clear()
+            app.dependency_overrides.update(overrides)
+            admission.admission_controller = controller
+            await engine.dispose()
+
+
+async def token(client: AsyncClient, username: str, password: str) -> dict:
+    response = await client.post(
+        "/token", data={"username": username, "password": password}
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def authenticate(
+    client: AsyncClient, sizes: Iterable[int]
+) -> Dict[str, Any]:
+    """
+    Получает токены пользователей прогона.
+
+    Возвращает:
+        Dict[str, Any]: Контекст прогона с заголовками авторизации.
+    """
+    context: Dict[str, Any] = {
+        "run": uuid.uuid4().hex[:6],
+        "admin": await token(client, "admin", ADMIN_PASSWORD),
+        "crud": await token(client, "bench_crud", PASSWORD),
+    }
+    for size in sizes:
+        context[dataset_user(size)] = await token(
+            client, dataset_user(size), PASSWORD
+        )
+    return context
+
+
+async def _create_notes(
+    client: AsyncClient, headers: dict, count: int
+) -> List[int]:
+    ids: List[int] = []
+    while len(ids) < count:
+        chunk = min(BATCH_MAX_ITEMS, count - len(ids))
+        response = await client.post(
+            "/api/v1/notes/batch",
+            json={"items": [
+                {"title": f"Crud {n}", "body": "Benchmark body"}
+                for n in range(chunk)
+            ]},
+            headers=headers
+        )
+        response.raise_for_status()
+        ids.extend(item["id"] for item in response.json()["results"])
+    return ids
+
+
+def auth_scenarios() -> List[Scenario]:
+    async def login(client, ctx, i):
+        return await client.post(
+            "/token", data={"username": "bench_login", "password": PASSWORD}
+        )
+
+    async def register(client, ctx, i):
+        return await client.post("/register", json={
+            "username": f"br{ctx['run']}{i}",
+            "password": PASSWORD,
+            "role": "user",
+        })
+
+    return [
+        Scenario("login", login),
+        Scenario("register", register, expected_status=(200, 201)),
+    ]
+
+
+def crud_scenarios() -> List[Scenario]:
+    async def setup_notes(client, ctx, count):
+        if "crud_ids" not in ctx:
+            ctx["crud_ids"] = await _create_notes(
+                client, ctx["crud"], min(count, 100)
+            )
+
+    async def setup_delete(client, ctx, count):
+        ctx["delete_ids"] = await _create_notes(client, ctx["crud"], count)
+
+    async def create(client, ctx, i):
+        return await client.post(
+            "/api/v1/notes/",
+            json={"title": f"Note {i}", "body": "Benchmark body"},
+            headers=ctx["crud"]
+        )
+
+    async def get(client, ctx, i):
+        ids = ctx["crud_ids"]
+        return await client.get(
+            f"/api/v1/notes/{ids[i % len(ids)]}", headers=ctx["crud"]
+        )
+
+    async def update(client, ctx, i):
+        ids = ctx["crud_ids"]
+        return await client.put(
+            f"/api/v1/notes/{ids[i % len(ids)]}",
+            json={"title": f"Updated {i}", "body": "Updated body"},
+            headers=ctx["crud"]
+        )
+
+    async def delete(client, ctx, i):
+        return await client.delete(
+            f"/api/v1/notes/{ctx['delete_ids'][i]}", headers=ctx["crud"]
+        )
+
+    return [
+        Scenario("note_create", create),
+        Scenario("note_get", get, setup=setup_notes),
+        Scenario("note_update", update, setup=setup_notes),
+        Scenario("note_delete", delete, setup=setup_delete),
+    ]
+
+
+def list_scenarios(sizes: Iterable[int]) -> List[Scenario]:
+    scenarios = []
+    for size in sizes:
+        user = dataset_user(size)
+
+        # Курсоры всех страниц: запросы идут на разную глубину списка
+        async def setup(client, ctx, count, user=user):
+            cursors: List[str | None] = [None]
+            while True:
+                response = await client.get(
+                    "/api/v1/notes/",
+                    params={"limit": PAGE_SIZE, "cursor": cursors[-1]}
+                    if cursors[-1] else {"limit": PAGE_SIZE},
+                    headers=ctx[user]
+                )
+                cursor = response.headers.get("X-Next-Cursor")
+                if not cursor:
+                    break
+                cursors.append(cursor)
+            ctx[f"{user}_cursors"] = cursors
+
+        async def page(client, ctx, i, user=user):
+            cursors = ctx[f"{user}_cursors"]
+            cursor = cursors[i % len(cursors)]
+            params: Dict[str, Any] = {"limit": PAGE_SIZE}
+            if cursor:
+                params["cursor"] = cursor
+            return await client.get(
+                "/api/v1/notes/", params=params, headers=ctx[user]
+            )
+
+        scenarios.append(Scenario(f"list_notes[{size}]", page, setup=setup))
+    return scenarios
+
+
+def admin_scenarios() -> List[Scenario]:
+    async def users(client, ctx, i):
+        return await client.get(
+            "/admin/users/", params={"limit": 100}, headers=ctx["admin"]
+        )
+
+    async def notes(client, ctx, i):
+        return await client.get(
+            "/api/v1/admin/notes/", params={"limit": 100}, headers=ctx["admin"]
+        )
+
+    return [
+        Scenario("admin_users", users),
+        Scenario("admin_notes", notes),
+    ]
+
+
+def all_scenarios(sizes: Iterable[int]) -> List[Scenario]:
+    sizes = list(sizes)
+    return (
+        auth_scenarios()
+        + crud_scenarios()
+        + list_scenarios(sizes)
+        + admin_scenarios()
+    )
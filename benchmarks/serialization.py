@@ -0,0 +1,110 @@
+"""
+Сравнение путей сериализации списка заметок: ORM-объекты с валидацией
+через NoteResponse (как FastAPI с response_model) и строки колонок с
+прямой сериализацией в байты.
+
+Пример:
+    python -m benchmarks.serialization --notes 10000
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Note
+from app.schemas.note import NoteResponse, NoteRow
+from app.core.serialization import dumps
+
+from benchmarks.scenarios import bench_client, dataset_user, seed_database
+
+from typing import Any, Awaitable, Callable, Dict, List
+
+
+_NOTE_LIST = TypeAdapter(List[NoteResponse])
+_ROW_COLUMNS = tuple(getattr(Note, field) for field in NoteRow._fields)
+
+
+async def orm_path(session: AsyncSession, limit: int) -> bytes:
+    notes = (await session.execute(
+        select(Note).order_by(Note.id).limit(limit)
+    )).scalars().all()
+    # Как FastAPI: валидация response_model, jsonable_encoder, json.dumps
+    content = jsonable_encoder(_NOTE_LIST.validate_python(
+        notes, from_attributes=True
+    ))
+    session.expunge_all()
+    return json.dumps(
+        content, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+async def row_path(session: AsyncSession, limit: int) -> bytes:
+    rows = (await session.execute(
+        select(*_ROW_COLUMNS).order_by(Note.id).limit(limit)
+    )).all()
+    return dumps([row._asdict() for row in rows])
+
+
+async def measure(
+    path: Callable[[AsyncSession, int], Awaitable[bytes]],
+    session: AsyncSession,
+    limit: int,
+    repeat: int,
+) -> Dict[str, Any]:
+    """
+    CPU-время на запрос (мс) и пиковая память одного запроса (КиБ).
+    """
+    body = await path(session, limit)
+    cpu_start = time.process_time()
+    for _ in range(repeat):
+        await path(session, limit)
+    cpu = (time.process_time() - cpu_start) / repeat * 1000
+
+    tracemalloc.start()
+    await path(session, limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "cpu_ms": round(cpu, 2),
+        "peak_kib": round(peak / 1024),
+        "bytes": len(body),
+    }
+
+
+async def run(notes: int, repeat: int) -> Dict[str, Dict[str, Any]]:
+    async with bench_client() as (engine, _):
+        await seed_database(engine, [notes])
+        async with AsyncSession(engine) as session:
+            return {
+                "orm_validate": await measure(
+                    orm_path, session, notes, repeat
+                ),
+                "rows_direct": await measure(
+                    row_path, session, notes, repeat
+                ),
+            }
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.serialization")
+    parser.add_argument("--notes", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args(argv)
+    print(f"{dataset_user(args.notes)}: {args.notes} notes per response")
+    for name, result in asyncio.run(run(args.notes, args.repeat)).items():
+        print(
+            f"{name:<14} cpu {result['cpu_ms']:>8.2f}ms/request  "
+            f"peak {result['peak_kib']:>7}KiB  body {result['bytes']}B"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,10 +2,13 @@ import pytest
 from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.future import select
 
 from app.main import app
-from app.db.models import Base
-from app.db.session import get_db
+from app.core import admission
+from app.db.models import Base, User
+from app.db.session import get_db, get_read_db
+from app.core.security import get_password_hash
 
 
 # Тестовая БД (SQLite для простоты)
@@ -26,6 +29,13 @@ async def prepare_database():
         await conn.run_sync(Base.metadata.drop_all)
 
 
+# Контроль допуска отключен: тесты отправляют много запросов подряд
+# с одного адреса (проверки лимитов — в test_admission.py)
+@pytest.fixture(autouse=True)
+def disable_admission(monkeypatch):
+    monkeypatch.setattr(admission, "admission_controller", None)
+
+
 # Фикстура для подключения к БД
 @pytest.fixture
 async def db_session():
@@ -37,8 +47,43 @@ async def db_session():
 @pytest.fixture
 async def client(db_session):
     app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_read_db] = lambda: db_session
     async with AsyncClient(
         transport=ASGITransport(app=app),
         base_url="http://testserver"
     ) as ac:
         yield ac
+
+
+# Фикстура для регистрации пользователя и получения заголовков авторизации
+@pytest.fixture
+def login(client):
+    async def _login(username: str, password: str = "testpass") -> dict:
+        await client.post(
+            "/register",
+            json={"username": username, "password": password, "role": "user"}
+        )
+        response = await client.post(
+            "/token", data={"username": username, "password": password}
+        )
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return _login
+
+
+# Фикстура для получения заголовков авторизации администратора
+@pytest.fixture
+async def admin_headers(client, db_session):
+    result = await db_session.execute(
+        select(User).where(User.username == "admin")
+    )
+    if result.scalars().first() is None:
+        db_session.add(User(
+            username="admin",
+            password=get_password_hash("adminpass"),
+            role="admin"
+        ))
+        await db_session.commit()
+    response = await client.post(
+        "/token", data={"username": "admin", "password": "adminpass"}
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
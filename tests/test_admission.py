@@ -0,0 +1,144 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core import admission
+from app.core.admission import (
+    AdmissionController, ConcurrencyLimiter, TokenBuckets
+)
+from app.middleware.admission_middleware import AdmissionMiddleware
+
+
+# Тест расхода и восполнения токенов
+def test_token_buckets():
+    buckets = TokenBuckets(rate=2, burst=2, max_keys=2)
+    assert buckets.take("a", now=0) == 0
+    assert buckets.take("a", now=0) == 0
+    assert buckets.take("a", now=0) == pytest.approx(0.5)
+    assert buckets.take("a", now=0.5) == 0
+    # Корзины ключей независимы, старые ключи вытесняются
+    assert buckets.take("b", now=0.5) == 0
+    assert buckets.take("c", now=0.5) == 0
+    assert len(buckets) == 2
+
+
+# Тест приоритета административных запросов в очереди
+@pytest.mark.asyncio
+async def test_limiter_prefers_priority_waiters():
+    limiter = ConcurrencyLimiter(
+        limit=2, reserved=1, queue_size=2, queue_timeout=1
+    )
+    assert await limiter.acquire()
+    # Обычным запросам доступно одно место, второе зарезервировано
+    assert await limiter.acquire(priority=True)
+
+    regular = asyncio.create_task(limiter.acquire())
+    priority = asyncio.create_task(limiter.acquire(priority=True))
+    await asyncio.sleep(0)
+    assert limiter.queued == 2
+
+    limiter.release()
+    assert await priority
+    assert not regular.done()
+    limiter.release()
+    limiter.release()
+    assert await regular
+    assert limiter.in_flight == 1
+
+
+def _slow_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow():
+        await asyncio.sleep(0.3)
+        return {"ok": True}
+
+    @app.get("/admin/slow")
+    async def admin_slow():
+        await asyncio.sleep(0.3)
+        return {"ok": True}
+
+    app.add_middleware(AdmissionMiddleware)
+    return app
+
+
+# Тест быстрого отказа при перегрузке и резерва для администратора
+@pytest.mark.asyncio
+async def test_overload_is_rejected_early(monkeypatch):
+    monkeypatch.setattr(admission, "admission_controller", AdmissionController(
+        max_concurrency=2, priority_reserved=1, queue_size=1,
+        queue_timeout=0.05, user_rate=0, ip_rate=0
+    ))
+    async with AsyncClient(
+        transport=ASGITransport(app=_slow_app()), base_url="http://test"
+    ) as client:
+        async def timed(path: str):
+            started = time.perf_counter()
+            response = await client.get(path)
+            return response, time.perf_counter() - started
+
+        results = await asyncio.gather(
+            timed("/slow"), timed("/slow"), timed("/slow"),
+            timed("/admin/slow")
+        )
+
+    statuses = sorted(response.status_code for response, _ in results)
+    assert statuses == [200, 200, 503, 503]
+    admin_response, _ = results[3]
+    assert admin_response.status_code == 200
+    for response, elapsed in results:
+        if response.status_code == 503:
+            assert response.headers["Retry-After"] == "1"
+            assert elapsed < 0.25
+    stats = admission.admission_controller.stats()
+    assert stats["in_flight"] == 0
+    assert stats["queued"] == 0
+
+
+# Тест ограничения частоты запросов пользователя
+@pytest.mark.asyncio
+async def test_user_rate_limit(client: AsyncClient, login, monkeypatch):
+    headers = await login("ratelimited")
+    other = await login("notlimited")
+    monkeypatch.setattr(admission, "admission_controller", AdmissionController(
+        user_rate=0.5, user_burst=2, ip_rate=0
+    ))
+
+    for _ in range(2):
+        response = await client.get("/api/v1/notes/", headers=headers)
+        assert response.status_code == 200
+    response = await client.get("/api/v1/notes/", headers=headers)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
+
+    response = await client.get("/api/v1/notes/", headers=other)
+    assert response.status_code == 200
+    # Проверки состояния не ограничиваются
+    for _ in range(3):
+        response = await client.get("/health/live")
+        assert response.status_code == 200
+
+
+# Тест ограничения частоты запросов без токена по IP
+@pytest.mark.asyncio
+async def test_ip_rate_limit(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(admission, "admission_controller", AdmissionController(
+        ip_rate=1, ip_burst=1
+    ))
+    data = {"username": "nobody", "password": "wrong"}
+    response = await client.post("/token", data=data)
+    assert response.status_code == 401
+    response = await client.post("/token", data=data)
+    assert response.status_code == 429
+    assert admission.admission_controller.stats()["rejected"]["ip_rate"] >= 1
+
+
+# Тест маршрутов потоков событий: вне лимита одновременных запросов
+def test_stream_paths():
+    controller = AdmissionController(stream_paths="/api/v1/events")
+    assert controller.is_stream("/api/v1/events")
+    assert not controller.is_stream("/api/v1/notes/")
@@ -0,0 +1,88 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+
+from app.db.models import Note, NoteArchive
+
+
+async def _create_deleted(client: AsyncClient, headers: dict, title: str):
+    created = await client.post(
+        "/api/v1/notes/", json={"title": title, "body": "Body"},
+        headers=headers
+    )
+    note_id = created.json()["id"]
+    await client.delete(f"/api/v1/notes/{note_id}", headers=headers)
+    return note_id
+
+
+# Тест архивации удаленных заметок и восстановления из архива
+@pytest.mark.asyncio
+async def test_archive_and_restore(
+    client: AsyncClient, login, admin_headers, db_session
+):
+    headers = await login("archiveuser")
+    note_id = await _create_deleted(client, headers, "Archived")
+    live = await client.post(
+        "/api/v1/notes/", json={"title": "Live", "body": "Body"},
+        headers=headers
+    )
+
+    # Срок хранения не истек: заметка остается в основной таблице
+    response = await client.post(
+        "/api/v1/admin/notes/archive", headers=admin_headers
+    )
+    assert response.json()["processed"] == 0
+
+    response = await client.post(
+        "/api/v1/admin/notes/archive",
+        params={"retention_days": 0},
+        headers=admin_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["processed"] >= 1
+    assert await db_session.get(Note, note_id) is None
+    assert await db_session.get(NoteArchive, note_id) is not None
+    assert await db_session.get(Note, live.json()["id"]) is not None
+
+    response = await client.post(
+        f"/api/v1/admin/notes/{note_id}/restore", headers=admin_headers
+    )
+    assert response.status_code == 200
+    db_session.expire_all()
+    assert await db_session.get(NoteArchive, note_id) is None
+
+    response = await client.get(f"/api/v1/notes/{note_id}", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["title"] == "Archived"
+
+    # Повторное восстановление: заметка уже не удалена
+    response = await client.post(
+        f"/api/v1/admin/notes/{note_id}/restore", headers=admin_headers
+    )
+    assert response.status_code == 404
+
+
+# Тест безвозвратного удаления
+@pytest.mark.asyncio
+async def test_purge(client: AsyncClient, login, admin_headers, db_session):
+    headers = await login("archiveuser")
+    note_id = await _create_deleted(client, headers, "Purged")
+    response = await client.post(
+        "/api/v1/admin/notes/archive",
+        params={"retention_days": 0, "mode": "purge"},
+        headers=admin_headers
+    )
+    assert response.json()["processed"] >= 1
+    assert await db_session.get(Note, note_id) is None
+    assert await db_session.get(NoteArchive, note_id) is None
+    deleted_left = await db_session.scalar(
+        select(func.count()).select_from(Note).where(
+            Note.is_deleted.is_(True)
+        )
+    )
+    assert deleted_left == 0
+
+    response = await client.post(
+        f"/api/v1/admin/notes/{note_id}/restore", headers=admin_headers
+    )
+    assert response.status_code == 404
@@ -1,4 +1,13 @@
+import asyncio
+import time
+
+import jwt
 import pytest
+from sqlalchemy import event
+
+from app.core.config import ALGORITHM, SECRET_KEY
+from app.core.revocation import RevocationList
+from tests.conftest import engine
 
 
 @pytest.mark.asyncio
@@ -24,3 +33,137 @@ async def test_login_user(client):
     })
     assert response.status_code == 200
     assert "access_token" in response.json()
+
+
+@pytest.mark.asyncio
+async def test_register_duplicate_user(client):
+    response = await client.post(
+        "/register",
+        json={"username": "testuser", "password": "other", "role": "user"}
+    )
+    assert response.status_code == 400
+
+
+# Тест авторизации по полям токена без запроса пользователя из БД
+@pytest.mark.asyncio
+async def test_claims_authorization_skips_user_lookup(client, login):
+    headers = await login("claimsuser")
+    token = headers["Authorization"].split()[1]
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    assert payload["sub"] == "claimsuser"
+    assert payload["role"] == "user"
+    assert {"uid", "iat", "exp"} <= payload.keys()
+
+    created = await client.post(
+        "/api/v1/notes/", json={"title": "T", "body": "B"}, headers=headers
+    )
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = await client.get(
+            f"/api/v1/notes/{created.json()['id']}", headers=headers
+        )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    assert not [s for s in statements if "user.username" in s]
+
+
+# Тест смены роли и отзыва токенов
+@pytest.mark.asyncio
+async def test_role_change_and_revoke(client, login, admin_headers):
+    headers = await login("promoted")
+    me = jwt.decode(
+        headers["Authorization"].split()[1], SECRET_KEY,
+        algorithms=[ALGORITHM]
+    )
+    response = await client.patch(
+        f"/admin/users/{me['uid']}/role", json={"role": "admin"},
+        headers=admin_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["role"] == "admin"
+
+    # Токен с прежней ролью отклоняется, новый содержит новую роль
+    response = await client.get("/api/v1/notes/", headers=headers)
+    assert response.status_code == 401
+    headers = await login("promoted")
+    response = await client.get("/admin/users/", headers=headers)
+    assert response.status_code == 200
+
+    response = await client.post(
+        f"/admin/users/{me['uid']}/revoke", headers=admin_headers
+    )
+    assert response.status_code == 200
+    response = await client.get("/admin/users/", headers=headers)
+    assert response.status_code == 401
+
+    response = await client.patch(
+        "/admin/users/999999/role", json={"role": "user"},
+        headers=admin_headers
+    )
+    assert response.status_code == 404
+
+
+# Тест загрузки списка отозванных токенов из БД (другой процесс)
+@pytest.mark.asyncio
+async def test_revocation_list_refresh(
+    client, login, admin_headers, db_session
+):
+    headers = await login("revoked")
+    uid = jwt.decode(
+        headers["Authorization"].split()[1], SECRET_KEY,
+        algorithms=[ALGORITHM]
+    )["uid"]
+    await client.post(f"/admin/users/{uid}/revoke", headers=admin_headers)
+
+    other_process = RevocationList(refresh_interval=60)
+    assert other_process.stale()
+    await other_process.ensure_fresh(db_session)
+    assert not other_process.stale()
+    assert other_process.is_revoked(uid, time.time() - 60)
+    assert not other_process.is_revoked(uid, time.time() + 1)
+
+
+# Тест одновременных запросов до первой загрузки списка
+@pytest.mark.asyncio
+async def test_revocation_list_first_load_blocks(
+    client, login, admin_headers, db_session, monkeypatch
+):
+    headers = await login("revokedearly")
+    uid = jwt.decode(
+        headers["Authorization"].split()[1], SECRET_KEY,
+        algorithms=[ALGORITHM]
+    )["uid"]
+    await client.post(f"/admin/users/{uid}/revoke", headers=admin_headers)
+
+    revocations = RevocationList(refresh_interval=60)
+    refresh = revocations.refresh
+    loads = 0
+
+    async def slow_refresh(db):
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.05)
+        await refresh(db)
+
+    monkeypatch.setattr(revocations, "refresh", slow_refresh)
+
+    async def check() -> bool:
+        await revocations.ensure_fresh(db_session)
+        return revocations.is_revoked(uid, time.time() - 60)
+
+    assert await asyncio.gather(*(check() for _ in range(5))) == [True] * 5
+    assert loads == 1
+
+    # После загрузки обновление не задерживает другие запросы
+    revocations._refreshed_at -= 60
+    first = asyncio.create_task(revocations.ensure_fresh(db_session))
+    await asyncio.sleep(0)
+    assert await asyncio.wait_for(check(), timeout=0.01)
+    await first
+    assert loads == 2
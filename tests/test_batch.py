@@ -0,0 +1,86 @@
+import pytest
+from httpx import AsyncClient
+
+
+# Тест пакетного создания, обновления и удаления заметок
+@pytest.mark.asyncio
+async def test_batch_lifecycle(client: AsyncClient, login):
+    headers = await login("batchuser")
+    other = await login("batchother")
+    foreign = await client.post(
+        "/api/v1/notes/", json={"title": "Foreign", "body": "x"},
+        headers=other
+    )
+    foreign_id = foreign.json()["id"]
+
+    response = await client.post(
+        "/api/v1/notes/batch",
+        json={"items": [
+            {"title": f"Batch {i}", "body": f"Body {i}"} for i in range(3)
+        ]},
+        headers=headers
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == ["created"] * 3
+    assert [r["note"]["title"] for r in results] == [
+        "Batch 0", "Batch 1", "Batch 2"
+    ]
+    ids = [r["id"] for r in results]
+
+    response = await client.patch(
+        "/api/v1/notes/batch",
+        json={"items": [
+            {"id": ids[0], "title": "Renamed"},
+            {"id": ids[1], "body": "New body"},
+            {"id": foreign_id, "title": "Stolen"},
+        ]},
+        headers=headers
+    )
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == [
+        "updated", "updated", "not_found"
+    ]
+    assert results[0]["note"]["title"] == "Renamed"
+    assert results[0]["note"]["body"] == "Body 0"
+    assert results[1]["note"]["title"] == "Batch 1"
+    assert results[1]["note"]["body"] == "New body"
+
+    response = await client.request(
+        "DELETE", "/api/v1/notes/batch",
+        json={"ids": [ids[2], foreign_id]}, headers=headers
+    )
+    assert [r["status"] for r in response.json()["results"]] == [
+        "deleted", "not_found"
+    ]
+    response = await client.get(f"/api/v1/notes/{ids[2]}", headers=headers)
+    assert response.status_code == 404
+    response = await client.get(f"/api/v1/notes/{foreign_id}", headers=other)
+    assert response.json()["title"] == "Foreign"
+
+
+# Тест пакетного восстановления заметок администратором
+@pytest.mark.asyncio
+async def test_batch_restore(client: AsyncClient, login, admin_headers):
+    headers = await login("batchuser")
+    created = await client.post(
+        "/api/v1/notes/batch",
+        json={"items": [
+            {"title": "R1", "body": "x"}, {"title": "R2", "body": "y"}
+        ]},
+        headers=headers
+    )
+    ids = [r["id"] for r in created.json()["results"]]
+    await client.request(
+        "DELETE", "/api/v1/notes/batch", json={"ids": ids[:1]}, headers=headers
+    )
+
+    response = await client.post(
+        "/api/v1/admin/notes/batch/restore",
+        json={"ids": ids}, headers=admin_headers
+    )
+    assert [r["status"] for r in response.json()["results"]] == [
+        "restored", "not_found"
+    ]
+    response = await client.get(f"/api/v1/notes/{ids[0]}", headers=headers)
+    assert response.status_code == 200
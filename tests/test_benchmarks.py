@@ -0,0 +1,53 @@
+import pytest
+from httpx import AsyncClient
+
+from benchmarks.harness import (
+    Scenario, compare_results, percentile, run_scenario
+)
+
+
+# Тест перцентилей методом ближайшего ранга
+def test_percentile():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([], 50) == 0
+    assert percentile([7.0], 99) == 7
+
+
+# Тест обнаружения регрессий с учетом порога и шума
+def test_compare_results():
+    baseline = {
+        "fast": {"p95": 0.5, "errors": 0},
+        "slow": {"p95": 10.0, "errors": 0},
+        "stable": {"p95": 10.0, "errors": 0},
+        "removed": {"p95": 1.0, "errors": 0},
+    }
+    current = {
+        "fast": {"p95": 1.0, "errors": 0},
+        "slow": {"p95": 15.0, "errors": 0},
+        "stable": {"p95": 11.0, "errors": 2},
+        "added": {"p95": 100.0, "errors": 0},
+    }
+    regressions = compare_results(baseline, current, threshold=0.2)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("slow: p95")
+    assert regressions[1] == "stable: 2 errors"
+
+
+# Тест прогона сценария: ошибки не входят в задержки
+@pytest.mark.asyncio
+async def test_run_scenario(client: AsyncClient):
+    async def request(client, ctx, i):
+        return await client.get("/" if i % 2 else "/missing")
+
+    result = await run_scenario(
+        client, Scenario("root", request), {},
+        iterations=10, concurrency=3, warmup=2
+    )
+    data = result.to_dict()
+    assert data["requests"] == 10
+    assert data["errors"] == 5
+    assert len(result.latencies) == 5
+    assert data["p50"] <= data["p95"] <= data["p99"]
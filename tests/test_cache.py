@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.core.cache import CACHE_HITS, MemoryCache, RedisCache
+from app.db.models import User
+from app.schemas.note import NoteCreate, NoteUpdate
+from app.services.note import NoteService
+from app.services.note_cache import NoteCache
+
+
+class FakeRedis:
+    """Минимальная замена redis.asyncio.Redis для тестов."""
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+        return True
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def aclose(self):
+        pass
+
+
+# Тест вытеснения из LRU-кеша по объему и сроку жизни
+@pytest.mark.asyncio
+async def test_memory_cache_lru_and_ttl():
+    cache = MemoryCache(max_bytes=10)
+    await cache.set("a", b"12345", ttl=60)
+    await cache.set("b", b"12345", ttl=60)
+    assert await cache.get("a") == b"12345"
+
+    await cache.set("c", b"12345", ttl=60)
+    assert await cache.get("b") is None
+    assert await cache.get("a") == b"12345"
+    assert cache.size == 10
+
+    await cache.set("d", b"1", ttl=0.01)
+    await asyncio.sleep(0.02)
+    assert await cache.get("d") is None
+
+
+# Тест ключей кеша заметок с Redis-совместимым хранилищем
+@pytest.mark.asyncio
+async def test_note_cache_with_redis_backend():
+    cache = NoteCache(RedisCache(FakeRedis()))
+    payload = {"id": 1, "title": "t", "body": "b", "user_id": 5,
+               "is_deleted": False, "version": 1}
+
+    await cache.set_note(5, 3, 1, payload)
+    assert await cache.get_note(5, 3, 1) == payload
+    assert await cache.get_note(5, 4, 1) is None
+
+    await cache.set_list(5, 3, 10, None, [payload])
+    assert await cache.get_list(5, 3, 10, None) == [payload]
+    assert await cache.get_list(5, 4, 10, None) is None
+
+
+# Тест чтения заметки из кеша и сброса кеша при обновлении
+@pytest.mark.asyncio
+async def test_note_reads_are_cached(client: AsyncClient, login):
+    headers = await login("cacheuser")
+    created = await client.post(
+        "/api/v1/notes/", json={"title": "Cached", "body": "v1"},
+        headers=headers
+    )
+    note_id = created.json()["id"]
+
+    await client.get(f"/api/v1/notes/{note_id}", headers=headers)
+    hits_before = CACHE_HITS.value(backend="memory")
+    response = await client.get(f"/api/v1/notes/{note_id}", headers=headers)
+    assert response.json()["body"] == "v1"
+    assert CACHE_HITS.value(backend="memory") == hits_before + 1
+
+    await client.put(
+        f"/api/v1/notes/{note_id}", json={"title": None, "body": "v2"},
+        headers=headers
+    )
+    response = await client.get(f"/api/v1/notes/{note_id}", headers=headers)
+    assert response.json()["body"] == "v2"
+
+    response = await client.get("/api/v1/notes/", headers=headers)
+    assert [n["body"] for n in response.json()] == ["v2"]
+    await client.delete(f"/api/v1/notes/{note_id}", headers=headers)
+    response = await client.get("/api/v1/notes/", headers=headers)
+    assert response.json() == []
+
+
+# Тест согласованности кешей в памяти разных воркеров
+@pytest.mark.asyncio
+async def test_memory_cache_across_workers(login, db_session):
+    await login("cacheworkers")
+    user = await db_session.scalar(
+        select(User).where(User.username == "cacheworkers")
+    )
+    worker_a = NoteService(db_session, NoteCache(MemoryCache()))
+    worker_b = NoteService(db_session, NoteCache(MemoryCache()))
+    note = await worker_b.create_note(
+        NoteCreate(title="Before", body="Body"), user
+    )
+
+    for _ in range(2):
+        cached = await worker_a.get_note_by_id(note.id, user)
+    assert (cached.title, cached.version) == ("Before", 1)
+
+    await worker_b.update_note(
+        note.id, NoteUpdate(title="After", body=None), user
+    )
+    cached = await worker_a.get_note_by_id(note.id, user)
+    assert (cached.title, cached.version) == ("After", 2)
+    assert await worker_a.get_note_version(note.id, user) == 2
+
+    await worker_b.delete_note(note.id, user)
+    with pytest.raises(HTTPException) as error:
+        await worker_a.get_note_by_id(note.id, user)
+    assert error.value.status_code == 404
+    assert await worker_a.get_note_version(note.id, user) is None
@@ -0,0 +1,86 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from app.core import capture as traffic_capture
+from app.core.capture import RequestCapture, sanitize_query, user_hash
+from app.core.logger import flush_logs
+from benchmarks.replay import TrafficMapper, load_records, replay
+
+
+# Тест обезличивания параметров запроса
+def test_sanitize_query():
+    assert sanitize_query(b"limit=20&q=secret+words&stream=true") == {
+        "limit": "20", "q": None, "stream": "true"
+    }
+    assert user_hash(None) is None
+    assert user_hash(1) == user_hash(1) != user_hash(2)
+
+
+# Тест записи трафика и его воспроизведения
+@pytest.mark.asyncio
+async def test_capture_and_replay(
+    client: AsyncClient, login, monkeypatch, tmp_path
+):
+    path = tmp_path / "capture.jsonl"
+    monkeypatch.setattr(
+        traffic_capture, "request_capture", RequestCapture(str(path))
+    )
+    headers = await login("captureuser")
+    created = await client.post(
+        "/api/v1/notes/",
+        json={"title": "Captured", "body": "Private text"},
+        headers=headers
+    )
+    note_id = created.json()["id"]
+    await client.get(f"/api/v1/notes/{note_id}", headers=headers)
+    await client.get(
+        f"/api/v1/notes/{note_id}/revisions/1", headers=headers
+    )
+    await client.get(
+        "/api/v1/notes/search", params={"q": "Private"}, headers=headers
+    )
+    monkeypatch.setattr(traffic_capture, "request_capture", None)
+    flush_logs()
+
+    content = path.read_text()
+    assert "Private" not in content
+    assert "Bearer" not in content
+    records = load_records(path)
+    routes = [record["route"] for record in records]
+    assert "/api/v1/notes/{note_id}" in routes
+    get_note = records[routes.index("/api/v1/notes/{note_id}")]
+    assert get_note["status"] == 200
+    assert get_note["user"] is not None
+    assert get_note["response_bytes"] > 0
+    create = records[routes.index("/api/v1/notes/")]
+    assert create["request_bytes"] == len(json.dumps(
+        {"title": "Captured", "body": "Private text"}, separators=(",", ":")
+    ))
+    assert records[-1]["query"] == {"q": None}
+
+    mapper = TrafficMapper(
+        {"captureuser": {"headers": headers, "note_ids": [note_id]}},
+        headers,
+        {"captureuser": 1},
+    )
+    result = await replay(client, records, mapper, speed=0)
+    summary = result.summary()
+    assert summary["requests"] == len(records)
+    assert summary["routes"]["GET /api/v1/notes/{note_id}"]["errors"] == 0
+    assert summary["routes"]["GET /api/v1/notes/{note_id}"][
+        "status_mismatches"
+    ] == 0
+    revision = summary["routes"][
+        "GET /api/v1/notes/{note_id}/revisions/{version}"
+    ]
+    assert (revision["errors"], revision["status_mismatches"]) == (0, 0)
+
+    # Маршрут с неизвестным параметром пути пропускается, а не ошибка
+    unknown = {**get_note, "route": "/api/v1/notes/{note_id}/{unknown}"}
+    result = await replay(client, [unknown], mapper, speed=0)
+    assert result.summary()["skipped"] == {
+        "GET /api/v1/notes/{note_id}/{unknown}": 1
+    }
+    assert result.summary()["requests"] == 0
@@ -0,0 +1,69 @@
+import pytest
+from httpx import AsyncClient
+
+
+# Тест условного GET для отдельной заметки
+@pytest.mark.asyncio
+async def test_note_etag(client: AsyncClient, login):
+    headers = await login("etaguser")
+    created = await client.post(
+        "/api/v1/notes/", json={"title": "ETag", "body": "v1"},
+        headers=headers
+    )
+    note_id = created.json()["id"]
+
+    response = await client.get(f"/api/v1/notes/{note_id}", headers=headers)
+    etag = response.headers["ETag"]
+    assert etag == created.headers["ETag"]
+
+    response = await client.get(
+        f"/api/v1/notes/{note_id}",
+        headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+    updated = await client.put(
+        f"/api/v1/notes/{note_id}", json={"title": None, "body": "v2"},
+        headers=headers
+    )
+    assert updated.headers["ETag"] != etag
+
+    response = await client.get(
+        f"/api/v1/notes/{note_id}",
+        headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["body"] == "v2"
+
+
+# Тест условного GET для списка заметок
+@pytest.mark.asyncio
+async def test_list_etag(client: AsyncClient, login):
+    headers = await login("etaguser")
+    response = await client.get("/api/v1/notes/", headers=headers)
+    etag = response.headers["ETag"]
+
+    response = await client.get(
+        "/api/v1/notes/", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+    response = await client.get(
+        "/api/v1/notes/", params={"limit": 1},
+        headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+
+    created = await client.post(
+        "/api/v1/notes/", json={"title": "New", "body": "x"},
+        headers=headers
+    )
+    await client.delete(
+        f"/api/v1/notes/{created.json()['id']}", headers=headers
+    )
+    response = await client.get(
+        "/api/v1/notes/", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
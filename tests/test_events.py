@@ -0,0 +1,108 @@
+import asyncio
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from app.core import events
+from app.core.events import EventHub, LocalBroker
+
+
+def _sse(text: str) -> list:
+    """Разбирает поток SSE в список (событие, данные)."""
+    parsed = []
+    for block in text.strip().split("\n\n"):
+        fields = dict(
+            line.split(": ", 1) for line in block.split("\n")
+            if not line.startswith(":")
+        )
+        if fields:
+            parsed.append((fields["event"], json.loads(fields["data"])))
+    return parsed
+
+
+# Тест раздачи событий между воркерами через общий брокер
+@pytest.mark.asyncio
+async def test_fanout_between_workers():
+    broker = LocalBroker()
+    first, second = EventHub(broker), EventHub(broker)
+    own = await first.subscribe(1)
+    other = await second.subscribe(1)
+    foreign = await second.subscribe(2)
+
+    await first.publish(1, {"type": "created", "ids": [5], "seq": 3})
+
+    for subscription in (own, other):
+        message = await subscription.get(timeout=1)
+        assert json.loads(message) == {
+            "type": "created", "ids": [5], "seq": 3
+        }
+    with pytest.raises(asyncio.TimeoutError):
+        await foreign.get(timeout=0.01)
+
+    second.unsubscribe(other)
+    assert len(second) == 1
+
+
+# Тест отключения медленного подписчика
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_evicted():
+    hub = EventHub(LocalBroker(), queue_size=2)
+    slow = await hub.subscribe(1)
+    fast = await hub.subscribe(1)
+    for seq in range(2):
+        await hub.publish(1, {"seq": seq})
+    await fast.get(timeout=1)
+    await fast.get(timeout=1)
+
+    await hub.publish(1, {"seq": 2})
+    assert slow.evicted
+    assert await slow.get(timeout=1) is None
+    assert not fast.evicted
+    assert json.loads(await fast.get(timeout=1)) == {"seq": 2}
+    assert len(hub) == 1
+
+
+# Тест потока событий SSE об изменениях заметок
+@pytest.mark.asyncio
+async def test_event_stream(client: AsyncClient, login, monkeypatch):
+    hub = EventHub(LocalBroker(), queue_size=2)
+    monkeypatch.setattr(events, "event_hub", hub)
+    headers = await login("eventsuser")
+    stream = asyncio.create_task(
+        client.get("/api/v1/events", headers=headers)
+    )
+    while not len(hub):
+        await asyncio.sleep(0.01)
+
+    response = await client.post(
+        "/api/v1/notes/", json={"title": "Pushed", "body": "Body"},
+        headers=headers
+    )
+    note_id = response.json()["id"]
+    await client.delete(f"/api/v1/notes/{note_id}", headers=headers)
+    # Поток забирает опубликованные события
+    await asyncio.sleep(0.05)
+    # Поток не успевает забрать события, опубликованные подряд:
+    # подписчик отключается, поток завершается
+    for seq in range(3):
+        await hub.publish(response.json()["user_id"], {"seq": seq})
+
+    response = await asyncio.wait_for(stream, timeout=5)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    received = _sse(response.text)
+    assert received[0][0] == "notes"
+    assert received[0][1]["type"] == "created"
+    assert received[0][1]["ids"] == [note_id]
+    assert received[1][1]["type"] == "deleted"
+    assert received[1][1]["seq"] > received[0][1]["seq"]
+    assert received[-1][0] == "evicted"
+    assert len(hub) == 0
+
+
+# Тест недоступности потока без авторизации
+@pytest.mark.asyncio
+async def test_event_stream_requires_auth(client: AsyncClient):
+    response = await client.get("/api/v1/events")
+    assert response.status_code == 401
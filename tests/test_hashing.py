@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.hashing import HASH_REJECTED, PasswordHasher
+
+
+# Тест хеширования и проверки пароля в пуле потоков
+@pytest.mark.asyncio
+async def test_hash_and_verify_in_pool():
+    hasher = PasswordHasher(workers=1, queue_size=1)
+    try:
+        hashed = await hasher.hash("secret")
+        assert await hasher.verify("secret", hashed)
+        assert not await hasher.verify("wrong", hashed)
+    finally:
+        hasher.shutdown()
+
+
+# Тест быстрого отказа при переполнении очереди
+@pytest.mark.asyncio
+async def test_saturated_pool_returns_503():
+    hasher = PasswordHasher(workers=1, queue_size=0)
+    rejected_before = HASH_REJECTED.value(operation="hash")
+    try:
+        results = await asyncio.gather(
+            hasher.hash("first"), hasher.hash("second"),
+            return_exceptions=True
+        )
+    finally:
+        hasher.shutdown()
+
+    errors = [r for r in results if isinstance(r, HTTPException)]
+    assert len(errors) == 1
+    assert errors[0].status_code == 503
+    assert errors[0].headers["Retry-After"] == "1"
+    assert HASH_REJECTED.value(operation="hash") == rejected_before + 1
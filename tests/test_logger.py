@@ -0,0 +1,67 @@
+import json
+import logging
+import os
+
+from app.core.logger import (
+    JsonFormatter, SamplingFilter, flush_logs, get_logger, parse_sampling,
+    shutdown_logging
+)
+
+
+# Тест записи лога через фоновый поток
+def test_logger_writes_through_queue(tmp_path):
+    log_file = tmp_path / "app.log"
+    logger = get_logger("test.logger.queue", log_file=str(log_file))
+
+    logger.info("Note %s created for user %s", 7, 3)
+    flush_logs()
+
+    content = log_file.read_text()
+    assert "test.logger.queue - INFO - Note 7 created for user 3" in content
+
+
+# Тест записи лога в процессе, порожденном fork после импорта
+def test_logger_after_fork(tmp_path):
+    log_file = tmp_path / "fork.log"
+    logger = get_logger("test.logger.fork", log_file=str(log_file))
+    logger.info("Parent record")
+    flush_logs()
+
+    pid = os.fork()
+    if pid == 0:
+        # Как при завершении воркера: записи пишет уже работающий поток
+        logger.info("Child record %s", os.getpid())
+        shutdown_logging()
+        os._exit(0)
+    os.waitpid(pid, 0)
+
+    content = log_file.read_text()
+    assert content.count("Parent record") == 1
+    assert f"Child record {pid}" in content
+
+
+# Тест структурированного вывода в JSON
+def test_json_formatter():
+    record = logging.LogRecord(
+        "app.test", logging.INFO, __file__, 1, "Note %s", (5,), None
+    )
+    record.user_id = 3
+    payload = json.loads(JsonFormatter().format(record))
+    assert payload["message"] == "Note 5"
+    assert payload["logger"] == "app.test"
+    assert payload["user_id"] == 3
+
+
+# Тест семплирования INFO-записей по имени логгера
+def test_sampling_filter():
+    rates = parse_sampling("app.middleware=0, app.service=1")
+    sampling = SamplingFilter(rates)
+
+    def make(name, level):
+        return logging.LogRecord(name, level, __file__, 1, "msg", (), None)
+
+    assert not sampling.filter(make("app.middleware", logging.INFO))
+    assert not sampling.filter(make("app.middleware.sub", logging.INFO))
+    assert sampling.filter(make("app.middleware", logging.WARNING))
+    assert sampling.filter(make("app.service.note", logging.INFO))
+    assert sampling.filter(make("other", logging.INFO))
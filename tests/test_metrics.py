@@ -0,0 +1,41 @@
+import pytest
+from httpx import AsyncClient
+
+
+# Тест метрик по шаблону маршрута в формате Prometheus
+@pytest.mark.asyncio
+async def test_metrics_per_route(
+    client: AsyncClient, login, admin_headers
+):
+    headers = await login("metricsuser")
+    created = await client.post(
+        "/api/v1/notes/",
+        json={"title": "Metrics", "body": "Content"},
+        headers=headers
+    )
+    await client.get(
+        f"/api/v1/notes/{created.json()['id']}", headers=headers
+    )
+    await client.get("/api/v1/notes/999999", headers=headers)
+
+    response = await client.get("/metrics", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    route = 'route="/api/v1/notes/{note_id}"'
+    assert f'http_requests_total{{method="GET",{route},status_class="2xx"}}' \
+        in body
+    assert f'http_requests_total{{method="GET",{route},status_class="4xx"}}' \
+        in body
+    assert f'http_request_duration_seconds_bucket{{method="GET",{route},' \
+        in body
+    assert "http_requests_in_flight" in body
+    assert "password_hash_duration_seconds_count" in body
+
+
+# Тест доступа к метрикам только для администратора
+@pytest.mark.asyncio
+async def test_metrics_requires_admin(client: AsyncClient, login):
+    headers = await login("metricsuser")
+    response = await client.get("/metrics", headers=headers)
+    assert response.status_code == 403
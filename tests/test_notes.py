@@ -118,3 +118,43 @@ async def test_delete_note(client: AsyncClient, test_user: User):
     response = await client.delete(f"/api/v1/notes/{note_id}", headers=headers)
     assert response.status_code == 200
     assert "удалена" in response.json()["message"]
+
+
+# Тест обновления и удаления несуществующей заметки
+@pytest.mark.asyncio
+async def test_update_delete_missing_note(
+    client: AsyncClient, test_user: User
+):
+    headers = get_auth_headers(test_user)
+
+    response = await client.put(
+        "/api/v1/notes/999999",
+        json={"title": "Missing", "body": "Missing"},
+        headers=headers
+    )
+    assert response.status_code == 404
+
+    response = await client.delete("/api/v1/notes/999999", headers=headers)
+    assert response.status_code == 404
+
+
+# Тест частичного обновления заметки
+@pytest.mark.asyncio
+async def test_partial_update_note(client: AsyncClient, test_user: User):
+    headers = get_auth_headers(test_user)
+
+    create_response = await client.post(
+        "/api/v1/notes/",
+        json={"title": "Keep Title", "body": "Old Content"},
+        headers=headers
+    )
+    note_id = create_response.json()["id"]
+
+    response = await client.put(
+        f"/api/v1/notes/{note_id}",
+        json={"title": None, "body": "New Content"},
+        headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()["title"] == "Keep Title"
+    assert response.json()["body"] == "New Content"
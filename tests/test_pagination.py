@@ -0,0 +1,61 @@
+import pytest
+from httpx import AsyncClient
+
+
+# Тест постраничного обхода заметок по курсору
+@pytest.mark.asyncio
+async def test_user_notes_cursor_pagination(client: AsyncClient, login):
+    headers = await login("pageuser")
+    created = []
+    for i in range(5):
+        response = await client.post(
+            "/api/v1/notes/",
+            json={"title": f"Page note {i}", "body": "Content"},
+            headers=headers
+        )
+        created.append(response.json()["id"])
+
+    seen = []
+    params = {"limit": 2}
+    while True:
+        response = await client.get(
+            "/api/v1/notes/", params=params, headers=headers
+        )
+        assert response.status_code == 200
+        assert len(response.json()) <= 2
+        seen.extend(note["id"] for note in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params = {"limit": 2, "cursor": cursor}
+
+    assert seen == created
+
+
+# Тест обработки поврежденного курсора
+@pytest.mark.asyncio
+async def test_invalid_cursor(client: AsyncClient, login):
+    headers = await login("pageuser")
+    response = await client.get(
+        "/api/v1/notes/", params={"cursor": "not-a-cursor"}, headers=headers
+    )
+    assert response.status_code == 400
+
+
+# Тест пагинации списка пользователей для администратора
+@pytest.mark.asyncio
+async def test_admin_users_pagination(client: AsyncClient, admin_headers):
+    response = await client.get(
+        "/admin/users/", params={"limit": 1}, headers=admin_headers
+    )
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = await client.get(
+        "/admin/users/",
+        params={"limit": 1, "cursor": cursor},
+        headers=admin_headers
+    )
+    assert response.status_code == 200
+    assert response.json()[0]["id"] > 1
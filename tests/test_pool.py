@@ -0,0 +1,78 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.pool import (
+    InstrumentedPool, begin_request_tracking, end_request_tracking,
+    pool_stats
+)
+from app.db.session import engine_options
+
+
+# Тест учета ожидания соединений и таймаута пула
+@pytest.mark.asyncio
+async def test_instrumented_pool_tracks_waits(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedPool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+        pool_logging_name="test_pool"
+    )
+    tracking = begin_request_tracking()
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        stats = {s["pool"]: s for s in pool_stats()}["test_pool"]
+        assert stats["checked_out"] == 1
+
+        with pytest.raises(exc.TimeoutError):
+            async with engine.connect():
+                pass
+    wait, acquisitions = end_request_tracking(tracking)
+
+    assert acquisitions == 2
+    assert wait >= 0.1
+    stats = {s["pool"]: s for s in pool_stats()}["test_pool"]
+    assert stats["checked_out"] == 0
+    assert stats["size"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["acquisitions"] == 2
+    await engine.dispose()
+
+
+# Тест параметров пула из конфигурации
+def test_engine_options():
+    url, options = engine_options("sqlite+aiosqlite:///./app.db")
+    assert options["poolclass"] is InstrumentedPool
+    assert options["pool_size"] >= 1
+
+    url, options = engine_options("sqlite+aiosqlite://")
+    assert "poolclass" not in options
+
+    url, options = engine_options("postgresql+asyncpg://u:p@db/notes")
+    assert "prepared_statement_cache_size" in url.query
+
+
+# Тест liveness и readiness проб
+@pytest.mark.asyncio
+async def test_health_endpoints(client: AsyncClient):
+    response = await client.get("/health/live")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+    response = await client.get("/health/ready")
+    assert response.status_code == 200
+
+
+# Тест статистики пула только для администратора
+@pytest.mark.asyncio
+async def test_pool_stats_endpoint(client: AsyncClient, login, admin_headers):
+    response = await client.get("/admin/db/pool", headers=admin_headers)
+    assert response.status_code == 200
+    assert isinstance(response.json(), list)
+
+    headers = await login("pooluser")
+    response = await client.get("/admin/db/pool", headers=headers)
+    assert response.status_code == 403
@@ -0,0 +1,59 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, text
+
+from app.db import profiler as sql_profiling
+from app.db.models import User
+from app.db.profiler import (
+    REPEATED_STATEMENTS, SLOW_QUERIES, SqlProfiler, param_shape
+)
+
+
+# Тест описания параметров без значений
+def test_param_shape():
+    assert param_shape((1, "secret", None)) == "(int, str, NULL)"
+    assert param_shape({"id": 1, "title": "x"}) == "{id: int, title: str}"
+    assert param_shape(tuple(range(100))) == "(int x 100)"
+    assert param_shape([(1, "a"), (2, "b")], executemany=True) == (
+        "[(int, str)] x 2"
+    )
+
+
+# Тест подсчета запросов и повторяющихся запросов (N+1)
+@pytest.mark.asyncio
+async def test_profile_counts_repeated_statements(db_session, monkeypatch):
+    profiler = SqlProfiler(repeat_threshold=3, slow_query_ms=0)
+    monkeypatch.setattr(sql_profiling, "sql_profiler", profiler)
+    token = profiler.begin()
+    for user_id in range(3):
+        await db_session.execute(select(User).where(User.id == user_id))
+    await db_session.execute(text("SELECT 1"))
+    profile = profiler.end(token)
+
+    assert profile.statements == 4
+    assert profile.total >= profile.max > 0
+    [(statement, count)] = profile.repeated(3)
+    assert count == 3 and "FROM user" in statement.replace('"', "")
+
+    before = REPEATED_STATEMENTS.value(route="/test")
+    profiler.finish(profile, "/test")
+    assert REPEATED_STATEMENTS.value(route="/test") == before + 1
+
+
+# Тест заголовка Server-Timing и журнала медленных запросов
+@pytest.mark.asyncio
+async def test_server_timing_header(client: AsyncClient, login, monkeypatch):
+    headers = await login("profileduser")
+    response = await client.get("/api/v1/notes/", headers=headers)
+    assert "server-timing" not in response.headers
+
+    monkeypatch.setattr(
+        sql_profiling, "sql_profiler", SqlProfiler(slow_query_ms=0.001)
+    )
+    slow = SLOW_QUERIES.value()
+    response = await client.get("/api/v1/notes/", headers=headers)
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert timing.startswith("db;dur=")
+    assert "queries" in timing and "db-max;dur=" in timing
+    assert SLOW_QUERIES.value() > slow
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+
+
+LONG_BODY = "Длинный текст заметки. " * 200
+
+
+# Тест выбора полей и превью тела в списке заметок
+@pytest.mark.asyncio
+async def test_fields_and_preview(client: AsyncClient, login):
+    headers = await login("fieldsuser")
+    await client.post(
+        "/api/v1/notes/",
+        json={"title": "Long", "body": LONG_BODY},
+        headers=headers
+    )
+
+    response = await client.get(
+        "/api/v1/notes/",
+        params={"fields": "title,updated_at"},
+        headers=headers
+    )
+    assert response.status_code == 200
+    note = response.json()[0]
+    assert set(note) == {"id", "title", "updated_at"}
+
+    # Повторный запрос с другим набором полей не получает чужую страницу
+    # из кеша
+    for _ in range(2):
+        response = await client.get(
+            "/api/v1/notes/", params={"preview": 10}, headers=headers
+        )
+        note = response.json()[0]
+        assert note["body"] == LONG_BODY[:10]
+        assert set(note) == {"id", "title", "body", "user_id", "is_deleted"}
+
+    full = await client.get("/api/v1/notes/", headers=headers)
+    assert full.json()[0]["body"] == LONG_BODY
+    assert full.headers["ETag"] != response.headers["ETag"]
+
+
+# Тест ошибки для неизвестного поля
+@pytest.mark.asyncio
+async def test_unknown_field(client: AsyncClient, login):
+    headers = await login("fieldsuser")
+    response = await client.get(
+        "/api/v1/notes/", params={"fields": "title,password"}, headers=headers
+    )
+    assert response.status_code == 400
+    assert "password" in response.json()["detail"]
+
+
+# Тест выбора полей в потоковой выдаче и в списках администратора
+@pytest.mark.asyncio
+async def test_fields_stream_and_admin(
+    client: AsyncClient, login, admin_headers
+):
+    headers = await login("fieldsuser")
+    response = await client.get(
+        "/api/v1/notes/",
+        params={"stream": "true", "fields": "id,title", "preview": 5},
+        headers={**headers, "Accept": "application/x-ndjson"}
+    )
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert rows and all(set(row) == {"id", "title"} for row in rows)
+
+    response = await client.get(
+        "/api/v1/admin/notes/",
+        params={"fields": "user_id", "limit": 5},
+        headers=admin_headers
+    )
+    assert response.status_code == 200
+    assert all(set(row) == {"id", "user_id"} for row in response.json())
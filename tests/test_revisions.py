@@ -0,0 +1,107 @@
+import pytest
+from httpx import AsyncClient
+
+from app.core.delta import apply_delta, encode_revision, make_delta
+from app.services import revision as revision_module
+
+
+PARAGRAPH = "Line {0} of a long note body that is edited often.\n"
+
+
+def _body(edit: int) -> str:
+    lines = [PARAGRAPH.format(i) for i in range(40)]
+    lines[edit] = f"Edited line {edit}.\n"
+    return "".join(lines)
+
+
+# Тест построения и применения дельты
+def test_delta_roundtrip():
+    old = "hello world\nsecond line\nthird\n"
+    new = "hello there world\nthird\nfourth\n"
+    delta = make_delta(old, new)
+    assert apply_delta(old, delta) == new
+    delta = make_delta(_body(0), _body(1))
+    assert apply_delta(_body(0), delta) == _body(1)
+    assert len(delta) < len(_body(1)) / 10
+
+    # Цепочка дельт ограничена, большая дельта заменяется полной копией
+    assert encode_revision(_body(0), _body(1), 0, 3, 0.5) == (
+        False, delta, 1
+    )
+    assert encode_revision(_body(0), _body(1), 2, 3, 0.5) == (
+        True, _body(1), 0
+    )
+    assert encode_revision("a", "completely different", 0, 3, 0.5)[0]
+
+
+# Тест истории ревизий: список, восстановление и возврат
+@pytest.mark.asyncio
+async def test_note_revisions(client: AsyncClient, login, monkeypatch):
+    monkeypatch.setattr(revision_module, "REVISION_SNAPSHOT_INTERVAL", 3)
+    headers = await login("revisionuser")
+    created = await client.post(
+        "/api/v1/notes/", json={"title": "v1", "body": _body(0)},
+        headers=headers
+    )
+    note_id = created.json()["id"]
+    for edit in range(1, 5):
+        response = await client.put(
+            f"/api/v1/notes/{note_id}",
+            json={"title": f"v{edit + 1}", "body": _body(edit)},
+            headers=headers
+        )
+        assert response.status_code == 200
+
+    response = await client.get(
+        f"/api/v1/notes/{note_id}/revisions", headers=headers
+    )
+    revisions = response.json()
+    assert [r["version"] for r in revisions] == [1, 2, 3, 4, 5]
+    # Полная копия при создании и после двух дельт
+    assert [r["is_snapshot"] for r in revisions] == [
+        True, False, False, True, False
+    ]
+
+    for edit, revision in enumerate(revisions):
+        response = await client.get(
+            f"/api/v1/notes/{note_id}/revisions/{revision['version']}",
+            headers=headers
+        )
+        assert response.json()["title"] == f"v{edit + 1}"
+        assert response.json()["body"] == _body(edit)
+
+    response = await client.post(
+        f"/api/v1/notes/{note_id}/revisions/2/revert", headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()["body"] == _body(1)
+    response = await client.get(
+        f"/api/v1/notes/{note_id}/revisions", params={"limit": 2},
+        headers=headers
+    )
+    assert response.headers["X-Next-Cursor"]
+    response = await client.get(
+        f"/api/v1/notes/{note_id}/revisions/6", headers=headers
+    )
+    assert response.json()["title"] == "v2"
+
+    # Чужая заметка и несуществующая ревизия
+    other = await login("revisionother")
+    response = await client.get(
+        f"/api/v1/notes/{note_id}/revisions", headers=other
+    )
+    assert response.status_code == 404
+    response = await client.get(
+        f"/api/v1/notes/{note_id}/revisions/99", headers=headers
+    )
+    assert response.status_code == 404
+
+
+# Тест бенчмарка объема истории
+def test_revision_storage_benchmark():
+    from benchmarks.revisions import run
+
+    result = run(lines=50, edits=30, interval=5, max_ratio=0.5)
+    assert result["revisions"] == 31
+    assert result["snapshots"] >= 31 // 5
+    assert result["ratio"] < 0.5
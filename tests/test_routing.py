@@ -0,0 +1,99 @@
+import os
+import shutil
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db import routing, session as db_session_module
+from app.db.routing import (
+    READS_ROUTED, STICKY_COOKIE, ReplicaRouter, parse_sticky, sign_sticky
+)
+from app.db.session import get_read_db
+from app.main import app
+from tests.conftest import engine as primary_engine
+
+
+# Тест выбора реплики по кругу, наименее загруженной и после записи
+def test_replica_router_strategies(tmp_path):
+    primary, first, second = (
+        create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / name}.db",
+            pool_logging_name=None if name == "primary" else name
+        )
+        for name in ("primary", "replica0", "replica1")
+    )
+    router = ReplicaRouter(sticky_seconds=5)
+    assert router.choose(primary, []) is primary
+    assert [router.choose(primary, [first, second]) for _ in range(3)] == [
+        first, second, first
+    ]
+
+    router.mark_write(1)
+    assert router.choose(primary, [first, second], user_id=1) is primary
+    assert router.choose(primary, [first, second], user_id=2) is not primary
+    router.mark_write(1, now=0)
+    assert router.is_sticky(1, now=4)
+    assert not router.is_sticky(1, now=5)
+
+    least_loaded = ReplicaRouter(strategy="least_loaded")
+    assert least_loaded.choose(primary, [first, second]) is first
+    with pytest.raises(ValueError):
+        ReplicaRouter(strategy="random")
+
+
+# Тест чтения с реплики и чтения своих записей с основной БД
+@pytest.mark.asyncio
+async def test_reads_use_replica_except_after_write(
+    client: AsyncClient, login, monkeypatch, tmp_path
+):
+    headers = await login("replicauser")
+    # Реплика — копия основной БД до создания заметки (отставание)
+    replica_path = tmp_path / "replica.db"
+    shutil.copy(primary_engine.url.database, replica_path)
+    replica = create_async_engine(
+        f"sqlite+aiosqlite:///{replica_path}", pool_logging_name="replica0"
+    )
+    router = ReplicaRouter(sticky_seconds=60)
+    monkeypatch.setattr(routing, "replica_router", router)
+    monkeypatch.setattr(db_session_module, "_engine", primary_engine)
+    monkeypatch.setattr(db_session_module, "_engine_pid", os.getpid())
+    monkeypatch.setattr(db_session_module, "_replicas", [replica])
+    monkeypatch.delitem(app.dependency_overrides, get_read_db)
+    replica_reads = READS_ROUTED.value(target="replica0")
+
+    created = await client.post(
+        "/api/v1/notes/", json={"title": "Fresh", "body": "Body"},
+        headers=headers
+    )
+    assert created.status_code == 200
+
+    # Сразу после записи чтения идут в основную БД
+    response = await client.get("/api/v1/notes/", headers=headers)
+    assert [note["title"] for note in response.json()] == ["Fresh"]
+    assert READS_ROUTED.value(target="replica0") == replica_reads
+
+    # Другой воркер не знает о записи, но получает подписанную cookie
+    assert STICKY_COOKIE in created.headers["set-cookie"]
+    monkeypatch.setattr(routing, "replica_router", ReplicaRouter())
+    response = await client.get("/api/v1/notes/", headers=headers)
+    assert [note["title"] for note in response.json()] == ["Fresh"]
+    assert "set-cookie" not in response.headers
+    assert READS_ROUTED.value(target="replica0") == replica_reads
+
+    # Без cookie (или после ее срока) — на реплику, где заметки еще нет
+    client.cookies.clear()
+    response = await client.get("/api/v1/notes/", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == []
+    assert READS_ROUTED.value(target="replica0") == replica_reads + 1
+    await replica.dispose()
+
+
+# Тест подписи cookie привязки к основной БД
+def test_sticky_cookie_signature():
+    value = sign_sticky(7, 1700000000)
+    assert parse_sticky(value) == (7, 1700000000)
+    assert parse_sticky(value.replace("7:", "8:", 1)) is None
+    assert parse_sticky("7:1700000000") is None
+    assert parse_sticky("garbage") is None
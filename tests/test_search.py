@@ -0,0 +1,76 @@
+import pytest
+from httpx import AsyncClient
+
+
+# Тест полнотекстового поиска с учетом владельца и удаления
+@pytest.mark.asyncio
+async def test_search_notes(client: AsyncClient, login):
+    owner = await login("searchuser")
+    other = await login("searchother")
+
+    await client.post(
+        "/api/v1/notes/",
+        json={"title": "Groceries", "body": "Buy avocado and bread"},
+        headers=owner
+    )
+    deleted = await client.post(
+        "/api/v1/notes/",
+        json={"title": "Old list", "body": "avocado for guacamole"},
+        headers=owner
+    )
+    await client.delete(
+        f"/api/v1/notes/{deleted.json()['id']}", headers=owner
+    )
+    await client.post(
+        "/api/v1/notes/",
+        json={"title": "Foreign", "body": "someone else's avocado"},
+        headers=other
+    )
+
+    response = await client.get(
+        "/api/v1/notes/search", params={"q": "avocado"}, headers=owner
+    )
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["title"] for r in results] == ["Groceries"]
+    assert "<mark>avocado</mark>" in results[0]["snippet"]
+
+
+# Тест поиска после обновления заметки и со спецсимволами в запросе
+@pytest.mark.asyncio
+async def test_search_follows_updates(client: AsyncClient, login):
+    headers = await login("searchuser")
+    created = await client.post(
+        "/api/v1/notes/",
+        json={"title": "Draft", "body": "initial text"},
+        headers=headers
+    )
+    note_id = created.json()["id"]
+    await client.put(
+        f"/api/v1/notes/{note_id}",
+        json={"title": "Draft", "body": "rewritten paragraph"},
+        headers=headers
+    )
+
+    response = await client.get(
+        "/api/v1/notes/search", params={"q": "initial"}, headers=headers
+    )
+    assert response.json() == []
+
+    response = await client.get(
+        "/api/v1/notes/search",
+        params={"q": 'rewritten "OR* ('},
+        headers=headers
+    )
+    assert response.status_code == 200
+
+
+# Тест поискового запроса без слов
+@pytest.mark.asyncio
+async def test_search_blank_query(client: AsyncClient, login):
+    headers = await login("searchuser")
+    response = await client.get(
+        "/api/v1/notes/search", params={"q": "   "}, headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json() == []
@@ -0,0 +1,32 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.serialization import dumps, loads, rows_response
+from app.schemas.note import NoteResponse, NoteRow
+
+
+# Тест совпадения быстрой сериализации строк с моделью ответа
+def test_rows_match_response_model():
+    row = NoteRow(
+        id=1, title="Заметка", body='"quoted"', user_id=2, is_deleted=False
+    )
+    response = rows_response([row])
+    expected = NoteResponse.model_validate(row._asdict()).model_dump()
+    assert json.loads(response.body) == [expected]
+    assert loads(dumps({"title": "Заметка"})) == {"title": "Заметка"}
+
+
+# Тест того, что список заметок отдает поля NoteResponse
+@pytest.mark.asyncio
+async def test_list_fields(client: AsyncClient, login):
+    headers = await login("serialuser")
+    await client.post(
+        "/api/v1/notes/", json={"title": "T", "body": "B"}, headers=headers
+    )
+    response = await client.get("/api/v1/notes/", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    notes = response.json()
+    assert set(notes[0]) == set(NoteResponse.model_fields)
@@ -0,0 +1,153 @@
+import pytest
+from sqlalchemy import inspect, select, text, update
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db import session as db_session_module
+from app.db.models import Note, SchemaState, User
+from app.db.pool import InstrumentedPool
+from app.db.session import init_db, schema_fingerprint, warm_pool
+from app.main import create_app
+
+
+# Тест пропуска DDL при совпадающем отпечатке схемы
+@pytest.mark.asyncio
+async def test_init_db_fingerprint(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'startup.db'}"
+    )
+    assert await init_db(engine) is True
+    assert await init_db(engine) is False
+
+    async with engine.begin() as conn:
+        assert await conn.scalar(
+            select(SchemaState.fingerprint)
+        ) == schema_fingerprint(engine.dialect)
+        admins = (await conn.execute(
+            select(User.id).where(User.username == "admin")
+        )).all()
+        assert len(admins) == 1
+        await conn.execute(update(SchemaState).values(fingerprint="old"))
+
+    assert await init_db(engine) is True
+    await engine.dispose()
+
+
+# Схема БД первой версии приложения (до миграций)
+_INITIAL_SCHEMA = [
+    "CREATE TABLE user (username VARCHAR(20) NOT NULL, "
+    "password VARCHAR NOT NULL, role VARCHAR(20) NOT NULL, "
+    "created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL, "
+    "updated_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL, "
+    "id INTEGER NOT NULL, PRIMARY KEY (id))",
+    "CREATE UNIQUE INDEX ix_user_username ON user (username)",
+    "CREATE INDEX ix_user_id ON user (id)",
+    "CREATE TABLE note (title VARCHAR(256) NOT NULL, body TEXT NOT NULL, "
+    "is_deleted BOOLEAN NOT NULL, user_id INTEGER NOT NULL, "
+    "created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL, "
+    "updated_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL, "
+    "id INTEGER NOT NULL, PRIMARY KEY (id), "
+    "FOREIGN KEY(user_id) REFERENCES user (id))",
+    "CREATE INDEX ix_note_id ON note (id)",
+    "INSERT INTO user (id, username, password, role) "
+    "VALUES (1, 'old', 'x', 'user')",
+    "INSERT INTO note (id, title, body, is_deleted, user_id) "
+    "VALUES (1, 'Old note', 'Migrated body', 0, 1)",
+]
+
+
+# Тест миграции БД, созданной первой версией приложения
+@pytest.mark.asyncio
+async def test_init_db_migrates_existing_tables(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'initial.db'}"
+    )
+    async with engine.begin() as conn:
+        for statement in _INITIAL_SCHEMA:
+            await conn.execute(text(statement))
+
+    assert await init_db(engine) is True
+    async with engine.connect() as conn:
+        columns = await conn.run_sync(lambda sync_conn: {
+            table: {
+                column["name"]
+                for column in inspect(sync_conn).get_columns(table)
+            }
+            for table in ("user", "note")
+        })
+        indexes = await conn.run_sync(lambda sync_conn: {
+            index["name"] for index in inspect(sync_conn).get_indexes("note")
+        })
+        note = (await conn.execute(
+            select(Note.version, Note.change_seq, User.notes_version)
+            .join(User).where(Note.id == 1)
+        )).one()
+    assert {"notes_version", "auth_changed_at"} <= columns["user"]
+    assert {"version", "change_seq"} <= columns["note"]
+    assert "ix_note_user_id_change_seq" in indexes
+    assert tuple(note) == (1, 0, 0)
+    async with engine.connect() as conn:
+        found = await conn.scalar(text(
+            "SELECT rowid FROM note_fts WHERE note_fts MATCH 'migrated'"
+        ))
+    assert found == 1
+    assert await init_db(engine) is False
+    await engine.dispose()
+
+
+# Тест отказа от старта, если миграция не привела схему к моделям
+@pytest.mark.asyncio
+async def test_init_db_refuses_outdated_schema(tmp_path, monkeypatch):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'outdated.db'}"
+    )
+    async with engine.begin() as conn:
+        for statement in _INITIAL_SCHEMA:
+            await conn.execute(text(statement))
+
+    monkeypatch.setattr(db_session_module, "migrate_schema", lambda conn: [])
+    with pytest.raises(RuntimeError, match="user.notes_version"):
+        await init_db(engine)
+    async with engine.connect() as conn:
+        assert await db_session_module._stored_fingerprint(conn) is None
+
+    monkeypatch.undo()
+    assert await init_db(engine) is True
+    await engine.dispose()
+
+
+# Тест предварительного открытия соединений пула
+@pytest.mark.asyncio
+async def test_warm_pool(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'warm.db'}",
+        poolclass=InstrumentedPool,
+        pool_size=3,
+        pool_logging_name="warm_pool"
+    )
+    assert await warm_pool(engine, 3) == 3
+    assert engine.pool.checkedin() == 3
+    assert engine.pool.checkedout() == 0
+    await engine.dispose()
+
+
+# Тест создания отдельного движка в порожденном процессе
+@pytest.mark.asyncio
+async def test_engine_per_process(monkeypatch):
+    monkeypatch.setattr(db_session_module, "_engine", None)
+    parent = db_session_module.get_engine()
+    assert db_session_module.get_engine() is parent
+
+    pid = db_session_module._engine_pid
+    monkeypatch.setattr(db_session_module.os, "getpid", lambda: pid + 1)
+    child = db_session_module.get_engine()
+    assert child is not parent
+    await db_session_module.dispose_engine()
+
+
+# Тест фабрики приложения
+def test_create_app():
+    first, second = create_app(), create_app()
+    assert first is not second
+    paths = {route.path for route in first.routes}
+    assert "/api/v1/notes/" in paths
+    assert "/health/ready" in paths
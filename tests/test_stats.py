@@ -0,0 +1,129 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+
+from app.db.models import NoteStats
+
+
+async def _user_stats(client: AsyncClient, admin_headers: dict, user_id):
+    response = await client.get(
+        f"/api/v1/admin/stats/users/{user_id}", headers=admin_headers
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+# Тест обновления сводки при записи заметок
+@pytest.mark.asyncio
+async def test_stats_follow_writes(
+    client: AsyncClient, login, admin_headers
+):
+    headers = await login("statsuser")
+    response = await client.post(
+        "/api/v1/notes/", json={"title": "One", "body": "Привет"},
+        headers=headers
+    )
+    first = response.json()
+    user_id = first["user_id"]
+    response = await client.post(
+        "/api/v1/notes/batch",
+        json={"items": [
+            {"title": "Two", "body": "abc"}, {"title": "Three", "body": "xy"}
+        ]},
+        headers=headers
+    )
+    second, third = [item["id"] for item in response.json()["results"]]
+
+    await client.put(
+        f"/api/v1/notes/{first['id']}",
+        json={"title": "One", "body": "Hello"}, headers=headers
+    )
+    # Обновление без изменения текста не считается изменением
+    await client.put(
+        f"/api/v1/notes/{second}", json={"title": "Two", "body": "abc"},
+        headers=headers
+    )
+    await client.delete(f"/api/v1/notes/{third}", headers=headers)
+    # Повторное удаление не меняет сводку
+    response = await client.delete(f"/api/v1/notes/{third}", headers=headers)
+    assert response.status_code == 200
+
+    stats = await _user_stats(client, admin_headers, user_id)
+    assert stats["username"] == "statsuser"
+    assert stats["live_notes"] == 2
+    assert stats["deleted_notes"] == 1
+    assert stats["body_bytes"] == len("Hello") + len("abc")
+    [today] = stats["daily"]
+    assert (today["created"], today["updated"]) == (3, 1)
+
+    await client.post(
+        f"/api/v1/admin/notes/{third}/restore", headers=admin_headers
+    )
+    stats = await _user_stats(client, admin_headers, user_id)
+    assert (stats["live_notes"], stats["deleted_notes"]) == (3, 0)
+    assert stats["body_bytes"] == len("Hello") + len("abc") + len("xy")
+
+    response = await client.get(
+        "/api/v1/admin/stats/users", params={"limit": 1000},
+        headers=admin_headers
+    )
+    rows = {row["user_id"]: row for row in response.json()}
+    assert rows[user_id]["live_notes"] == 3
+
+    response = await client.get("/api/v1/admin/stats", headers=admin_headers)
+    summary = response.json()
+    assert summary["users"] >= 1
+    assert summary["live_notes"] >= 3
+    assert summary["daily"][-1]["created"] >= 3
+
+    response = await client.get("/api/v1/admin/stats", headers=headers)
+    assert response.status_code == 403
+
+
+# Тест сверки сводки с заметками
+@pytest.mark.asyncio
+async def test_stats_reconcile(
+    client: AsyncClient, login, admin_headers, db_session
+):
+    headers = await login("statsreconcile")
+    response = await client.post(
+        "/api/v1/notes/", json={"title": "Note", "body": "Body"},
+        headers=headers
+    )
+    note = response.json()
+    await client.put(
+        f"/api/v1/notes/{note['id']}", json={"title": "Note", "body": "New"},
+        headers=headers
+    )
+    user_id = note["user_id"]
+    expected = await _user_stats(client, admin_headers, user_id)
+
+    await db_session.execute(
+        update(NoteStats)
+        .where(NoteStats.user_id == user_id)
+        .values(live_notes=100, body_bytes=0)
+    )
+    await db_session.commit()
+
+    response = await client.post(
+        "/api/v1/admin/stats/reconcile", headers=admin_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["drift"] >= 1
+    assert await _user_stats(client, admin_headers, user_id) == expected
+
+    # Повторная сверка не находит расхождений
+    response = await client.post(
+        "/api/v1/admin/stats/reconcile", headers=admin_headers
+    )
+    assert response.json()["drift"] == 0
+
+
+# Тест сводки пользователя без заметок и несуществующего пользователя
+@pytest.mark.asyncio
+async def test_user_stats_empty(client: AsyncClient, login, admin_headers):
+    await login("statsempty")
+    response = await client.get(
+        "/api/v1/admin/stats/users/999999", headers=admin_headers
+    )
+    assert response.status_code == 404
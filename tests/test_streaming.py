@@ -0,0 +1,55 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+
+
+# Тест потоковой выдачи заметок в формате NDJSON
+@pytest.mark.asyncio
+async def test_stream_user_notes_ndjson(client: AsyncClient, login):
+    headers = await login("streamuser")
+    for i in range(3):
+        await client.post(
+            "/api/v1/notes/",
+            json={"title": f"Stream note {i}", "body": "Content"},
+            headers=headers
+        )
+
+    response = await client.get(
+        "/api/v1/notes/",
+        params={"limit": 1},
+        headers={**headers, "Accept": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [note["title"] for note in lines] == [
+        "Stream note 0", "Stream note 1", "Stream note 2"
+    ]
+
+
+# Тест потоковой выгрузки всех заметок администратором
+@pytest.mark.asyncio
+async def test_stream_all_notes_json(
+    client: AsyncClient, login, admin_headers
+):
+    headers = await login("streamadminuser")
+    created = []
+    for i in range(3):
+        response = await client.post(
+            "/api/v1/notes/",
+            json={"title": f"Admin stream {i}", "body": "Content"},
+            headers=headers
+        )
+        created.append(response.json()["id"])
+
+    response = await client.get(
+        "/api/v1/admin/notes/", params={"stream": "true", "limit": 1},
+        headers=admin_headers
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    notes = {note["id"]: note for note in response.json()}
+    assert [notes[note_id]["title"] for note_id in created] == [
+        "Admin stream 0", "Admin stream 1", "Admin stream 2"
+    ]
@@ -0,0 +1,107 @@
+import pytest
+from httpx import AsyncClient
+
+
+async def _create(client: AsyncClient, headers: dict, title: str) -> int:
+    response = await client.post(
+        "/api/v1/notes/", json={"title": title, "body": "Body"},
+        headers=headers
+    )
+    return response.json()["id"]
+
+
+async def _changes(client: AsyncClient, headers: dict, **params) -> dict:
+    response = await client.get(
+        "/api/v1/notes/changes", params=params, headers=headers
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+# Тест полной и инкрементальной синхронизации с удалением
+@pytest.mark.asyncio
+async def test_sync_changes(client: AsyncClient, login, admin_headers):
+    headers = await login("syncuser")
+    first = await _create(client, headers, "First")
+    second = await _create(client, headers, "Second")
+    removed = await _create(client, headers, "Removed")
+    await client.delete(f"/api/v1/notes/{removed}", headers=headers)
+
+    # Полная синхронизация: только неудаленные заметки
+    full = await _changes(client, headers)
+    assert [note["id"] for note in full["notes"]] == [first, second]
+    assert full["deleted"] == []
+    assert full["has_more"] is False
+
+    # Нет изменений после курсора
+    empty = await _changes(client, headers, since=full["cursor"])
+    assert empty["notes"] == [] and empty["deleted"] == []
+    assert empty["cursor"] == full["cursor"]
+
+    await client.put(
+        f"/api/v1/notes/{first}", json={"title": "First v2", "body": "Body"},
+        headers=headers
+    )
+    await client.delete(f"/api/v1/notes/{second}", headers=headers)
+    third = await _create(client, headers, "Third")
+
+    changes = await _changes(client, headers, since=full["cursor"])
+    assert [note["id"] for note in changes["notes"]] == [first, third]
+    assert changes["notes"][0]["title"] == "First v2"
+    assert changes["deleted"] == [second]
+
+    # Удаленная заметка восстановлена администратором
+    await client.post(
+        f"/api/v1/admin/notes/{second}/restore", headers=admin_headers
+    )
+    restored = await _changes(client, headers, since=changes["cursor"])
+    assert [note["id"] for note in restored["notes"]] == [second]
+    assert restored["deleted"] == []
+
+    # Tombstone заметки, перенесенной в архив, сохраняется
+    await client.delete(f"/api/v1/notes/{third}", headers=headers)
+    await client.post(
+        "/api/v1/admin/notes/archive", params={"retention_days": 0},
+        headers=admin_headers
+    )
+    archived = await _changes(client, headers, since=restored["cursor"])
+    assert archived["notes"] == []
+    assert archived["deleted"] == [third]
+
+
+# Тест постраничной выдачи изменений
+@pytest.mark.asyncio
+async def test_sync_pagination(client: AsyncClient, login):
+    headers = await login("syncpages")
+    start = (await _changes(client, headers))["cursor"]
+    response = await client.post(
+        "/api/v1/notes/batch",
+        json={"items": [
+            {"title": f"Note {i}", "body": "Body"} for i in range(5)
+        ]},
+        headers=headers
+    )
+    ids = [item["id"] for item in response.json()["results"]]
+
+    # Все заметки пакета имеют один номер изменения: курсор
+    # продолжает выдачу внутри него
+    received, cursor, pages = [], start, 0
+    while True:
+        page = await _changes(client, headers, since=cursor, limit=2)
+        received += [note["id"] for note in page["notes"]]
+        cursor, pages = page["cursor"], pages + 1
+        if not page["has_more"]:
+            break
+    assert received == ids
+    assert pages == 3
+
+
+# Тест поврежденного курсора
+@pytest.mark.asyncio
+async def test_sync_invalid_cursor(client: AsyncClient, login):
+    headers = await login("syncbadcursor")
+    response = await client.get(
+        "/api/v1/notes/changes", params={"since": "not-a-cursor"},
+        headers=headers
+    )
+    assert response.status_code == 400